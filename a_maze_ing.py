@@ -1,7 +1,8 @@
 import sys
 from mazegen import file_parsing, config_parsing
-from mazegen import display_maze
+from mazegen import display_maze, write_maze
 import mazegen.generate_maze as generate_maze
+from mazegen.cache import config_cache
 import random
 
 
@@ -17,7 +18,8 @@ def main() -> None:
 
     configuration = file_parsing(sys.argv[1])
     config = config_parsing(configuration)
-    sys.setrecursionlimit(3000)
+    # kept across the loop: the same maze is not generated twice
+    cache = config_cache(config)
     try:
         while True:
             if config["SEED_EXIST"] is False:
@@ -28,29 +30,16 @@ def main() -> None:
 
             maze.pattern_42()
 
-            result = display_maze(maze, config)
+            result = display_maze(maze, config, cache)
             if result == "done":
-                with open(config['OUTPUT_FILE'], "w") as maze_file:
-                    for _ in maze.maze_struct:
-                        for c in _:
-                            maze_file.write(format(c.wall, 'X'))
-                        maze_file.write("\n")
-
-                    maze_file.write("\n")
-                    maze_file.write(str(config["ENTRY"]).strip("()"))
-                    maze_file.write("\n")
-                    maze_file.write(str(config["EXIT"]).strip("()"))
-                    maze_file.write("\n")
-                    maze_file.write(maze.maze_solver(config["ENTRY"],
-                                                     config["EXIT"]))
+                write_maze(config['OUTPUT_FILE'], maze,
+                           config["ENTRY"], config["EXIT"])
                 continue
             elif result == "exit":
                 break
         exit()
     except KeyboardInterrupt:
         print("You pressed Ctrl + C and the program Stopping safely")
-    except RecursionError:
-        print("Recursion limit reached!")
     except Exception as error:
         print(error)
 
@@ -0,0 +1,51 @@
+"""
+Benchmark of the maze generation algorithms: time, cells per second
+and peak memory (tracemalloc) to generate one maze with each of them.
+Run from the project root: python3 benchmarks/bench_algorithms.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+from typing import Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen.generate_maze import GENERATORS, Maze  # noqa: E402
+
+SIZES = [(100, 100), (300, 300)]
+SEED = 42
+
+
+def measure(algorithm: str, width: int,
+            height: int) -> Tuple[float, float]:
+    """ returns (seconds, peak KiB) to generate one maze """
+    maze = Maze(width, height, SEED)
+    maze.pattern_42()
+    start = time.perf_counter()
+    maze.maze_generator((0, 0), algorithm=algorithm)
+    elapsed = time.perf_counter() - start
+
+    # a second run under tracemalloc, which slows the timing down
+    maze = Maze(width, height, SEED)
+    maze.pattern_42()
+    tracemalloc.start()
+    maze.maze_generator((0, 0), algorithm=algorithm)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1024
+
+
+def main() -> None:
+    print(f"{'algorithm':>13} {'size':>9} {'ms':>9} {'cells/s':>11} "
+          f"{'peak KiB':>10}")
+    for width, height in SIZES:
+        size = f"{width}x{height}"
+        for algorithm in GENERATORS:
+            elapsed, peak = measure(algorithm, width, height)
+            print(f"{algorithm:>13} {size:>9} {elapsed * 1000:>9.1f} "
+                  f"{width * height / elapsed:>11,.0f} {peak:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark of MazeCache: generating and solving a maze against getting
+it back from the memory layer and from the disk layer.
+Run from the project root: python3 benchmarks/bench_cache.py
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen.cache import MazeCache  # noqa: E402
+
+SIZES = [(50, 50), (200, 200), (500, 500)]
+
+
+def measure(run: Callable[[], object]) -> float:
+    """ best of 3 milliseconds """
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    print(f"{'size':>10} {'generate ms':>12} {'memory ms':>10} "
+          f"{'disk ms':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for width, height in SIZES:
+            args = (width, height, 42, True, (0, 0),
+                    (width - 1, height - 1))
+            # size 0: every call misses the memory layer
+            generate = measure(lambda: MazeCache(0).maze(*args))
+            memory_cache = MazeCache(4)
+            memory_cache.maze(*args)
+            memory = measure(lambda: memory_cache.maze(*args))
+            MazeCache(0, directory).maze(*args)
+            disk = measure(lambda: MazeCache(0, directory).maze(*args))
+            size = f"{width}x{height}"
+            print(f"{size:>10} {generate:>12.1f} {memory:>10.1f} "
+                  f"{disk:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
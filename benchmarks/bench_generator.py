@@ -0,0 +1,69 @@
+"""
+Benchmark of the maze generator, in cells per second.
+Compares the old recursive backtracker with the current
+explicit-stack one in Maze.maze_generator, which alone goes on to
+a 2000x2000 grid, too deep for the recursive version.
+Run from the project root: python3 benchmarks/bench_generator.py
+"""
+import os
+import random
+import sys
+import threading
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen import generate_maze  # noqa: E402
+from legacy import legacy_grid, recursive_generator  # noqa: E402
+
+SIZES = [(50, 50), (100, 100), (200, 200), (400, 400), (2000, 2000)]
+# the recursive version is not timed on bigger grids
+RECURSIVE_MAX = 400 * 400
+SEED = 42
+
+
+def run_in_big_stack(func: Callable[[], None]) -> None:
+    """
+    Runs func in a thread with a large C stack, the only way the
+    recursive version survives deep corridors.
+    """
+    sys.setrecursionlimit(10 ** 6)
+    threading.stack_size(512 * 1024 * 1024)
+    thread = threading.Thread(target=func)
+    thread.start()
+    thread.join()
+    threading.stack_size(0)
+
+
+def measure(width: int, height: int, recursive: bool) -> float:
+    """ returns generated cells per second for one maze """
+    if recursive:
+        grid = legacy_grid(width, height)
+        random.seed(SEED)
+        start = time.perf_counter()
+        run_in_big_stack(lambda: recursive_generator(grid, (0, 0)))
+    else:
+        maze = generate_maze.Maze(width, height, SEED)
+        start = time.perf_counter()
+        maze.maze_generator((0, 0))
+    elapsed = time.perf_counter() - start
+    return width * height / elapsed
+
+
+def main() -> None:
+    print(f"{'size':>10} {'recursive c/s':>15} {'iterative c/s':>15} "
+          f"{'speedup':>8}")
+    for width, height in SIZES:
+        size = f"{width}x{height}"
+        after = measure(width, height, recursive=False)
+        if width * height > RECURSIVE_MAX:
+            print(f"{size:>10} {'-':>15} {after:>15,.0f} {'-':>8}")
+            continue
+        before = measure(width, height, recursive=True)
+        print(f"{size:>10} {before:>15,.0f} {after:>15,.0f} "
+              f"{after / before:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark of the maze storage: memory and construction time of the
+old list of Cell objects against the packed Grid bytearray.
+Run from the project root: python3 benchmarks/bench_grid.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen.grid import Grid  # noqa: E402
+from legacy import legacy_grid  # noqa: E402
+
+SIZES = [(100, 100), (500, 500), (1000, 1000)]
+
+
+def measure(build: Callable[[], object]) -> Tuple[float, int]:
+    """ returns (best of 3 seconds, peak bytes) to build one grid """
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        grid = build()
+        elapsed = min(elapsed, time.perf_counter() - start)
+        del grid
+
+    tracemalloc.start()
+    grid = build()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del grid
+    return elapsed, peak
+
+
+def main() -> None:
+    print(f"{'size':>10} {'cells MB':>9} {'cells ms':>9} "
+          f"{'grid MB':>9} {'grid ms':>9} {'B/cell':>13}")
+    for width, height in SIZES:
+        old_time, old_mem = measure(lambda: legacy_grid(width, height))
+        new_time, new_mem = measure(lambda: Grid(width, height))
+        count = width * height
+        size = f"{width}x{height}"
+        per_cell = f"{old_mem / count:.0f} -> {new_mem / count:.1f}"
+        print(f"{size:>10} {old_mem / 2 ** 20:>9.1f} {old_time * 1e3:>9.1f} "
+              f"{new_mem / 2 ** 20:>9.2f} {new_time * 1e3:>9.3f} "
+              f"{per_cell:>13}")
+
+
+if __name__ == "__main__":
+    main()
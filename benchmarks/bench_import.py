@@ -0,0 +1,75 @@
+"""
+Benchmark of the cold start of the package, what every short-lived
+batch worker pays: `import mazegen` in a fresh interpreter, timed
+with python -X importtime (median of RUNS runs).
+It also checks that the headless imports never load curses, and
+exits with status 1 if one does, so it can guard that in a script.
+Run from the project root: python3 benchmarks/bench_import.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNS = 15
+# what a worker imports, and the display for comparison
+IMPORTS = [
+    "mazegen",
+    "mazegen.generate_maze",
+    "mazegen.batch",
+    "mazegen.draw_maze",
+]
+# never loaded by the imports above except mazegen.draw_maze
+UI_MODULES = ("curses", "_curses", "mazegen.draw_maze")
+
+
+def import_times(module: str) -> Dict[str, int]:
+    """
+    Imports module in a new interpreter and returns the cumulative
+    import time in microseconds of every module it loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def module_column(text: str) -> str:
+    """ text padded to the width of the first column """
+    return f"{text:<24}"
+
+
+def main() -> None:
+    # a first run so every .pyc is written before timing
+    for module in IMPORTS:
+        import_times(module)
+
+    failed = False
+    print(f"{module_column('import')} {'median ms':>10} {'max ms':>8} "
+          f"{'curses':>7}")
+    for module in IMPORTS:
+        runs: List[Dict[str, int]] = [import_times(module)
+                                      for _ in range(RUNS)]
+        totals = [times.get(module, 0) / 1e3 for times in runs]
+        ui = any(name in runs[0] for name in UI_MODULES)
+        print(f"{module_column(module)} {statistics.median(totals):>10.1f} "
+              f"{max(totals):>8.1f} {'yes' if ui else 'no':>7}")
+        if ui and module != "mazegen.draw_maze":
+            failed = True
+
+    if failed:
+        print("ERROR: a headless import loads the curses display")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
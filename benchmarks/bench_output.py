@@ -0,0 +1,52 @@
+"""
+Benchmark of saving a maze in the hex format: output.write_maze
+against the old writer that made one write call per cell.
+Run from the project root: python3 benchmarks/bench_output.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen import generate_maze  # noqa: E402
+from mazegen.output import write_maze  # noqa: E402
+from legacy import legacy_from_cells, legacy_write_maze  # noqa: E402
+
+SIZES = [(500, 500), (1000, 1000), (4000, 4000)]
+
+
+def main() -> None:
+    print(f"{'size':>10} {'old ms':>9} {'new ms':>8} {'atomic ms':>10} "
+          f"{'speedup':>8}")
+    folder = tempfile.mkdtemp()
+    file_name = os.path.join(folder, "maze.txt")
+    for width, height in SIZES:
+        maze = generate_maze.Maze(width, height, 42)
+        maze.maze_generator((0, 0))
+        entry, exit = (0, 0), (width - 1, height - 1)
+        path = maze.maze_solver(entry, exit)
+        old_grid = legacy_from_cells(maze.cells, width, height)
+
+        start = time.perf_counter()
+        legacy_write_maze(file_name, old_grid, entry, exit, path)
+        old = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_maze(file_name, maze, entry, exit)
+        new = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_maze(file_name, maze, entry, exit, atomic=True)
+        atomic = time.perf_counter() - start
+
+        size = f"{width}x{height}"
+        print(f"{size:>10} {old * 1e3:>9.0f} {new * 1e3:>8.1f} "
+              f"{atomic * 1e3:>10.1f} {old / new:>7.0f}x")
+    os.remove(file_name)
+    os.rmdir(folder)
+
+
+if __name__ == "__main__":
+    main()
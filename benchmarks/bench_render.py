@@ -0,0 +1,68 @@
+"""
+Benchmark of one full frame of DrawMaze.draw_the_maze against the old
+renderer (4 dicts per corner, one addstr per character).
+It draws into a window that only counts calls, with curses.color_pair
+replaced by the plain bit shift it does, so it needs no terminal and
+measures only the Python side of rendering.
+Run from the project root: python3 benchmarks/bench_render.py
+"""
+import curses
+import os
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen import generate_maze  # noqa: E402
+from mazegen.draw_maze import DrawMaze  # noqa: E402
+from legacy import legacy_draw_the_maze, legacy_from_cells  # noqa: E402
+
+SIZES = [(50, 50), (100, 100), (200, 200)]
+
+
+class CountingWindow:
+    """ stands in for a curses window, counts addstr calls """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def addstr(self, *args: Any) -> None:
+        self.calls += 1
+
+
+def measure(draw: Callable[[Any], None]) -> tuple:
+    """ returns (best of 3 milliseconds, addstr calls) for one frame """
+    best = float("inf")
+    calls = 0
+    for _ in range(3):
+        window = CountingWindow()
+        start = time.perf_counter()
+        draw(window)
+        best = min(best, time.perf_counter() - start)
+        calls = window.calls
+    return best * 1e3, calls
+
+
+def main() -> None:
+    curses.color_pair = lambda n: n << 8  # type: ignore[assignment]
+    print(f"{'size':>10} {'old ms':>9} {'old calls':>10} "
+          f"{'new ms':>9} {'new calls':>10} {'speedup':>8}")
+    for width, height in SIZES:
+        maze = generate_maze.Maze(width, height, 42)
+        maze.pattern_42()
+        maze.maze_generator((0, 0))
+        old_grid = legacy_from_cells(maze.cells, width, height)
+
+        old_ms, old_calls = measure(
+            lambda w: legacy_draw_the_maze(w, old_grid, width, height))
+        new_ms, new_calls = measure(
+            lambda w: DrawMaze.draw_the_maze(w, maze.maze_struct,
+                                             width, height))
+        size = f"{width}x{height}"
+        print(f"{size:>10} {old_ms:>9.1f} {old_calls:>10,} "
+              f"{new_ms:>9.1f} {new_calls:>10,} {old_ms / new_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark of the maze server (python3 -m mazegen serve): CLIENTS
+keep-alive connections send REQUESTS requests each, first all for
+different seeds, then all for the same few seeds, as when many
+players join the same game. It prints the throughput, the p50/p99
+latency the clients saw, and how many requests were coalesced into
+one that was already running.
+Run from the project root: python3 benchmarks/bench_server.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen.server import HOST, MazeServer  # noqa: E402
+
+CLIENTS = 32
+REQUESTS = 20
+SIZE = "w=100&h=100"
+
+
+async def client(port: int, targets: List[str],
+                 latencies: List[float]) -> None:
+    """ sends the requests one after the other on one connection """
+    reader, writer = await asyncio.open_connection(HOST, port)
+    for target in targets:
+        start = time.perf_counter()
+        writer.write(f"GET {target} HTTP/1.1\r\nHost: {HOST}\r\n\r\n"
+                     .encode())
+        await writer.drain()
+        status = await reader.readline()
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line == b"\r\n":
+                break
+            name, _, text = line.decode().partition(":")
+            if name.lower() == "content-length":
+                length = int(text)
+        await reader.readexactly(length)
+        if b" 200 " not in status:
+            raise RuntimeError(f"{target}: {status.decode().strip()}")
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def measure(server: MazeServer, name: str,
+                  target: Callable[[int, int], str]) -> None:
+    """ runs every client at once, target(client, request) is the URL """
+    latencies: List[float] = []
+    coalesced = server.coalesced
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(server.port,
+               [target(number, request) for request in range(REQUESTS)],
+               latencies)
+        for number in range(CLIENTS)
+    ))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:>10} {len(latencies) / seconds:>9.0f} "
+          f"{statistics.median(latencies) * 1e3:>8.1f} {p99 * 1e3:>8.1f} "
+          f"{server.coalesced - coalesced:>10,}")
+
+
+async def run() -> None:
+    server = MazeServer(port=0)
+    await server.start()
+    try:
+        print(f"{'requests':>10} {'per s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'coalesced':>10}")
+        # the first requests also start the worker processes
+        await measure(server, "warm up",
+                      lambda n, r: f"/maze?{SIZE}&seed=warm{n}-{r}")
+        await measure(server, "distinct",
+                      lambda n, r: f"/maze?{SIZE}&seed={n}-{r}")
+        await measure(server, "same",
+                      lambda n, r: f"/maze?{SIZE}&seed=same{r}")
+        await measure(server, "solve",
+                      lambda n, r: f"/solve?{SIZE}&seed=same{r % 4}")
+        print("server:", server.stats())
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
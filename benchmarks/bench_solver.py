@@ -0,0 +1,52 @@
+"""
+Benchmark of the shortest path solvers against the old dict based
+maze_solver, on perfect mazes and on mazes with loops.
+Run from the project root: python3 benchmarks/bench_solver.py
+"""
+import os
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen import generate_maze  # noqa: E402
+from legacy import legacy_from_cells, legacy_solver  # noqa: E402
+
+SIZES = [(100, 100), (300, 300), (600, 600)]
+
+
+def best_ms(solve: Callable[[], str]) -> float:
+    """ best of 3 runs, in milliseconds """
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        solve()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main() -> None:
+    print(f"{'size':>10} {'perfect':>8} {'old ms':>8} {'bfs ms':>8} "
+          f"{'astar ms':>9} {'bidir ms':>9} {'path':>7}")
+    for width, height in SIZES:
+        for perfect in (True, False):
+            maze = generate_maze.Maze(width, height, 42)
+            maze.maze_generator((0, 0), None, perfect)
+            old_grid = legacy_from_cells(maze.cells, width, height)
+            entry, exit = (0, 0), (width - 1, height - 1)
+
+            old = best_ms(lambda: legacy_solver(old_grid, entry, exit))
+            times = [
+                best_ms(lambda: maze.maze_solver(entry, exit, algorithm))
+                for algorithm in ("bfs", "astar", "bidirectional")
+            ]
+            length = len(maze.maze_solver(entry, exit))
+            size = f"{width}x{height}"
+            print(f"{size:>10} {str(perfect):>8} {old:>8.1f} "
+                  f"{times[0]:>8.1f} {times[1]:>9.1f} {times[2]:>9.1f} "
+                  f"{length:>7}")
+
+
+if __name__ == "__main__":
+    main()
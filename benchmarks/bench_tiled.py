@@ -0,0 +1,55 @@
+"""
+Benchmark of tiled generation (python3 -m mazegen tiled): one
+backtracker walk over the whole grid against tiled_maze with one
+worker and with one worker per core, in cells per second.
+It also checks that every worker count gives the same maze, and
+exits with status 1 if one does not.
+Run from the project root: python3 benchmarks/bench_tiled.py
+"""
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen import generate_maze  # noqa: E402
+from mazegen.tiled import tiled_maze  # noqa: E402
+
+SIZES = [(500, 500), (1000, 1000), (2000, 2000)]
+SEED = 42
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    workers = sorted({1, 2, cores})
+    print(f"{'size':>10} {'whole':>12} "
+          + " ".join(f"{f'{n} workers':>12}" for n in workers)
+          + "   (cells/s)")
+    failed = False
+    for width, height in SIZES:
+        start = time.perf_counter()
+        maze = generate_maze.Maze(width, height, SEED)
+        maze.pattern_42()
+        maze.maze_generator((0, 0))
+        rates = [width * height / (time.perf_counter() - start)]
+
+        digests = set()
+        for count in workers:
+            start = time.perf_counter()
+            maze = tiled_maze(width, height, SEED, workers=count)
+            rates.append(width * height / (time.perf_counter() - start))
+            digests.add(hashlib.sha256(maze.cells).hexdigest())
+        if len(digests) != 1:
+            failed = True
+
+        print(f"{f'{width}x{height}':>10} "
+              + " ".join(f"{rate:>12,.0f}" for rate in rates))
+
+    if failed:
+        print("ERROR: the worker count changed the maze")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark of "4. Change Color of Maze" and hiding the path with
+"2. Show/Hide Path": the old way (erase, draw the whole maze again and
+replay the path) against restyling the walls with chgat and repainting
+only the path cells.
+It draws into a window that only counts calls, with curses.color_pair
+replaced by the plain bit shift it does, so it needs no terminal and
+measures only the Python side of rendering.
+Run from the project root: python3 benchmarks/bench_toggle.py
+"""
+import curses
+import os
+import sys
+import time
+from typing import Any, Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen import generate_maze  # noqa: E402
+from mazegen.draw_maze import DrawMaze  # noqa: E402
+
+SIZES = [(50, 50), (100, 100), (200, 200)]
+
+
+class CountingWindow:
+    """ stands in for a curses window, counts drawing calls """
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def addstr(self, *args: Any) -> None:
+        self.calls += 1
+
+    def chgat(self, *args: Any) -> None:
+        self.calls += 1
+
+    def erase(self) -> None:
+        pass
+
+    def refresh(self) -> None:
+        pass
+
+    def getmaxyx(self) -> tuple:
+        return (1000, 1000)
+
+
+def measure(draw: Callable[[Any], None]) -> tuple:
+    """ returns (best of 3 milliseconds, calls) for one toggle """
+    best = float("inf")
+    calls = 0
+    for _ in range(3):
+        window = CountingWindow()
+        start = time.perf_counter()
+        draw(window)
+        best = min(best, time.perf_counter() - start)
+        calls = window.calls
+    return best * 1e3, calls
+
+
+def main() -> None:
+    curses.color_pair = lambda n: n << 8  # type: ignore[assignment]
+    print(f"{'size':>10} {'toggle':>7} {'old ms':>9} {'old calls':>10} "
+          f"{'new ms':>9} {'new calls':>10}")
+    for width, height in SIZES:
+        maze = generate_maze.Maze(width, height, 42)
+        maze.pattern_42()
+        maze.maze_generator((0, 0))
+        entry, exit = (0, 0), (width - 1, height - 1)
+        path = maze.maze_solver(entry, exit)
+        path_layer = DrawMaze.merge_spans(DrawMaze.path_spans(entry, path))
+
+        def redraw(window: Any, with_path: bool) -> None:
+            window.erase()
+            DrawMaze.draw_the_maze(window, maze.maze_struct, width, height,
+                                   6)
+            DrawMaze.draw_entry_exit(window, entry, exit)
+            DrawMaze.draw_maze_menu(window, width, height)
+            if with_path:
+                DrawMaze.animate_path(window, entry, path, 0)
+                DrawMaze.draw_entry_exit(window, entry, exit)
+
+        def recolor(window: Any) -> None:
+            DrawMaze.recolor_walls(window, maze.maze_struct, width, height,
+                                   6, path_layer)
+            DrawMaze.draw_entry_exit(window, entry, exit)
+
+        def hide(window: Any) -> None:
+            DrawMaze.hide_path(window, path_layer)
+            DrawMaze.draw_entry_exit(window, entry, exit)
+
+        size = f"{width}x{height}"
+        for name, old, new in (
+            ("color", lambda w: redraw(w, True), recolor),
+            ("hide", lambda w: redraw(w, False), hide),
+        ):
+            old_ms, old_calls = measure(old)
+            new_ms, new_calls = measure(new)
+            print(f"{size:>10} {name:>7} {old_ms:>9.1f} {old_calls:>10,} "
+                  f"{new_ms:>9.1f} {new_calls:>10,}")
+
+
+if __name__ == "__main__":
+    main()
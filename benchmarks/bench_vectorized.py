@@ -0,0 +1,89 @@
+"""
+Benchmark of the NumPy backend against the pure Python backtracker,
+in cells per second, then of batched small mazes (with their solution
+lengths) in mazes per second. On the biggest grid it also prints if
+each NumPy generator met the target time. Needs numpy, skipped
+without it.
+Run from the project root: python3 benchmarks/bench_vectorized.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen.generate_maze import (  # noqa: E402
+    Maze, vectorized_batch, vectorized_maze
+)
+
+SIZES = [(300, 300), (1000, 1000), (10000, 10000)]
+# the Python generator is too slow to time on bigger grids
+PYTHON_MAX = 1000 * 1000
+# seconds a NumPy maze of the biggest size should take at most
+TARGET = 1.0
+SEED = 42
+BATCH = 10000
+BATCH_SIZE = 21
+
+
+def cells_per_second(width: int, height: int, algorithm: str) -> float:
+    """ generated cells per second for one maze """
+    start = time.perf_counter()
+    if algorithm == "backtracker":
+        Maze(width, height, SEED).maze_generator((0, 0))
+    else:
+        vectorized_maze(width, height, SEED, algorithm)
+    return width * height / (time.perf_counter() - start)
+
+
+def mazes_per_second(algorithm: str) -> float:
+    """ small mazes generated and solved per second """
+    size = BATCH_SIZE
+    start = time.perf_counter()
+    if algorithm == "backtracker":
+        # one Maze at a time, on a tenth of the batch
+        for seed in range(BATCH // 10):
+            maze = Maze(size, size, seed)
+            maze.maze_generator((0, 0))
+            maze.maze_solver((0, 0), (size - 1, size - 1))
+        return BATCH // 10 / (time.perf_counter() - start)
+    vectorized_batch(size, size, range(BATCH), algorithm)
+    return BATCH / (time.perf_counter() - start)
+
+
+def main() -> None:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("numpy is not installed, skipping the vectorized benchmark")
+        return
+    print(f"{'size':>12} {'backtracker':>13} {'binary_tree':>13} "
+          f"{'sidewinder':>13}  (cells/s)")
+    speeds = {}
+    for width, height in SIZES:
+        results = []
+        for algorithm in ("backtracker", "binary_tree", "sidewinder"):
+            if algorithm == "backtracker" and width * height > PYTHON_MAX:
+                results.append(f"{'-':>13}")
+                continue
+            speeds[algorithm] = cells_per_second(width, height, algorithm)
+            results.append(f"{speeds[algorithm]:>13,.0f}")
+        print(f"{f'{width}x{height}':>12} {' '.join(results)}")
+
+    # speeds now holds the biggest size
+    width, height = SIZES[-1]
+    for algorithm in ("binary_tree", "sidewinder"):
+        seconds = width * height / speeds[algorithm]
+        verdict = "met" if seconds < TARGET else "missed"
+        print(f"{algorithm:>12} {width}x{height} in {seconds:.2f} s, "
+              f"target {TARGET:g} s {verdict}")
+
+    print(f"\n{BATCH} mazes of {BATCH_SIZE}x{BATCH_SIZE}, generated and "
+          "solved")
+    for algorithm in ("backtracker", "binary_tree", "sidewinder"):
+        print(f"{algorithm:>12} {mazes_per_second(algorithm):>13,.0f} "
+              "mazes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of the maze file verifier (python3 -m mazegen verify) on
+a big maze in the hex and the packed format: how fast the file is
+read once, against verify with one worker and with one per core, in
+MB/s, and the best verify speed in millions of cells per second.
+Run from the project root: python3 benchmarks/bench_verify.py
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen.output import write_maze  # noqa: E402
+from mazegen.packed import write_maze_packed  # noqa: E402
+from mazegen.tiled import tiled_maze  # noqa: E402
+from mazegen.verify import verify  # noqa: E402
+
+WIDTH = HEIGHT = 2000
+SEED = 42
+
+
+def main() -> None:
+    entry, exit = (0, 0), (WIDTH - 1, HEIGHT - 1)
+    maze = tiled_maze(WIDTH, HEIGHT, SEED)
+    path = maze.maze_solver(entry, exit)
+    workers = sorted({1, os.cpu_count() or 1})
+
+    print(f"{WIDTH}x{HEIGHT} maze, path of {len(path):,} moves")
+    print(f"{'format':>8} {'MB':>7} {'read MB/s':>10} "
+          + " ".join(f"{f'{n} worker' + ('s' if n > 1 else ''):>10}"
+                     for n in workers)
+          + f" {'Mcells/s':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, write in (("hex", write_maze),
+                            ("packed", write_maze_packed)):
+            file_name = os.path.join(directory, f"maze.{name}")
+            write(file_name, maze, entry, exit, path)
+
+            start = time.perf_counter()
+            with open(file_name, "rb") as maze_file:
+                while maze_file.read(1 << 20):
+                    pass
+            read = time.perf_counter() - start
+
+            times = []
+            for count in workers:
+                start = time.perf_counter()
+                report = verify(file_name, count)
+                times.append(time.perf_counter() - start)
+                if not report.valid:
+                    print(f"ERROR: {name}: {report.errors[0]}")
+                    sys.exit(1)
+
+            size = os.path.getsize(file_name) / 1e6
+            print(f"{name:>8} {size:>7.1f} {size / read:>10,.0f} "
+                  + " ".join(f"{size / seconds:>10.2f}" for seconds in times)
+                  + f" {WIDTH * HEIGHT / min(times) / 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark of the chunked maze world (python3 -m mazegen world): a
+view moves one cell at a time straight east across a world of a
+billion cells a side, as it does following a player, then back.
+For each distance it prints the time per view, the chunks generated
+per second and the memory the kept chunks use, which stays the same
+however far the view goes. On the way back the dropped chunks are
+generated again: the views must be the same as on the way out, and
+it exits with status 1 if one is not.
+Run from the project root: python3 benchmarks/bench_world.py
+"""
+import hashlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mazegen.world import ChunkWorld  # noqa: E402
+
+SIZE = 10 ** 9
+# cells shown, about a 120x40 terminal
+COLUMNS, ROWS = 29, 18
+DISTANCES = [1_000, 5_000, 20_000]
+SEED = 42
+
+
+def walk(world: ChunkWorld, xs: range, y: int) -> list:
+    """ the digest of the view (and the ring around it) at each x """
+    return [
+        hashlib.sha256(world.region(x - 1, y - 1, x + COLUMNS + 1,
+                                    y + ROWS + 1)).digest()
+        for x in xs
+    ]
+
+
+def main() -> None:
+    print(f"{'cells':>8} {'views':>7} {'ms/view':>8} {'chunks':>7} "
+          f"{'chunks/s':>9} {'kept KB':>8}")
+    failed = False
+    for distance in DISTANCES:
+        world = ChunkWorld(SIZE, SIZE, SEED)
+        y = SIZE // 2
+        start = time.perf_counter()
+        out = walk(world, range(0, distance), y)
+        back = walk(world, range(distance - 1, -1, -1), y)
+        seconds = time.perf_counter() - start
+        if back[::-1] != out:
+            failed = True
+
+        kept = sum(len(cells) for cells in world.chunks.values())
+        views = distance * 2
+        print(f"{distance:>8,} {views:>7,} {seconds / views * 1e3:>8.3f} "
+              f"{world.generated:>7,} {world.generated / seconds:>9,.0f} "
+              f"{kept / 1024:>8.0f}")
+
+    if failed:
+        print("ERROR: a chunk generated again was not the same")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
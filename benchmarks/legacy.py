@@ -0,0 +1,195 @@
+"""
+The original implementations that the benchmarks measure against.
+They are copies of the old code, kept only as the "before" reference.
+"""
+import curses as cs
+import random
+from collections import deque
+from typing import Any, Dict, List
+
+from mazegen.generate_maze import (
+    bin_value, directions, rev_directions, x_axis, y_axis
+)
+
+
+class LegacyCell:
+    """ the old cell, one python object per cell """
+
+    def __init__(self) -> None:
+        self.wall = 15
+        self.visited = False
+        self.pattern = False
+
+
+def legacy_grid(width: int, height: int) -> List[List[LegacyCell]]:
+    """ builds the old list of lists of cells """
+    return [[LegacyCell() for w in range(width)] for h in range(height)]
+
+
+def recursive_generator(grid: List[List[LegacyCell]], entry: tuple,
+                        perfect: bool = True) -> None:
+    """ the recursive backtracker as it was before the explicit stack """
+    x, y = entry
+    height, width = len(grid), len(grid[0])
+    curent = grid[y][x]
+    curent.visited = True
+
+    dirs = directions.copy()
+    random.shuffle(dirs)
+
+    for direction in dirs:
+        next_x = x + x_axis[direction]
+        next_y = y + y_axis[direction]
+        if (
+            next_x < 0 or next_x >= width or
+            next_y < 0 or next_y >= height or
+            grid[next_y][next_x].pattern
+        ):
+            continue
+        neighbor = grid[next_y][next_x]
+        if neighbor.visited is False:
+            curent.wall ^= bin_value[direction]
+            neighbor.wall ^= bin_value[rev_directions[direction]]
+            recursive_generator(grid, (next_x, next_y), perfect)
+        elif perfect is False:
+            if (
+                curent.wall & bin_value[direction]
+            ) and (random.random() < 0.10):
+                curent.wall ^= bin_value[direction]
+                neighbor.wall ^= bin_value[rev_directions[direction]]
+
+
+def legacy_from_cells(cells: bytearray, width: int,
+                      height: int) -> List[List[LegacyCell]]:
+    """ copies a packed grid into the old list of lists of cells """
+    grid = legacy_grid(width, height)
+    for y in range(height):
+        for x in range(width):
+            byte = cells[y * width + x]
+            grid[y][x].wall = byte & 15
+            grid[y][x].visited = bool(byte & 16)
+            grid[y][x].pattern = bool(byte & 32)
+    return grid
+
+
+def legacy_cell_walls(row: int, col: int,
+                      grid: List[List[LegacyCell]]) -> Dict[str, bool]:
+    """ the old get_cell_walls_from_struct """
+    if row < 0 or col < 0 or row >= len(grid) or col >= len(grid[0]):
+        return {'east': False, 'north': False, 'west': False,
+                'south': False}
+    v = grid[row][col].wall
+    return {
+        'north': bool(v & 1),
+        'east': bool(v & 2),
+        'south': bool(v & 4),
+        'west': bool(v & 8),
+    }
+
+
+def legacy_corner_char(up: bool, down: bool, left: bool,
+                       right: bool) -> str:
+    """ the old get_corner_char, with its dict built on every call """
+    char_map = {
+        (True, True, True, True): '╋',
+        (True, True, True, False): '┫',
+        (True, True, False, True): '┣',
+        (False, True, True, True): '┳',
+        (True, False, True, True): '┻',
+        (True, True, False, False): '┃',
+        (False, False, True, True): '━',
+        (True, False, True, False): '┛',
+        (True, False, False, True): '┗',
+        (False, True, True, False): '┓',
+        (False, True, False, True): '┏',
+        (True, False, False, False): '┃',
+        (False, True, False, False): '┃',
+        (False, False, True, False): '━',
+        (False, False, False, True): '━',
+        (False, False, False, False): ' '
+    }
+    return char_map.get((up, down, left, right), ' ')
+
+
+def legacy_draw_the_maze(window: Any, grid: List[List[LegacyCell]],
+                         width: int, height: int,
+                         color_walls: int = 5) -> None:
+    """ the old draw_the_maze, one addstr per character """
+    for y in range(height):
+        for x in range(width):
+            if grid[y][x].visited:
+                attr = cs.color_pair(2)
+            else:
+                attr = cs.color_pair(1)
+            window.addstr(y * 2 + 1, x * 3 + 1, "  ", attr)
+            window.addstr(y * 2 + 2, x * 3 + 1, "  ", attr)
+
+    for cy in range(height + 1):
+        for cx in range(width + 1):
+            top_left = legacy_cell_walls(cy - 1, cx - 1, grid)
+            top_right = legacy_cell_walls(cy - 1, cx, grid)
+            bottom_left = legacy_cell_walls(cy, cx - 1, grid)
+            bottom_right = legacy_cell_walls(cy, cx, grid)
+            up = top_left['east'] or top_right['west']
+            down = bottom_left['east'] or bottom_right['west']
+            left = top_left['south'] or bottom_left['north']
+            right = top_right['south'] or bottom_right['north']
+            char = legacy_corner_char(up, down, left, right)
+
+            attr = cs.color_pair(color_walls) | cs.A_BOLD
+            window.addstr(cy * 2, cx * 3, char, attr)
+            if right and cx < width:
+                window.addstr(cy * 2, cx * 3 + 1, '━', attr)
+                window.addstr(cy * 2, cx * 3 + 2, '━', attr)
+            if down and cy < height:
+                window.addstr(cy * 2 + 1, cx * 3, '┃', attr)
+
+
+def legacy_solver(grid: List[List[LegacyCell]], entry: tuple,
+                  exit: tuple) -> str:
+    """ the old maze_solver, dict of tuples and path = move + path """
+    frontier = deque([entry])
+    came_from: Dict[Any, Any] = {entry: None}
+    while frontier:
+        x, y = frontier.popleft()
+        if (x, y) == exit:
+            break
+        cell = grid[y][x]
+        for d, dx, dy, move in [
+            ('n', 0, -1, 'N'),
+            ('s', 0, 1, 'S'),
+            ('e', 1, 0, 'E'),
+            ('w', -1, 0, 'W')
+        ]:
+            if not (cell.wall & bin_value[d]):
+                nx, ny = x + dx, y + dy
+                if (nx, ny) not in came_from:
+                    frontier.append((nx, ny))
+                    came_from[(nx, ny)] = ((x, y), move)
+
+    path = ""
+    curent = exit
+    while True:
+        value = came_from[curent]
+        if value is None:
+            break
+        curent, move = value
+        path = move + path
+    return path
+
+
+def legacy_write_maze(file_name: str, grid: List[List[LegacyCell]],
+                      entry: tuple, exit: tuple, path: str) -> None:
+    """ the old writer in a_maze_ing.py, one write per cell """
+    with open(file_name, "w") as maze_file:
+        for _ in grid:
+            for c in _:
+                maze_file.write(format(c.wall, 'X'))
+            maze_file.write("\n")
+
+        maze_file.write("\n")
+        maze_file.write(str(entry).strip("()"))
+        maze_file.write("\n")
+        maze_file.write(str(exit).strip("()"))
+        maze_file.write("\n")
+        maze_file.write(path)
@@ -1,6 +1,21 @@
+from typing import Any
+
 from .parsing import file_parsing, config_parsing
-from .draw_maze import display_maze
+from .output import write_maze
+from .generate_maze import Maze
 
 __all__ = [
-    "file_parsing", "config_parsing", "display_maze"
+    "file_parsing", "config_parsing", "display_maze", "write_maze", "Maze"
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Imports the curses display (draw_maze) the first time display_maze
+    is asked for, so generating, solving and parsing never load curses.
+    """
+    if name == "display_maze":
+        from .draw_maze import display_maze
+        globals()[name] = display_maze
+        return display_maze
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
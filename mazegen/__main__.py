@@ -0,0 +1,152 @@
+import argparse
+import random
+import sys
+
+from mazegen import batch as batch_mode
+from mazegen import verify as verify_mode
+from mazegen.generate_maze import eller_rows
+from mazegen.output import write_maze, write_rows
+from mazegen.packed import packed_to_text, text_to_packed
+from mazegen.parsing import file_parsing, config_parsing
+from mazegen.tiled import TILE, tiled_maze
+from mazegen.world import CHUNK, CHUNKS, ChunkWorld
+
+
+def main() -> None:
+    """
+    Command line entry point: python3 -m mazegen <command> ...
+    """
+    parser = argparse.ArgumentParser(prog="python3 -m mazegen")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch", help="generate many mazes without the display")
+    batch.add_argument("config", help="config file, SEED is ignored")
+    batch.add_argument("--count", type=int,
+                       help="number of mazes, seeds start at --start")
+    batch.add_argument("--start", type=int, default=1,
+                       help="first seed used with --count (default 1)")
+    batch.add_argument("--seeds", metavar="FIRST-LAST",
+                       help="range of seeds, both ends included")
+    batch.add_argument("--workers", type=int,
+                       help="worker processes (default: all cores)")
+    batch.add_argument("--output-dir",
+                       help="where to write (default: next to OUTPUT_FILE)")
+
+    stream = commands.add_parser(
+        "stream", help="write a maze row by row, in constant memory")
+    stream.add_argument("config", help="config file")
+
+    tiled = commands.add_parser(
+        "tiled", help="generate a giant maze tile by tile on all cores")
+    tiled.add_argument("config", help="config file")
+    tiled.add_argument("--tile", type=int, default=TILE,
+                       help=f"side of a tile in cells (default {TILE})")
+    tiled.add_argument("--workers", type=int,
+                       help="worker processes (default: all cores)")
+
+    pack = commands.add_parser(
+        "pack", help="convert a hex maze file to the packed format")
+    pack.add_argument("text_file")
+    pack.add_argument("packed_file")
+    pack.add_argument("--seed", help="seed to store in the header")
+
+    unpack = commands.add_parser(
+        "unpack", help="convert a packed maze file to the hex format")
+    unpack.add_argument("packed_file")
+    unpack.add_argument("text_file")
+
+    verify = commands.add_parser(
+        "verify", help="check maze files (hex or packed) are valid mazes")
+    verify.add_argument("files", nargs="+", metavar="file")
+    verify.add_argument("--perfect", action="store_true",
+                        help="also fail when a maze has loops")
+    verify.add_argument("--workers", type=int,
+                        help="worker processes (default: all cores)")
+
+    world = commands.add_parser(
+        "world", help="play a maze of any size, generated chunk by chunk")
+    world.add_argument("config", help="config file")
+    world.add_argument("--chunk", type=int, default=CHUNK,
+                       help=f"side of a chunk in cells (default {CHUNK})")
+    world.add_argument("--chunks", type=int, default=CHUNKS,
+                       help=f"chunks kept in memory (default {CHUNKS})")
+
+    serve = commands.add_parser(
+        "serve", help="serve mazes over HTTP on localhost")
+    serve.add_argument("--port", type=int, default=8042,
+                       help="port on 127.0.0.1 (default 8042)")
+    serve.add_argument("--workers", type=int,
+                       help="worker processes (default: all cores)")
+
+    args = parser.parse_args()
+
+    if args.command == "batch":
+        config = config_parsing(file_parsing(args.config))
+        seeds = batch_mode.parse_seeds(args.count, args.start, args.seeds)
+        batch_mode.main(config, seeds, args.output_dir, args.workers)
+
+    elif args.command == "stream":
+        config = config_parsing(file_parsing(args.config))
+        if config["SEED_EXIST"] is False:
+            config["SEED"] = random.randint(1, 100)
+        rows = eller_rows(config["WIDTH"], config["HEIGHT"],
+                          config["SEED"], config["PERFECT"])
+        write_rows(config["OUTPUT_FILE"], rows,
+                   config["ENTRY"], config["EXIT"])
+
+    elif args.command == "tiled":
+        config = config_parsing(file_parsing(args.config))
+        if config["SEED_EXIST"] is False:
+            config["SEED"] = random.randint(1, 100)
+        if args.tile <= 0:
+            print("ERROR: --tile must be positive")
+            sys.exit(1)
+        maze = tiled_maze(config["WIDTH"], config["HEIGHT"], config["SEED"],
+                          config["PERFECT"], config["ENTRY"],
+                          config.get("ALGORITHM", "backtracker"), args.tile,
+                          args.workers)
+        path = maze.maze_solver(config["ENTRY"], config["EXIT"])
+        write_maze(config["OUTPUT_FILE"], maze, config["ENTRY"],
+                   config["EXIT"], path)
+
+    elif args.command == "pack":
+        try:
+            text_to_packed(args.text_file, args.packed_file, args.seed)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+    elif args.command == "unpack":
+        try:
+            packed_to_text(args.packed_file, args.text_file)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: {e}")
+            sys.exit(1)
+
+    elif args.command == "verify":
+        verify_mode.main(args.files, args.perfect, args.workers)
+
+    elif args.command == "world":
+        config = config_parsing(file_parsing(args.config))
+        if config["SEED_EXIST"] is False:
+            config["SEED"] = random.randint(1, 100)
+        if args.chunk <= 0 or args.chunks <= 0:
+            print("ERROR: --chunk and --chunks must be positive")
+            sys.exit(1)
+        maze_world = ChunkWorld(config["WIDTH"], config["HEIGHT"],
+                                config["SEED"], config["PERFECT"],
+                                config["ENTRY"], config["ALGORITHM"],
+                                args.chunk, args.chunks)
+        # imported here: only this command needs curses
+        from mazegen.draw_maze import display_world
+        display_world(maze_world, config["ENTRY"], config["EXIT"])
+
+    elif args.command == "serve":
+        # imported here: asyncio is only needed by this command
+        from mazegen import server
+        server.main(args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
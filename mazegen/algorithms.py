@@ -0,0 +1,249 @@
+from array import array
+from typing import Any, Callable, List, Optional, Tuple
+
+from .grid import PATTERN, VISITED
+
+# (dx, dy, wall bit of the cell, wall bit of the neighbour) of N, E, S, W
+MOVES = ((0, -1, 1, 4), (1, 0, 2, 8), (0, 1, 4, 1), (-1, 0, 8, 2))
+LOOP_CHANCE = 0.10
+
+Step = Optional[Callable[[tuple], None]]
+
+
+def neighbours(index: int, width: int,
+               height: int) -> List[Tuple[int, int, int]]:
+    """ (neighbour index, wall bit, neighbour wall bit) inside the grid """
+    y, x = divmod(index, width)
+    found = []
+    for dx, dy, bit, rev_bit in MOVES:
+        next_x, next_y = x + dx, y + dy
+        if 0 <= next_x < width and 0 <= next_y < height:
+            found.append((next_y * width + next_x, bit, rev_bit))
+    return found
+
+
+def reachable(cells: bytearray, width: int, height: int,
+              entry: tuple) -> bytearray:
+    """
+    Marks with 1 every cell that can be reached from entry without
+    going through a 42 pattern cell. Only those cells get carved, so
+    every algorithm gives one connected maze around the pattern.
+    """
+    start = entry[1] * width + entry[0]
+    region = bytearray(width * height)
+    region[start] = 1
+    todo = [start]
+    while todo:
+        index = todo.pop()
+        for there, _, _ in neighbours(index, width, height):
+            if not region[there] and not cells[there] & PATTERN:
+                region[there] = 1
+                todo.append(there)
+    return region
+
+
+def carve(cells: bytearray, width: int, here: int, there: int,
+          bit: int, rev_bit: int, step: Step) -> None:
+    """
+    Opens the wall between two cells, marks both visited and tells
+    step which two cells changed.
+    """
+    cells[here] = (cells[here] ^ bit) | VISITED
+    cells[there] = (cells[there] ^ rev_bit) | VISITED
+    if step:
+        step((divmod(here, width)[::-1], divmod(there, width)[::-1]))
+
+
+def add_loops(cells: bytearray, width: int, height: int, rng: Any,
+              region: bytearray, step: Step) -> None:
+    """
+    For PERFECT=False: opens each wall still closed between two cells
+    of the maze with the same 10% chance the backtracker uses.
+    """
+    rand = rng.random
+    for here in range(width * height):
+        if not region[here]:
+            continue
+        for there, bit, rev_bit in neighbours(here, width, height):
+            # only east and south, so each wall is tried once
+            if (
+                there > here and region[there] and cells[here] & bit and
+                rand() < LOOP_CHANCE
+            ):
+                carve(cells, width, here, there, bit, rev_bit, step)
+
+
+def find(parent: array, index: int) -> int:
+    """ root of a union-find set, halving the path on the way """
+    while parent[index] != index:
+        parent[index] = parent[parent[index]]
+        index = parent[index]
+    return index
+
+
+def kruskal(cells: bytearray, width: int, height: int, rng: Any,
+            entry: tuple, step: Step = None, perfect: bool = True) -> None:
+    """
+    Randomized Kruskal: goes through every inner wall in random order
+    and opens it when the two cells are not connected yet, which a
+    union-find (path halving, union by size) tells in near O(1).
+    Memory is one int per wall and two per cell.
+    """
+    region = reachable(cells, width, height, entry)
+    cells[entry[1] * width + entry[0]] |= VISITED
+
+    # wall = index * 2 (east wall of index) or index * 2 + 1 (south wall)
+    walls = array('i')
+    for index in range(width * height):
+        if not region[index]:
+            continue
+        x = index % width
+        if x + 1 < width and region[index + 1]:
+            walls.append(index * 2)
+        if index + width < width * height and region[index + width]:
+            walls.append(index * 2 + 1)
+    order = list(walls)
+    rng.shuffle(order)
+
+    parent = array('i', range(width * height))
+    size = array('i', [1]) * (width * height)
+    for wall in order:
+        here, south = divmod(wall, 2)
+        there = here + width if south else here + 1
+        a, b = find(parent, here), find(parent, there)
+        if a == b:
+            continue
+        if size[a] < size[b]:
+            a, b = b, a
+        parent[b] = a
+        size[a] += size[b]
+        if south:
+            carve(cells, width, here, there, 4, 1, step)
+        else:
+            carve(cells, width, here, there, 2, 8, step)
+
+    if not perfect:
+        add_loops(cells, width, height, rng, region, step)
+
+
+def wilson(cells: bytearray, width: int, height: int, rng: Any,
+           entry: tuple, step: Step = None, perfect: bool = True) -> None:
+    """
+    Wilson's algorithm: from each cell not in the maze yet, walks at
+    random until it hits the maze, then carves the walk with its loops
+    erased (each cell keeps only the last direction it left by).
+    Gives a uniformly random perfect maze, slow at first when the
+    maze is small and fast at the end.
+    """
+    region = reachable(cells, width, height, entry)
+    rand = rng.random
+    start = entry[1] * width + entry[0]
+    cells[start] |= VISITED
+    # last move taken from each cell of the current walk
+    leave = array('i', [-1]) * (width * height)
+    choices = [
+        [move for move in neighbours(index, width, height)
+         if region[move[0]]] if region[index] else []
+        for index in range(width * height)
+    ]
+
+    for first in range(width * height):
+        if not region[first] or cells[first] & VISITED:
+            continue
+        index = first
+        while not cells[index] & VISITED:
+            options = choices[index]
+            choice = int(rand() * len(options))
+            leave[index] = choice
+            index = options[choice][0]
+
+        index = first
+        while True:
+            there, bit, rev_bit = choices[index][leave[index]]
+            joined = cells[there] & VISITED
+            carve(cells, width, index, there, bit, rev_bit, step)
+            if joined:
+                break
+            index = there
+
+    if not perfect:
+        add_loops(cells, width, height, rng, region, step)
+
+
+def prim(cells: bytearray, width: int, height: int, rng: Any,
+         entry: tuple, step: Step = None, perfect: bool = True) -> None:
+    """
+    Randomized Prim: keeps the frontier of cells next to the maze,
+    picks one at random and joins it to a random neighbour already in
+    the maze. Gives many short dead ends.
+    """
+    region = reachable(cells, width, height, entry)
+    rand = rng.random
+    start = entry[1] * width + entry[0]
+    cells[start] |= VISITED
+    # 1 once a cell is in the frontier list
+    queued = bytearray(width * height)
+    queued[start] = 1
+    frontier = []
+    for there, _, _ in neighbours(start, width, height):
+        if region[there]:
+            queued[there] = 1
+            frontier.append(there)
+
+    while frontier:
+        pick = int(rand() * len(frontier))
+        index = frontier[pick]
+        frontier[pick] = frontier[-1]
+        frontier.pop()
+
+        inside = []
+        for there, bit, rev_bit in neighbours(index, width, height):
+            if not region[there]:
+                continue
+            if cells[there] & VISITED:
+                inside.append((there, bit, rev_bit))
+            elif not queued[there]:
+                queued[there] = 1
+                frontier.append(there)
+        there, bit, rev_bit = inside[int(rand() * len(inside))]
+        carve(cells, width, index, there, bit, rev_bit, step)
+
+    if not perfect:
+        add_loops(cells, width, height, rng, region, step)
+
+
+def growing_tree(cells: bytearray, width: int, height: int, rng: Any,
+                 entry: tuple, step: Step = None, perfect: bool = True,
+                 newest_chance: float = 0.5) -> None:
+    """
+    Growing Tree: keeps a list of active cells and grows from the
+    newest one or, newest_chance aside, from a random one. Always the
+    newest is a backtracker, always random is close to Prim; the
+    default mixes long corridors with some branching.
+    """
+    region = reachable(cells, width, height, entry)
+    rand = rng.random
+    start = entry[1] * width + entry[0]
+    cells[start] |= VISITED
+    active = [start]
+
+    while active:
+        if rand() < newest_chance:
+            pick = len(active) - 1
+        else:
+            pick = int(rand() * len(active))
+        index = active[pick]
+
+        free = [
+            move for move in neighbours(index, width, height)
+            if region[move[0]] and not cells[move[0]] & VISITED
+        ]
+        if not free:
+            del active[pick]
+            continue
+        there, bit, rev_bit = free[int(rand() * len(free))]
+        carve(cells, width, index, there, bit, rev_bit, step)
+        active.append(there)
+
+    if not perfect:
+        add_loops(cells, width, height, rng, region, step)
@@ -0,0 +1,63 @@
+import time
+from typing import Callable, Optional
+
+FPS = 60
+# longest time an animation may take, whatever the maze size
+GENERATION_TIME = 6.0
+PATH_TIME = 3.0
+
+
+class FramePacer:
+    """
+    Paces an animation of a known number of steps.
+    Steps run at rate steps per second, or faster when that would
+    take more than duration seconds, and the screen is updated at
+    most fps times per second: when the steps come faster than that,
+    all the steps of one frame are drawn with a single update.
+    It follows a monotonic clock instead of a fixed sleep per step,
+    so a slow terminal makes frames hold more steps rather than
+    making the animation longer. Steps past the expected number (the
+    loops of a maze that is not perfect) never wait, so they can not
+    make it last longer than duration either.
+    """
+
+    def __init__(self, steps: int, duration: float, fps: float = FPS,
+                 rate: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep) -> None:
+        fastest = max(steps, 1) / duration
+        rate = fastest if rate is None else max(rate, fastest)
+        self.steps = steps
+        self.step_time = 1 / rate
+        self.frame_time = 1 / fps
+        self.clock = clock
+        self.sleep = sleep
+        self.start = clock()
+        self.next_frame = self.start
+        self.done = 0
+        self.pending = False
+
+    def step(self, present: Callable[[], None]) -> None:
+        """
+        Counts one drawn step. When its frame is due, calls present
+        to show everything drawn since the last frame, then waits
+        until the schedule catches up if the animation is ahead.
+        """
+        self.done += 1
+        self.pending = True
+        due = self.start + min(self.done, self.steps) * self.step_time
+        if due < self.next_frame and self.clock() < self.next_frame:
+            return
+        present()
+        self.pending = False
+        now = self.clock()
+        if due > now:
+            self.sleep(due - now)
+            now = due
+        self.next_frame = now + self.frame_time
+
+    def flush(self, present: Callable[[], None]) -> None:
+        """ shows the steps drawn since the last frame, if any """
+        if self.pending:
+            present()
+            self.pending = False
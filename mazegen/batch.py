@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, List, Optional, Tuple
+
+from mazegen import generate_maze
+from mazegen.cache import DISK_SIZE, MazeCache
+from mazegen.output import write_maze
+
+
+def batch_file_name(output_file: str, seed: int,
+                    output_dir: Optional[str] = None) -> str:
+    """
+    Returns the file name of one maze of a batch:
+    OUTPUT_FILE with the seed added before the extension,
+    so maze.txt becomes maze_<seed>.txt.
+    """
+    directory, name = os.path.split(output_file)
+    if output_dir is not None:
+        directory = output_dir
+    stem, ext = os.path.splitext(name)
+    return os.path.join(directory, f"{stem}_{seed}{ext}")
+
+
+def generate_one(config: dict, output_dir: Optional[str],
+                 seed: int) -> Tuple[int, str, int]:
+    """
+    Generates, solves and writes one maze, in a worker process.
+    With a CACHE_DIR, mazes an earlier batch made are read from it.
+    Returns (seed, file name, length of the shortest path).
+    """
+    if config.get("CACHE_DIR") is not None:
+        # only the disk layer: workers do not share memory
+        cache = MazeCache(0, config["CACHE_DIR"],
+                          config.get("CACHE_DIR_SIZE", DISK_SIZE))
+        maze = cache.maze(config["WIDTH"], config["HEIGHT"], seed,
+                          config["PERFECT"], config["ENTRY"], config["EXIT"],
+                          config.get("ALGORITHM", "backtracker"))
+        path = maze.solution(config["ENTRY"], config["EXIT"])
+    else:
+        maze = generate_maze.Maze(config["WIDTH"], config["HEIGHT"], seed)
+        maze.pattern_42()
+        maze.maze_generator(config["ENTRY"], None, config["PERFECT"],
+                            config.get("ALGORITHM", "backtracker"))
+        path = maze.maze_solver(config["ENTRY"], config["EXIT"])
+
+    file_name = batch_file_name(config["OUTPUT_FILE"], seed, output_dir)
+    write_maze(file_name, maze, config["ENTRY"], config["EXIT"], path)
+    return seed, file_name, len(path)
+
+
+def run_batch(config: dict, seeds: Iterable[int],
+              output_dir: Optional[str] = None,
+              workers: Optional[int] = None) -> List[Tuple[int, str, int]]:
+    """
+    Generates one maze per seed across a pool of worker processes
+    and writes each one in the hex output format.
+    Seeds are sent to workers in chunks so the pool stays busy
+    and the overhead per maze stays small.
+    """
+    seeds = list(seeds)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    job = partial(generate_one, config, output_dir)
+    if workers == 1:
+        return [job(seed) for seed in seeds]
+
+    chunksize = max(1, len(seeds) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(job, seeds, chunksize=chunksize))
+
+
+def parse_seeds(count: Optional[int], start: int,
+                seed_range: Optional[str]) -> range:
+    """
+    Returns the seeds to generate, from --count/--start or from
+    a --seeds FIRST-LAST range (both ends included).
+    Exits if neither or a wrong range is given.
+    """
+    if seed_range is not None:
+        try:
+            first, last = map(int, seed_range.split("-"))
+        except ValueError:
+            print(f"ERROR: invalid seed range ({seed_range})")
+            sys.exit(1)
+        if last < first:
+            print(f"ERROR: invalid seed range ({seed_range})")
+            sys.exit(1)
+        return range(first, last + 1)
+
+    if count is None or count <= 0:
+        print("ERROR: give a positive --count or a --seeds range")
+        sys.exit(1)
+    return range(start, start + count)
+
+
+def main(config: dict, seeds: range, output_dir: Optional[str],
+         workers: Optional[int]) -> None:
+    """
+    Runs a batch and prints how many mazes per second were made.
+    """
+    start = time.perf_counter()
+    results = run_batch(config, seeds, output_dir, workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(results)} mazes written in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.1f} mazes/s)")
@@ -0,0 +1,217 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from mazegen import generate_maze
+from mazegen.grid import PATTERN, VISITED, WALLS
+from mazegen.packed import PackedMaze, write_packed
+
+# part of every key: bump it when a generator or the solver changes
+# the maze or the path some parameters give, so older entries (on
+# disk too) are never used again
+CACHE_VERSION = 1
+# files kept in CACHE_DIR when CACHE_DIR_SIZE is not set
+DISK_SIZE = 256
+
+# wall nibble -> cell byte after generation: every cell of the maze has
+# an open wall, only the cells it could not reach are still closed
+_FLAGS = bytes(
+    byte if byte == WALLS else byte | VISITED for byte in range(256)
+)
+
+
+def cache_key(width: int, height: int, seed: Any, perfect: bool,
+              entry: tuple, exit: tuple,
+              algorithm: str = "backtracker") -> str:
+    """
+    The key of a generated and solved maze: a sha256 of everything
+    that decides it, CACHE_VERSION included. The seed keeps its type,
+    since Random(5) and Random("5") do not give the same maze.
+    """
+    text = repr((CACHE_VERSION, width, height, seed, perfect,
+                 tuple(entry), tuple(exit), algorithm))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def config_key(config: Dict[str, Any], seed: Any, perfect: bool) -> str:
+    """ cache_key of the maze a config gives with this seed """
+    return cache_key(config["WIDTH"], config["HEIGHT"], seed, perfect,
+                     config["ENTRY"], config["EXIT"],
+                     config.get("ALGORITHM", "backtracker"))
+
+
+class MazeCache:
+    """
+    Generated and solved mazes by cache_key, so the same parameters
+    are never generated or solved twice.
+    size mazes are kept in memory (whole cells, flags included) and
+    the least recently used one is dropped first. With a directory,
+    every maze is also written there in the packed format, and the
+    least recently used files are removed past disk_size files.
+    One lock guards it, so the pre-generation thread can share it.
+    """
+
+    def __init__(self, size: int = 32, directory: Optional[str] = None,
+                 disk_size: int = DISK_SIZE) -> None:
+        self.size = size
+        self.directory = directory
+        self.disk_size = disk_size
+        # key -> (cells, path), the most recently used last
+        self.entries: OrderedDict[str, Tuple[bytes, str]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str, maze: generate_maze.Maze, entry: tuple,
+            exit: tuple) -> bool:
+        """
+        Loads the cached maze of key into maze (a new maze with its 42
+        pattern, like the one that was generated), solved from entry
+        to exit. Returns False when it is not cached.
+        """
+        with self.lock:
+            found = self.entries.get(key)
+            if found is not None:
+                self.entries.move_to_end(key)
+            elif self.directory is not None:
+                found = self.read(key, maze, entry, exit)
+                if found is not None:
+                    self.remember(key, found)
+            if found is None:
+                self.misses += 1
+                return False
+            self.hits += 1
+
+        cells, path = found
+        maze.cells[:] = cells
+        maze.solved = (entry, exit, path)
+        return True
+
+    def put(self, key: str, maze: generate_maze.Maze, entry: tuple,
+            exit: tuple, seed: Any = None) -> None:
+        """
+        Stores a generated maze and its path from entry to exit
+        (solved here unless the maze already did it).
+        """
+        path = maze.solution(entry, exit)
+        with self.lock:
+            self.remember(key, (bytes(maze.cells), path))
+            if self.directory is not None:
+                self.write(key, maze, entry, exit, path, seed)
+
+    def maze(self, width: int, height: int, seed: Any, perfect: bool,
+             entry: tuple, exit: tuple,
+             algorithm: str = "backtracker") -> generate_maze.Maze:
+        """
+        The solved maze of these parameters, generated only when it
+        is not cached yet.
+        """
+        maze = generate_maze.Maze(width, height, seed)
+        maze.pattern_42()
+        key = cache_key(width, height, seed, perfect, entry, exit,
+                        algorithm)
+        if not self.get(key, maze, entry, exit):
+            maze.maze_generator(entry, None, perfect, algorithm)
+            self.put(key, maze, entry, exit, seed)
+        return maze
+
+    def remember(self, key: str, found: Tuple[bytes, str]) -> None:
+        """ memory layer: adds an entry, drops the oldest past size """
+        if self.size <= 0:
+            return
+        self.entries[key] = found
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def file_name(self, key: str) -> str:
+        return os.path.join(str(self.directory), key + ".amz")
+
+    def read(self, key: str, maze: generate_maze.Maze, entry: tuple,
+             exit: tuple) -> Optional[Tuple[bytes, str]]:
+        """
+        Disk layer: the (cells, path) of key, None when there is no
+        such file or it does not hold a maze of this size.
+        The file only has walls: a cell with an open wall (and the
+        entry) was visited, and the pattern flags come from maze.
+        """
+        file_name = self.file_name(key)
+        size = maze.width * maze.height
+        try:
+            with PackedMaze(file_name) as packed:
+                if (
+                    (packed.width, packed.height) !=
+                    (maze.width, maze.height) or
+                    (packed.entry, packed.exit) != (tuple(entry), tuple(exit))
+                ):
+                    return None
+                walls = packed.cells(0, size)
+                path = packed.path
+            # used again: the file goes to the end of the LRU
+            os.utime(file_name)
+        except (OSError, ValueError):
+            return None
+        if len(walls) != size:
+            return None
+
+        cells = bytearray(walls.translate(_FLAGS))
+        cells[entry[1] * maze.width + entry[0]] |= VISITED
+        for index, byte in enumerate(maze.cells):
+            if byte & PATTERN:
+                cells[index] |= PATTERN
+        return bytes(cells), path
+
+    def write(self, key: str, maze: generate_maze.Maze, entry: tuple,
+              exit: tuple, path: str, seed: Any) -> None:
+        """
+        Disk layer: writes the file of key through a temporary file,
+        so other processes never read half of it, then removes the
+        least recently used files past disk_size.
+        """
+        directory = str(self.directory)
+        fd, temp_name = tempfile.mkstemp(dir=directory, prefix=".maze-")
+        os.close(fd)
+        try:
+            write_packed(temp_name, maze.width, maze.height, maze.cells,
+                         entry, exit, path, seed)
+            os.replace(temp_name, self.file_name(key))
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+
+        names = [name for name in os.listdir(directory)
+                 if name.endswith(".amz")]
+        if len(names) <= self.disk_size:
+            return
+        files = []
+        for name in names:
+            try:
+                file_name = os.path.join(directory, name)
+                files.append((os.path.getmtime(file_name), file_name))
+            except FileNotFoundError:
+                pass  # removed by another process meanwhile
+        files.sort()
+        for _, file_name in files[:len(files) - self.disk_size]:
+            try:
+                os.unlink(file_name)
+            except FileNotFoundError:
+                pass
+
+
+def config_cache(config: Dict[str, Any]) -> Optional[MazeCache]:
+    """
+    The MazeCache a config asks for (CACHE_SIZE mazes in memory,
+    CACHE_DIR on disk with CACHE_DIR_SIZE files), None when it asks
+    for none.
+    """
+    size = config.get("CACHE_SIZE", 0)
+    directory = config.get("CACHE_DIR")
+    if size <= 0 and directory is None:
+        return None
+    return MazeCache(size, directory,
+                     config.get("CACHE_DIR_SIZE", DISK_SIZE))
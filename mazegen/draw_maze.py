@@ -1,8 +1,68 @@
 import curses as cs
 import time
 from mazegen import generate_maze
-from typing import Any, Literal, Callable, List, Dict, Tuple
+from typing import (
+    TYPE_CHECKING, Any, Literal, Callable, Dict, Iterable, List, Optional,
+    Tuple
+)
 import random
+from mazegen.grid import VISITED
+from mazegen.animation import FramePacer, GENERATION_TIME, PATH_TIME
+from mazegen.cache import MazeCache, cache_key, config_key
+from mazegen.pregen import MazePool
+from mazegen.viewport import MazeView, needs_view
+
+if TYPE_CHECKING:
+    # only for annotations: the world mode is given a ChunkWorld
+    from mazegen.world import ChunkWorld
+
+# keys that move a MazeView when the maze does not fit the screen
+SCROLL_KEYS = ("KEY_UP", "KEY_DOWN", "KEY_LEFT", "KEY_RIGHT",
+               "KEY_PPAGE", "KEY_NPAGE")
+
+# lines of the menu drawn on the right of the maze
+MAZE_MENU = (
+    "R. ReGenerate The Maze",
+    "1. Find Path",
+    "2. Show/Hide Path",
+    "3. Player Mode",
+    "4. Change Color of Maze",
+    "X. Exit"
+)
+# and of the one of world mode
+WORLD_MENU = (
+    "Arrows. Move The Player",
+    "X. Exit"
+)
+
+# bits of a corner mask, one per wall line that meets at the corner
+UP, DOWN, LEFT, RIGHT = 1, 2, 4, 8
+
+_CORNER_CHARS = {
+    (True, True, True, True): '╋',
+    (True, True, True, False): '┫',
+    (True, True, False, True): '┣',
+    (False, True, True, True): '┳',
+    (True, False, True, True): '┻',
+    (True, True, False, False): '┃',
+    (False, False, True, True): '━',
+    (True, False, True, False): '┛',
+    (True, False, False, True): '┗',
+    (False, True, True, False): '┓',
+    (False, True, False, True): '┏',
+    (True, False, False, False): '┃',
+    (False, True, False, False): '┃',
+    (False, False, True, False): '━',
+    (False, False, False, True): '━',
+    (False, False, False, False): ' '
+}
+
+# box drawing character for every corner mask, built once
+CORNER_GLYPHS = tuple(
+    _CORNER_CHARS[(bool(m & UP), bool(m & DOWN),
+                   bool(m & LEFT), bool(m & RIGHT))]
+    for m in range(16)
+)
 
 
 class DrawMaze:
@@ -14,7 +74,7 @@ class DrawMaze:
 
     @staticmethod
     def get_cell_walls_from_struct(row: int, col: int,
-                                   maze_struct: List[List[generate_maze.Cell]]
+                                   maze_struct: generate_maze.Grid
                                    ) -> Dict[str, bool]:
         """
         Same idea as get_cell_walls(), but reads from maze_struct (Cell.wall).
@@ -40,28 +100,45 @@ class DrawMaze:
             'west': bool(v & 8),
         }
 
+    @staticmethod
+    def corner_mask(cells: bytearray, width: int, height: int,
+                    cy: int, cx: int) -> int:
+        """
+        Returns which walls meet at a corner as a 4 bit mask
+        (UP, DOWN, LEFT, RIGHT), read straight from the wall nibbles
+        of the 4 cells around it. Cells outside the maze have no walls.
+        """
+        top = cy > 0
+        bottom = cy < height
+        left = cx > 0
+        right = cx < width
+        top_left = cells[(cy - 1) * width + cx - 1] if top and left else 0
+        top_right = cells[(cy - 1) * width + cx] if top and right else 0
+        bottom_left = cells[cy * width + cx - 1] if bottom and left else 0
+        bottom_right = cells[cy * width + cx] if bottom and right else 0
+
+        mask = 0
+        if top_left & 2 or top_right & 8:
+            mask |= UP
+        if bottom_left & 2 or bottom_right & 8:
+            mask |= DOWN
+        if top_left & 4 or bottom_left & 1:
+            mask |= LEFT
+        if top_right & 4 or bottom_right & 1:
+            mask |= RIGHT
+        return mask
+
     @staticmethod
     def get_corner_walls(cy: int, cx: int,
-                         maze_struct: List[List[generate_maze.Cell]]
+                         maze_struct: generate_maze.Grid
                          ) -> Dict[str, bool]:
         """
         Same idea as get_corner_walls(), but reads from maze_struct.
         """
-        top_left = DrawMaze.get_cell_walls_from_struct(cy - 1, cx - 1,
-                                                       maze_struct)
-        top_right = DrawMaze.get_cell_walls_from_struct(cy - 1, cx,
-                                                        maze_struct)
-        bottom_left = DrawMaze.get_cell_walls_from_struct(cy, cx - 1,
-                                                          maze_struct)
-        bottom_right = DrawMaze.get_cell_walls_from_struct(cy, cx,
-                                                           maze_struct)
-
-        up = top_left['east'] or top_right['west']
-        down = bottom_left['east'] or bottom_right['west']
-        left = top_left['south'] or bottom_left['north']
-        right = top_right['south'] or bottom_right['north']
-
-        return {'up': up, 'down': down, 'left': left, 'right': right}
+        mask = DrawMaze.corner_mask(maze_struct.cells, maze_struct.width,
+                                    maze_struct.height, cy, cx)
+        return {'up': bool(mask & UP), 'down': bool(mask & DOWN),
+                'left': bool(mask & LEFT), 'right': bool(mask & RIGHT)}
 
     @staticmethod
     def get_corner_char(up: bool, down: bool, left: bool, right: bool) -> str:
@@ -70,29 +147,31 @@ class DrawMaze:
         Chooses character based on which walls connect to it.
         Uses special Unicode characters to draw smooth lines.
         """
-        char_map = {
-            (True, True, True, True): '╋',
-            (True, True, True, False): '┫',
-            (True, True, False, True): '┣',
-            (False, True, True, True): '┳',
-            (True, False, True, True): '┻',
-            (True, True, False, False): '┃',
-            (False, False, True, True): '━',
-            (True, False, True, False): '┛',
-            (True, False, False, True): '┗',
-            (False, True, True, False): '┓',
-            (False, True, False, True): '┏',
-            (True, False, False, False): '┃',
-            (False, True, False, False): '┃',
-            (False, False, True, False): '━',
-            (False, False, False, True): '━',
-            (False, False, False, False): ' '
-        }
-        return char_map.get((up, down, left, right), ' ')
+        return CORNER_GLYPHS[
+            (UP if up else 0) | (DOWN if down else 0) |
+            (LEFT if left else 0) | (RIGHT if right else 0)
+        ]
+
+    @staticmethod
+    def fill_cell(window: cs.window, maze_struct: generate_maze.Grid,
+                  x: int, y: int, *, use_visited: bool) -> None:
+
+        """ this method to fill one cell with white or black"""
+
+        if use_visited and maze_struct[y][x].visited:
+            attr = cs.color_pair(2)
+        else:
+            attr = cs.color_pair(1)
+
+        sy = y * 2 + 1
+        sx = x * 3 + 1
+
+        window.addstr(sy,     sx,     "  ", attr)
+        window.addstr(sy + 1, sx,     "  ", attr)
 
     @staticmethod
     def fill_cells(window: cs.window,
-                   maze_struct: List[List[generate_maze.Cell]],
+                   maze_struct: generate_maze.Grid,
                    width: int, height: int, *,
                    use_visited: bool) -> None:
 
@@ -100,51 +179,329 @@ class DrawMaze:
 
         for y in range(height):
             for x in range(width):
-                if use_visited and maze_struct[y][x].visited:
-                    attr = cs.color_pair(2)
-                else:
-                    attr = cs.color_pair(1)
+                DrawMaze.fill_cell(window, maze_struct, x, y,
+                                   use_visited=use_visited)
+
+    @staticmethod
+    def draw_corner(window: cs.window, maze_struct: generate_maze.Grid,
+                    cy: int, cx: int, width: int, height: int,
+                    color_walls: int) -> None:
+        """
+        Draws one corner glyph with the wall going right and down from it.
+        """
+        mask = DrawMaze.corner_mask(maze_struct.cells, width, height,
+                                    cy, cx)
+        attr = cs.color_pair(color_walls) | cs.A_BOLD
+
+        screen_y = cy * 2
+        screen_x = cx * 3
+        window.addstr(screen_y, screen_x, CORNER_GLYPHS[mask], attr)
 
-                sy = y * 2 + 1
-                sx = x * 3 + 1
+        if mask & RIGHT and cx < width:
+            window.addstr(screen_y, screen_x + 1, '━━', attr)
 
-                window.addstr(sy,     sx,     "  ", attr)
-                window.addstr(sy + 1, sx,     "  ", attr)
+        if mask & DOWN and cy < height:
+            window.addstr(screen_y + 1, screen_x, '┃', attr)
+
+    @staticmethod
+    def maze_rows(cells: bytearray, width: int, height: int,
+                  use_visited: bool = True,
+                  region: Optional[Tuple[int, int, int, int]] = None
+                  ) -> List[List[Tuple[str, bool]]]:
+        """
+        Builds every screen row of the maze as a list of (text, white)
+        runs. Black cells look the same as the wall background, so they
+        are merged into the wall text and a finished maze row is
+        usually one run; only white (not visited) cells split it.
+        region (x0, y0, x1, y1) limits the rows to the cells x0..x1-1,
+        y0..y1-1 (with the walls around them), starting at screen row
+        y0 * 2 and column x0 * 3, so a viewport only pays for what
+        it shows.
+        """
+        x0, y0, x1, y1 = region or (0, 0, width, height)
+        rows: List[List[Tuple[str, bool]]] = []
+        # a fill is black only when visited (and use_visited is on)
+        black = VISITED if use_visited else 0
+
+        def add(runs: List[Tuple[str, bool]], parts: List[str],
+                text: str, white: bool, current: bool) -> bool:
+            if white != current and parts:
+                runs.append((''.join(parts), current))
+                parts.clear()
+            parts.append(text)
+            return white
+
+        def cell_row(y: int) -> bytes:
+            # cells x0 - 1 .. x1 of row y, a wall-less cell outside
+            if y < 0 or y >= height:
+                return bytes(x1 - x0 + 2)
+            start = y * width
+            left = cells[start + x0 - 1:start + x0] if x0 > 0 else b'\0'
+            right = cells[start + x1:start + x1 + 1] if x1 < width else b'\0'
+            return bytes(left) + cells[start + x0:start + x1] + right
+
+        last = x1 - x0
+        for cy in range(y0, y1 + 1):
+            # the cell rows above and below this corner row
+            above = cell_row(cy - 1)
+            below = cell_row(cy)
+
+            runs: List[Tuple[str, bool]] = []
+            parts: List[str] = []
+            white = False
+            for i in range(last + 1):
+                top_left, top_right = above[i], above[i + 1]
+                bottom_left, bottom_right = below[i], below[i + 1]
+                mask = (
+                    (UP if top_left & 2 or top_right & 8 else 0) |
+                    (DOWN if bottom_left & 2 or bottom_right & 8 else 0) |
+                    (LEFT if top_left & 4 or bottom_left & 1 else 0) |
+                    (RIGHT if top_right & 4 or bottom_right & 1 else 0)
+                )
+                white = add(runs, parts, CORNER_GLYPHS[mask], False, white)
+                if i == last:
+                    break
+                if mask & RIGHT or cy == 0:
+                    white = add(runs, parts, '━━' if mask & RIGHT else '  ',
+                                False, white)
+                else:
+                    # no wall: the fill of the cell above shows through
+                    white = add(runs, parts, '  ',
+                                not top_right & black,
+                                white)
+            runs.append((''.join(parts), white))
+            rows.append(runs)
+
+            if cy == y1:
+                break
+            runs = []
+            parts = []
+            white = False
+            for i in range(last + 1):
+                wall = below[i] & 2 or below[i + 1] & 8
+                white = add(runs, parts, '┃' if wall else ' ', False, white)
+                if i < last:
+                    white = add(runs, parts, '  ',
+                                not below[i + 1] & black,
+                                white)
+            runs.append((''.join(parts), white))
+            rows.append(runs)
+        return rows
 
     @staticmethod
     def draw_the_maze(window: cs.window,
-                      maze_struct: List[List[generate_maze.Cell]],
+                      maze_struct: generate_maze.Grid,
                       width: int, height: int,
                       color_walls: int = 5,
                       use_visited: bool = True) -> None:
         """
         Draw maze using maze_struct (live walls), not maze_lines.
+        Every screen row is written with one addstr per run of colour,
+        which is a single call for a finished maze row.
+        On a MazeView only the visible cells are built and drawn.
         """
-        DrawMaze.fill_cells(window, maze_struct, width, height,
-                            use_visited=use_visited)
-        corner_rows = height + 1
-        corner_cols = width + 1
+        region = None
+        if isinstance(window, MazeView):
+            region = window.visible_cells()
+        x0, y0 = region[:2] if region else (0, 0)
+        rows = DrawMaze.maze_rows(maze_struct.cells, width, height,
+                                  use_visited, region)
+        DrawMaze.draw_rows(window, rows, x0, y0, color_walls)
 
-        for cy in range(corner_rows):
-            for cx in range(corner_cols):
-                walls = DrawMaze.get_corner_walls(cy, cx, maze_struct)
-                char = DrawMaze.get_corner_char(walls['up'], walls['down'],
-                                                walls['left'], walls['right'])
+    @staticmethod
+    def draw_rows(window: cs.window, rows: List[List[Tuple[str, bool]]],
+                  x0: int, y0: int, color_walls: int = 5) -> None:
+        """
+        Writes rows of maze_rows from cell (x0, y0), one addstr per
+        run of colour.
+        """
+        wall_attr = cs.color_pair(color_walls) | cs.A_BOLD
+        white_attr = cs.color_pair(1)
+        for i, runs in enumerate(rows):
+            screen_y = y0 * 2 + i
+            screen_x = x0 * 3
+            for text, white in runs:
+                window.addstr(screen_y, screen_x, text,
+                              white_attr if white else wall_attr)
+                screen_x += len(text)
 
-                screen_y = cy * 2
-                screen_x = cx * 3
-                window.addstr(screen_y, screen_x, char,
-                              cs.color_pair(color_walls) | cs.A_BOLD)
+    @staticmethod
+    def draw_world(window: Any, world: "ChunkWorld",
+                   color_walls: int = 5) -> None:
+        """
+        Draws the part of a ChunkWorld a MazeView shows: the visible
+        cells and the ring around them (their walls) are copied out
+        of their chunks, then drawn like a maze of that size.
+        """
+        x0, y0, x1, y1 = window.visible_cells()
+        cells = world.region(x0 - 1, y0 - 1, x1 + 1, y1 + 1)
+        columns, rows = x1 - x0, y1 - y0
+        DrawMaze.draw_rows(
+            window,
+            DrawMaze.maze_rows(cells, columns + 2, rows + 2, True,
+                               (1, 1, columns + 1, rows + 1)),
+            x0, y0, color_walls)
 
-                if walls['right'] and cx < width:
-                    window.addstr(screen_y, screen_x + 1, '━',
-                                  cs.color_pair(color_walls) | cs.A_BOLD)
-                    window.addstr(screen_y, screen_x + 2, '━',
-                                  cs.color_pair(color_walls) | cs.A_BOLD)
+    @staticmethod
+    def wall_spans(cells: bytearray, width: int, height: int,
+                   use_visited: bool = True,
+                   region: Optional[Tuple[int, int, int, int]] = None
+                   ) -> List[Tuple[int, int, int]]:
+        """
+        The wall layer of the maze: (screen y, screen x, columns) of
+        every run draw_the_maze writes with the wall colour, the same
+        runs as maze_rows without building their text. Only white
+        fills cut a row, so a finished maze row is one span.
+        """
+        x0, y0, x1, y1 = region or (0, 0, width, height)
+        black = VISITED if use_visited else 0
+        row_end = x1 * 3 + 1
+        spans = []
+        for screen_y in range(y0 * 2, y1 * 2 + 1):
+            cy, inside = divmod(screen_y, 2)
+            start = cy * width
+            if inside:
+                white = [x for x in range(x0, x1)
+                         if not cells[start + x] & black]
+            elif cy == 0:
+                white = []
+            else:
+                # no wall between the two cells: the fill of the top
+                # one shows through
+                bottom = (cells[start:start + width] if cy < height
+                          else bytes(width))
+                white = [x for x in range(x0, x1)
+                         if not cells[start - width + x] & (4 | black)
+                         and not bottom[x] & 1]
+
+            screen_x = x0 * 3
+            for x in white:
+                if x * 3 + 1 > screen_x:
+                    spans.append((screen_y, screen_x, x * 3 + 1 - screen_x))
+                screen_x = x * 3 + 3
+            spans.append((screen_y, screen_x, row_end - screen_x))
+        return spans
 
-                if walls['down'] and cy < height:
-                    window.addstr(screen_y + 1, screen_x, '┃',
-                                  cs.color_pair(color_walls) | cs.A_BOLD)
+    @staticmethod
+    def path_spans(entry: Tuple[int, int],
+                   path: Any | Literal['']) -> List[Tuple[int, int, int]]:
+        """
+        The path layer: (screen y, screen x, columns) of what the path
+        covers, two spans per move: the gap it opens in the wall
+        between two cells, then the cell it moves to.
+        """
+        x, y = entry
+        spans = []
+        for move in path:
+            old_x, old_y = x, y
+            if move == "N":
+                y -= 1
+            elif move == "S":
+                y += 1
+            elif move == "E":
+                x += 1
+            elif move == "W":
+                x -= 1
+
+            if move in ("E", "W"):
+                spans.append((old_y * 2 + 1, min(old_x, x) * 3 + 3, 1))
+            else:  # N or S
+                spans.append((min(old_y, y) * 2 + 2, old_x * 3 + 1, 2))
+            spans.append((y * 2 + 1, x * 3 + 1, 2))
+        return spans
+
+    @staticmethod
+    def recolor_walls(window: cs.window,
+                      maze_struct: generate_maze.Grid,
+                      width: int, height: int, color_walls: int,
+                      path: Iterable[Tuple[int, int, int]] = (),
+                      use_visited: bool = True) -> None:
+        """
+        Changes the colour of the walls already on the screen with
+        chgat, the text stays as it is. The spans of path (a shown
+        path) are given their colour back on top.
+        On a MazeView only the visible cells are changed.
+        """
+        region = None
+        if isinstance(window, MazeView):
+            region = window.visible_cells()
+        wall_attr = cs.color_pair(color_walls) | cs.A_BOLD
+        for y, x, columns in DrawMaze.wall_spans(maze_struct.cells, width,
+                                                 height, use_visited,
+                                                 region):
+            window.chgat(y, x, columns, wall_attr)
+        DrawMaze.show_path(window, path)
+
+    @staticmethod
+    def merge_spans(spans: Iterable[Tuple[int, int, int]]
+                    ) -> List[Tuple[int, int, int]]:
+        """
+        Sorts spans and joins the ones that touch on a row, so a
+        straight corridor of the path is a single span.
+        """
+        merged: List[Tuple[int, int, int]] = []
+        for y, x, columns in sorted(spans):
+            if merged:
+                last_y, last_x, last_columns = merged[-1]
+                if last_y == y and x <= last_x + last_columns:
+                    end = max(last_x + last_columns, x + columns)
+                    merged[-1] = (y, last_x, end - last_x)
+                    continue
+            merged.append((y, x, columns))
+        return merged
+
+    @staticmethod
+    def show_path(window: cs.window,
+                  path: Iterable[Tuple[int, int, int]]) -> None:
+        """
+        Shows a path (its spans) at once by giving its cells the path
+        colour: they are already blank, so only the colour changes.
+        """
+        for y, x, columns in path:
+            window.chgat(y, x, columns, cs.color_pair(3))
+
+    @staticmethod
+    def hide_path(window: cs.window, path: Iterable[Tuple[int, int, int]],
+                  color_walls: int = 5) -> None:
+        """
+        Takes a shown path (its spans) off the maze by giving only its
+        cells back the wall colour: every cell of a path is visited
+        (black) and so are the gaps between them. The markers are
+        drawn again by draw_entry_exit.
+        """
+        wall_attr = cs.color_pair(color_walls) | cs.A_BOLD
+        for y, x, columns in path:
+            window.chgat(y, x, columns, wall_attr)
+
+    @staticmethod
+    def draw_cells(window: cs.window,
+                   maze_struct: generate_maze.Grid,
+                   changed: Iterable[Tuple[int, int]],
+                   width: int, height: int,
+                   color_walls: int = 5,
+                   use_visited: bool = True) -> None:
+        """
+        Repaints only the changed cells, like draw_the_maze would.
+        The fill of a cell also covers the wall line below it, so the
+        cell above is filled again too, the old side walls are cleared,
+        then the 4 corners around the cell redraw its walls on top.
+        Costs the same for any maze size, and nothing for cells out
+        of a MazeView.
+        """
+        if isinstance(window, MazeView):
+            changed = [cell for cell in changed if window.shows(*cell)]
+        for x, y in changed:
+            if y > 0:
+                DrawMaze.fill_cell(window, maze_struct, x, y - 1,
+                                   use_visited=use_visited)
+            DrawMaze.fill_cell(window, maze_struct, x, y,
+                               use_visited=use_visited)
+            window.addstr(y * 2 + 1, x * 3, ' ')
+            window.addstr(y * 2 + 1, x * 3 + 3, ' ')
+            for cy in (y, y + 1):
+                for cx in (x, x + 1):
+                    DrawMaze.draw_corner(window, maze_struct, cy, cx,
+                                         width, height, color_walls)
 
     @staticmethod
     def draw_entry_exit(window: cs.window, entry: Tuple[int, int],
@@ -189,18 +546,16 @@ class DrawMaze:
 
     @staticmethod
     def draw_maze_menu(window: cs.window, maze_width: int,
-                       maze_height: int) -> None:
+                       maze_height: int,
+                       menu: Iterable[str] = MAZE_MENU) -> None:
         """
-        Draws menu on the right side of maze.
+        Draws menu on the right side of maze
+        (of the visible part of it on a MazeView).
         """
-        menu = [
-            "R. ReGenerate The Maze",
-            "1. Find Path",
-            "2. Show/Hide Path",
-            "3. Player Mode",
-            "4. Change Color of Maze",
-            "X. Exit"
-        ]
+        if isinstance(window, MazeView):
+            maze_width, maze_height = window.columns, window.rows
+            window = window.screen
+        menu = list(menu)
 
         max_y, max_x = window.getmaxyx()
 
@@ -239,31 +594,34 @@ class DrawMaze:
 ┗━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━┛
 """
 
-        max_y, max_x = window.getmaxyx()
         lines = header.split('\n')
         header_width = max(len(line) for line in lines)
-        start_x = (max_x - header_width) // 2
         start_y = 0
-        key = None
+        key = "KEY_RESIZE"
 
-        window.erase()
-        window.nodelay(True)
+        # blocking input: nothing runs until a key comes, and the
+        # screen is only drawn again when the terminal is resized
+        window.nodelay(False)
         while True:
-            DrawMaze.display_menu_with_header(window, perfect)
-            for i, line in enumerate(lines):
-                if line.strip():
-                    window.addstr(start_y + i, start_x, line, cs.A_BOLD)
-            window.refresh()
+            if key == "KEY_RESIZE":
+                max_y, max_x = window.getmaxyx()
+                start_x = (max_x - header_width) // 2
+                window.erase()
+                DrawMaze.display_menu_with_header(window, perfect)
+                for i, line in enumerate(lines):
+                    if line.strip():
+                        window.addstr(start_y + i, start_x, line, cs.A_BOLD)
+                window.refresh()
             try:
                 key = window.getkey()
-                if (
-                    key == '1' or key == '2' or key == 'x'
-                    or key == 'X' or key == '\x1b'
-                ):
-                    window.nodelay(False)
-                    return key
             except Exception:
-                key = None
+                key = ""
+                continue
+            if (
+                key == '1' or key == '2' or key == 'x'
+                or key == 'X' or key == '\x1b'
+            ):
+                return key
 
     @staticmethod
     def draw_congratulations(window: cs.window) -> None:
@@ -285,6 +643,8 @@ class DrawMaze:
  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝ ╚═════╝ ╚═╝  ╚═╝╚═╝  ╚═╝   ╚═╝    \
 ╚═════╝ ╚══════╝╚═╝  ╚═╝   ╚═╝   ╚═╝ ╚═════╝ ╚═╝  ╚═══╝
 """
+        if isinstance(window, MazeView):
+            window = window.screen
         max_y, max_x = window.getmaxyx()
         lines = header.split('\n')
         header_width = max(len(line) for line in lines)
@@ -301,13 +661,19 @@ class DrawMaze:
     @staticmethod
     def player_mode(window: cs.window, entry: Tuple[int, int],
                     exit: Tuple[int, int],
-                    maze_struct: List[List[generate_maze.Cell]], width: int,
-                    height: int) -> bool:
+                    maze_struct: generate_maze.Grid, width: int,
+                    height: int, color_walls: int = 5) -> bool:
 
         """ this method showed player mode so the user
-        can move the player to the exit by arrows """
+        can move the player to the exit by arrows,
+        a MazeView scrolls to follow the player """
 
         x, y = entry
+        if isinstance(window, MazeView) and window.follow(x, y):
+            DrawMaze.draw_the_maze(window, maze_struct, width, height,
+                                   color_walls)
+            DrawMaze.draw_entry_exit(window, entry, exit)
+            window.refresh()
 
         while True:
             key = window.getkey()
@@ -329,6 +695,10 @@ class DrawMaze:
             elif key == "1" or key == "2" or key == "4" or key in ("R", "r"):
                 return False
 
+            if isinstance(window, MazeView) and window.follow(x, y):
+                DrawMaze.draw_the_maze(window, maze_struct, width, height,
+                                       color_walls)
+                DrawMaze.draw_entry_exit(window, entry, exit)
             window.addstr((y * 2) + 1, (x * 3) + 1, "👤", cs.color_pair(2))
             window.refresh()
 
@@ -337,43 +707,79 @@ class DrawMaze:
                 return True
 
     @staticmethod
-    def animate_path(window: cs.window, entry: Tuple[int, int],
-                     path: Any | Literal[''],
-                     delay: float = 0.08) -> None:
+    def world_mode(window: Any, world: "ChunkWorld",
+                   entry: Tuple[int, int], exit: Tuple[int, int],
+                   color_walls: int = 5) -> bool:
+
+        """ player mode on a ChunkWorld: the view follows the player
+        and only the chunks it shows are generated and kept.
+        Returns True when the player reached the exit """
+
+        def redraw() -> None:
+            window.erase()
+            DrawMaze.draw_world(window, world, color_walls)
+            DrawMaze.draw_entry_exit(window, entry, exit)
+            DrawMaze.draw_maze_menu(window, window.columns, window.rows,
+                                    WORLD_MENU)
 
-        """ this method for draw path with animation """
         x, y = entry
+        window.follow(x, y)
+        redraw()
+        window.addstr((y * 2) + 1, (x * 3) + 1, "👤", cs.color_pair(2))
+        window.refresh()
 
-        for move in path:
-            old_x, old_y = x, y  # save old cell
+        while True:
+            key = window.getkey()
+            if key == "x" or key == "X" or key == '\x1b':
+                return False
 
-            # move path
-            if move == "N":
+            window.addstr((y * 2) + 1, (x * 3) + 1, "  ", cs.color_pair(2))
+
+            walls = world.cell(x, y)
+            if key == "KEY_UP" and not walls & 1:
                 y -= 1
-            elif move == "S":
+            elif key == "KEY_DOWN" and not walls & 4:
                 y += 1
-            elif move == "E":
-                x += 1
-            elif move == "W":
+            elif key == "KEY_LEFT" and not walls & 8:
                 x -= 1
+            elif key == "KEY_RIGHT" and not walls & 2:
+                x += 1
 
-            # paint corridor between old and new (THE GAP)
-            if move in ("E", "W"):
-                gx = min(old_x, x) * 3 + 3
-                gy = old_y * 2 + 1
-                window.addstr(gy,     gx, " ", cs.color_pair(3))
-            else:  # N or S
-                gy = min(old_y, y) * 2 + 2
-                gx = old_x * 3 + 1
-                window.addstr(gy, gx, "  ", cs.color_pair(3))
+            if window.follow(x, y):
+                redraw()
+            window.addstr((y * 2) + 1, (x * 3) + 1, "👤", cs.color_pair(2))
+            window.refresh()
 
-            # paint new cell (FULL interior 2x2)
-            sy = y * 2 + 1
-            sx = x * 3 + 1
-            window.addstr(sy,     sx, "  ", cs.color_pair(3))
+            if (x, y) == exit:
+                time.sleep(0.1)
+                return True
 
+    @staticmethod
+    def animate_path(window: cs.window, entry: Tuple[int, int],
+                     path: Any | Literal[''],
+                     delay: float = 0.08) -> None:
+
+        """ this method for draw path with animation,
+        delay seconds per move but PATH_TIME seconds at most
+        (delay 0 draws it at once) """
+        pacer = None
+        if delay:
+            pacer = FramePacer(len(path), PATH_TIME, rate=1 / delay)
+
+        spans = DrawMaze.path_spans(entry, path)
+        # paint corridor between old and new (THE GAP), then new cell
+        for gap, cell in zip(spans[::2], spans[1::2]):
+            for y, x, columns in (gap, cell):
+                window.addstr(y, x, " " * columns, cs.color_pair(3))
+
+            if pacer:
+                pacer.step(window.refresh)
+
+        # only the steps of the last frame are left to show
+        if pacer:
+            pacer.flush(window.refresh)
+        else:
             window.refresh()
-            time.sleep(delay)
 
     @staticmethod
     def set_colors() -> None:
@@ -391,18 +797,44 @@ class DrawMaze:
         cs.init_pair(6, cs.COLOR_RED, cs.COLOR_BLACK)
         cs.init_pair(10, -1, cs.COLOR_BLACK)
 
+    @staticmethod
+    def animated(window: cs.window, step: Callable[[tuple], None],
+                 steps: int) -> Callable[[tuple], None]:
+
+        """ wraps the drawing step of a generation of about steps
+        cells so the screen is updated frame by frame and the whole
+        animation takes GENERATION_TIME seconds at most """
+        pacer = FramePacer(steps, GENERATION_TIME, rate=100)
+
+        def present() -> None:
+            window.noutrefresh()
+            cs.doupdate()
+
+        def paced_step(changed: tuple) -> None:
+            step(changed)
+            pacer.step(present)
+
+        return paced_step
+
     @staticmethod
     def first_generate_maze(window: cs.window, maze: generate_maze.Maze,
                             maze_entry: Tuple[int, int], maze_width: int,
                             maze_height: int, color_walls: int,
                             perfect: bool,
                             maze_exit: Tuple[int, int],
-                            step: Callable[[], None]) -> None:
+                            step: Callable[[tuple], None],
+                            algorithm: str = "backtracker") -> None:
 
         """ this method for generate method for the first time"""
 
         window.erase()
-        maze.maze_generator(maze_entry, step, perfect)
+        DrawMaze.draw_the_maze(window, maze.maze_struct,
+                               maze_width, maze_height, color_walls)
+        DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
+        maze.maze_generator(maze_entry,
+                            DrawMaze.animated(window, step,
+                                              maze_width * maze_height),
+                            perfect, algorithm)
         DrawMaze.draw_the_maze(window, maze.maze_struct,
                                maze_width, maze_height, color_walls)
         DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
@@ -411,6 +843,23 @@ class DrawMaze:
 
         cs.flushinp()
 
+    @staticmethod
+    def draw_ready_maze(window: cs.window, maze: generate_maze.Maze,
+                        maze_entry: Tuple[int, int], maze_width: int,
+                        maze_height: int, color_walls: int,
+                        maze_exit: Tuple[int, int]) -> None:
+
+        """ this method for show a maze already generated
+        (pre-generated or cached) at once, without animation """
+
+        window.erase()
+        DrawMaze.draw_the_maze(window, maze.maze_struct,
+                               maze_width, maze_height, color_walls)
+        DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
+        DrawMaze.draw_maze_menu(window, maze_width, maze_height)
+        window.refresh()
+        cs.flushinp()
+
     @staticmethod
     def handle_maze_menu(window: cs.window, maze: generate_maze.Maze,
                          maze_width: int, maze_height: int,
@@ -418,8 +867,11 @@ class DrawMaze:
                          maze_exit: Tuple[int, int],
                          color_walls: int, perfect: bool,
                          maze_box: Dict[str, generate_maze.Maze],
-                         step: Callable[[], None],
-                         seed: int, seed_exist: bool
+                         step: Callable[[tuple], None],
+                         seed: int, seed_exist: bool,
+                         algorithm: str = "backtracker",
+                         pool: Optional[MazePool] = None,
+                         cache: Optional[MazeCache] = None
                          ) -> Tuple[str, generate_maze.Maze]:
 
         """ this method to handle and show the correct
@@ -427,12 +879,27 @@ class DrawMaze:
 
         visible_path = False
         path = None
+        # the spans of the path, the overlay on top of the walls
+        path_layer: List[Tuple[int, int, int]] = []
         key = None
         result = "exit"
 
         while True:
             key = window.getkey()
-            if key in ('R', 'r'):
+            if key in ('R', 'r') and pool is not None:
+                # a maze the pool already generated and solved: key 1
+                # reuses its solution
+                maze = pool.get()
+                maze_box["maze"] = maze
+                visible_path = False
+                path = None
+                path_layer = []
+                color_walls = 5
+
+                DrawMaze.draw_ready_maze(window, maze, maze_entry,
+                                         maze_width, maze_height,
+                                         color_walls, maze_exit)
+            elif key in ('R', 'r'):
                 if seed_exist is False:
                     seed = random.randint(1, 100)
                 n_maze = generate_maze.Maze(maze_width, maze_height, seed)
@@ -441,24 +908,39 @@ class DrawMaze:
                 maze = n_maze
                 visible_path = False
                 path = None
+                path_layer = []
                 color_walls = 5
 
-                window.erase()
                 maze_box["maze"].pattern_42()
-                maze_box["maze"].maze_generator(maze_entry, step, perfect)
-
-                window.erase()
-                DrawMaze.draw_the_maze(window, maze_box["maze"].maze_struct,
-                                       maze_width, maze_height,
-                                       color_walls)
-                DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
-                DrawMaze.draw_maze_menu(window, maze_width, maze_height)
-                window.refresh()
-                cs.flushinp()
+                maze_key = cache_key(maze_width, maze_height, seed, perfect,
+                                     maze_entry, maze_exit, algorithm)
+                # a maze generated before is shown at once; key 1 reuses
+                # the solution the cache loaded
+                if cache is None or not cache.get(maze_key, maze,
+                                                  maze_entry, maze_exit):
+                    window.erase()
+                    DrawMaze.draw_the_maze(window, maze.maze_struct,
+                                           maze_width, maze_height,
+                                           color_walls)
+                    DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
+                    maze.maze_generator(
+                        maze_entry,
+                        DrawMaze.animated(window, step,
+                                          maze_width * maze_height),
+                        perfect, algorithm)
+                    if cache is not None:
+                        cache.put(maze_key, maze, maze_entry, maze_exit,
+                                  seed)
+
+                DrawMaze.draw_ready_maze(window, maze, maze_entry,
+                                         maze_width, maze_height,
+                                         color_walls, maze_exit)
 
             if key == '1':
                 if path is None:
-                    path = maze.maze_solver(maze_entry, maze_exit)
+                    path = maze.solution(maze_entry, maze_exit)
+                    path_layer = DrawMaze.merge_spans(
+                        DrawMaze.path_spans(maze_entry, path))
                 DrawMaze.animate_path(window, maze_entry, path)
                 cs.flushinp()
                 visible_path = True
@@ -466,32 +948,25 @@ class DrawMaze:
                 if path is None:
                     continue
                 if visible_path is False:
-                    DrawMaze.animate_path(window, maze_entry, path, 0)
+                    DrawMaze.show_path(window, path_layer)
                     cs.flushinp()
                     DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
+                    window.refresh()
                     visible_path = True
                 else:
-                    window.erase()
-                    DrawMaze.draw_the_maze(window, maze.maze_struct,
-                                           maze_width, maze_height,
-                                           color_walls)
+                    DrawMaze.hide_path(window, path_layer, color_walls)
                     DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
-                    DrawMaze.draw_maze_menu(window, maze_width, maze_height)
                     window.refresh()
                     visible_path = False
             elif key == '3':
                 if visible_path:
-                    window.erase()
-                    DrawMaze.draw_the_maze(window, maze.maze_struct,
-                                           maze_width, maze_height,
-                                           color_walls)
+                    DrawMaze.hide_path(window, path_layer, color_walls)
                     DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
-                    DrawMaze.draw_maze_menu(window, maze_width, maze_height)
                     window.refresh()
                     visible_path = False
                 rs = DrawMaze.player_mode(window, maze_entry, maze_exit,
                                           maze.maze_struct, maze_width,
-                                          maze_height)
+                                          maze_height, color_walls)
                 if rs:
                     DrawMaze.draw_congratulations(window)
                     time.sleep(3)
@@ -513,18 +988,22 @@ class DrawMaze:
                     color_walls = 6
                 elif color_walls == 6:
                     color_walls = 4
-                window.erase()
-                DrawMaze.draw_the_maze(window, maze_box["maze"].maze_struct,
-                                       maze_width, maze_height,
-                                       color_walls)
+                # only the colour of the walls changes, not their text
+                DrawMaze.recolor_walls(window, maze_box["maze"].maze_struct,
+                                       maze_width, maze_height, color_walls,
+                                       path_layer if visible_path else [])
                 DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
-                DrawMaze.draw_maze_menu(window, maze_width, maze_height)
-                if path is not None:
-                    if visible_path is True:
-                        DrawMaze.animate_path(window, maze_entry, path, 0)
-                        DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
                 window.refresh()
                 cs.flushinp()
+            elif key in SCROLL_KEYS and isinstance(window, MazeView):
+                if window.scroll(key):
+                    DrawMaze.draw_the_maze(window, maze.maze_struct,
+                                           maze_width, maze_height,
+                                           color_walls)
+                    if visible_path:
+                        DrawMaze.show_path(window, path_layer)
+                    DrawMaze.draw_entry_exit(window, maze_entry, maze_exit)
+                    window.refresh()
             elif key == "x" or key == "X" or key == '\x1b':
                 result = "done"
                 break
@@ -545,11 +1024,13 @@ class DrawMaze:
                     f.write(line)
 
 
-def display_maze(maze: generate_maze.Maze, config: Dict["str", Any]) -> str:
+def display_maze(maze: generate_maze.Maze, config: Dict["str", Any],
+                 cache: Optional[MazeCache] = None) -> str:
     """
     Main function to display the complete maze on terminal.
     Uses curses library to draw header and the maze with walls and markers.
     Waits for key press before closing.
+    A maze found in cache is shown at once instead of generated.
     """
 
     result = "exit"
@@ -568,25 +1049,26 @@ def display_maze(maze: generate_maze.Maze, config: Dict["str", Any]) -> str:
         window.erase()
 
         maze_box = {"maze": maze}
+        # the screen, or a MazeView on it when the maze does not fit
+        maze_window: Any = window
 
-        def step() -> None:
-            window.erase()
-            DrawMaze.draw_the_maze(
-                window,
+        def step(changed: tuple) -> None:
+            DrawMaze.draw_cells(
+                maze_window,
                 maze_box["maze"].maze_struct,
+                changed,
                 config["WIDTH"],
                 config["HEIGHT"],
             )
-            DrawMaze.draw_entry_exit(window, config["ENTRY"], config["EXIT"])
-            window.noutrefresh()
-            cs.doupdate()
-            time.sleep(0.01)
+            DrawMaze.draw_entry_exit(maze_window, config["ENTRY"],
+                                     config["EXIT"])
 
         maze_width = config['WIDTH']
         maze_height = config['HEIGHT']
         maze_entry = config['ENTRY']
         maze_exit = config['EXIT']
         perfect = config['PERFECT']
+        algorithm = config.get("ALGORITHM", "backtracker")
         color_walls = 5  # this number for white to draw walls
 
         key = DrawMaze.draw_a_maze_ing_header(window, perfect)
@@ -600,15 +1082,36 @@ def display_maze(maze: generate_maze.Maze, config: Dict["str", Any]) -> str:
                 key = DrawMaze.draw_a_maze_ing_header(window, perfect)
                 window.erase()
         if key == "1" or key in ('\n', 'KEY_ENTER'):
-            DrawMaze.first_generate_maze(window, maze, maze_entry, maze_width,
-                                         maze_height, color_walls, perfect,
-                                         maze_exit, step)
-            result, maze = DrawMaze.handle_maze_menu(window, maze, maze_width,
-                                                     maze_height, maze_entry,
-                                                     maze_exit, color_walls,
-                                                     perfect, maze_box, step,
-                                                     config["SEED"],
-                                                     config["SEED_EXIST"])
+            if needs_view(window, maze_width, maze_height):
+                maze_window = MazeView(window, maze_width, maze_height)
+            pool = None
+            if config.get("PREGENERATE", 0) > 0:
+                pool = MazePool(config, perfect, config["PREGENERATE"],
+                                cache)
+            try:
+                maze_key = config_key(config, config["SEED"], perfect)
+                if cache is not None and cache.get(maze_key, maze,
+                                                   maze_entry, maze_exit):
+                    DrawMaze.draw_ready_maze(maze_window, maze, maze_entry,
+                                             maze_width, maze_height,
+                                             color_walls, maze_exit)
+                else:
+                    DrawMaze.first_generate_maze(maze_window, maze,
+                                                 maze_entry, maze_width,
+                                                 maze_height, color_walls,
+                                                 perfect, maze_exit, step,
+                                                 algorithm)
+                    if cache is not None:
+                        cache.put(maze_key, maze, maze_entry, maze_exit,
+                                  config["SEED"])
+                result, maze = DrawMaze.handle_maze_menu(
+                    maze_window, maze, maze_width, maze_height, maze_entry,
+                    maze_exit, color_walls, perfect, maze_box, step,
+                    config["SEED"], config["SEED_EXIST"], algorithm, pool,
+                    cache)
+            finally:
+                if pool is not None:
+                    pool.close()
 
     try:
         cs.wrapper(draw)
@@ -616,3 +1119,37 @@ def display_maze(maze: generate_maze.Maze, config: Dict["str", Any]) -> str:
     except Exception as e:
         print("Error While Drawing Maze:", e)
         return "exit"
+
+
+def display_world(world: "ChunkWorld", entry: Tuple[int, int],
+                  exit: Tuple[int, int]) -> bool:
+    """
+    Plays player mode on a ChunkWorld in the terminal, through a
+    MazeView whatever its size, until the player reaches the exit
+    (True) or leaves with X or Esc (False).
+    """
+
+    result = False
+
+    def draw(window: cs.window) -> None:
+        nonlocal result
+
+        cs.curs_set(0)
+        cs.noecho()
+        window.keypad(True)
+
+        DrawMaze.set_colors()
+        window.bkgd(' ', cs.color_pair(10))
+        window.erase()
+
+        view: Any = MazeView(window, world.width, world.height)
+        result = DrawMaze.world_mode(view, world, entry, exit)
+        if result:
+            DrawMaze.draw_congratulations(view)
+            time.sleep(3)
+
+    try:
+        cs.wrapper(draw)
+    except Exception as e:
+        print("Error While Drawing Maze:", e)
+    return result
@@ -1,28 +1,59 @@
 import random
-from collections import deque
-from typing import Optional, Callable
+from array import array
+from itertools import permutations
+from typing import (
+    Any, Optional, Callable, Iterable, Iterator, MutableSequence, Protocol
+)
+from .grid import Cell, Grid, PATTERN, VISITED
+from .solve import SOLVERS, DistanceField, TreeIndex
+from .algorithms import kruskal, wilson, prim, growing_tree
 
 bin_value = {'n': 1, 'e': 2, 's': 4, 'w': 8}
 directions = ['s', 'w', 'n', 'e']
 y_axis = {'s': 1, 'w': 0, 'n': -1, 'e': 0}
 x_axis = {'s': 0, 'w': -1, 'n': 0, 'e': 1}
 rev_directions = {'s': 'n', 'w': 'e', 'n': 's', 'e': 'w'}
+# the 24 orders the backtracker can try the 4 directions in
+ORDERS = list(permutations(range(4)))
+ORDER_ID = {order: i for i, order in enumerate(ORDERS)}
 
+__all__ = [
+    "Cell", "Grid", "Maze", "RandomSource", "GENERATORS", "eller_rows",
+    "vectorized_maze", "vectorized_batch",
+    "DistanceField", "TreeIndex"
+]
 
-class Cell:
+
+# the cells of the 42 pattern, as (x, y) from the middle of the maze
+PATTERN_42 = (
+    (1, 0), (2, 0), (3, 0), (-1, 0), (-2, 0), (-3, 0),
+    (1, 1), (1, 2), (2, 2), (3, 2), (3, -1), (1, -2), (2, -2), (3, -2),
+    (-3, -1), (-3, -2), (-1, 1), (-1, 2),
+)
+
+
+def pattern_cells(width: int, height: int) -> set:
     """
-    Represents a single cell in the maze.
-    Each cell has walls and a visited status.
+    The (x, y) cells the 42 pattern closes in a width x height maze,
+    none when the maze is smaller than 15x15.
     """
+    if width < 15 or height < 15:
+        return set()
+    s_x, s_y = int(width / 2), int(height / 2)
+    return {(s_x + x, s_y + y) for x, y in PATTERN_42}
 
-    def __init__(self) -> None:
-        """
-        Creates a new cell.
-        Sets all 4 walls and marks cell as not visited.
-        """
-        self.wall = 15
-        self.visited = False
-        self.pattern = False
+
+class RandomSource(Protocol):
+    """
+    What the generator needs from a random number generator.
+    random.Random fits, so does any object with these two methods.
+    """
+
+    def shuffle(self, x: MutableSequence[Any]) -> None:
+        ...
+
+    def random(self) -> float:
+        ...
 
 
 class Maze:
@@ -31,136 +62,300 @@ class Maze:
     Contains cells and methods to generate the maze.
     """
 
-    def __init__(self, width: int, height: int, seed: int) -> None:
+    def __init__(self, width: int, height: int, seed: Any,
+                 rng: Optional[RandomSource] = None) -> None:
 
         """
         Creates a new maze with given size.
-        Fills the maze with cell objects.
+        The cells are packed one byte each in a Grid, maze_struct[y][x]
+        still gives a Cell and cells is the raw bytearray behind it.
+        Each maze has its own random generator (random.Random(seed)
+        unless rng is given), so mazes can be generated at the same
+        time in threads and a seed always gives the same maze.
         """
         self.width = width
         self.height = height
-        self.maze_struct = [
-            [Cell() for w in range(width)] for h in range(height)
-        ]
+        self.maze_struct = Grid(width, height)
+        self.cells = self.maze_struct.cells
 
-        random.seed(seed)
+        self.rng = rng if rng is not None else random.Random(seed)
+        # last solved (entry, exit, path), reused when saving
+        self.solved: Optional[tuple[tuple, tuple, str]] = None
 
     def pattern_42(self) -> None:
-        if self.width >= 15 and self.height >= 15:
-            s_x, s_y = int(self.width / 2), int(self.height / 2)
-
-            self.maze_struct[s_y][s_x + 1].pattern = True
-            self.maze_struct[s_y][s_x + 2].pattern = True
-            self.maze_struct[s_y][s_x + 3].pattern = True
-            self.maze_struct[s_y][s_x - 1].pattern = True
-            self.maze_struct[s_y][s_x - 2].pattern = True
-            self.maze_struct[s_y][s_x - 3].pattern = True
-            self.maze_struct[s_y + 1][s_x + 1].pattern = True
-            self.maze_struct[s_y + 2][s_x + 1].pattern = True
-            self.maze_struct[s_y + 2][s_x + 2].pattern = True
-            self.maze_struct[s_y + 2][s_x + 3].pattern = True
-            self.maze_struct[s_y + -1][s_x + 3].pattern = True
-            self.maze_struct[s_y - 2][s_x + 1].pattern = True
-            self.maze_struct[s_y - 2][s_x + 2].pattern = True
-            self.maze_struct[s_y - 2][s_x + 3].pattern = True
-            self.maze_struct[s_y - 1][s_x - 3].pattern = True
-            self.maze_struct[s_y - 2][s_x - 3].pattern = True
-            self.maze_struct[s_y + 1][s_x - 1].pattern = True
-            self.maze_struct[s_y + 2][s_x - 1].pattern = True
+        for x, y in pattern_cells(self.width, self.height):
+            self.maze_struct[y][x].pattern = True
 
     def maze_generator(
             self,
             entry: tuple,
-            step: Optional[Callable] = None,
-            perfect: bool = True) -> None:
+            step: Optional[Callable[[tuple], None]] = None,
+            perfect: bool = True,
+            algorithm: str = "backtracker") -> None:
+        """
+        Generates the maze from the entry point with one of the
+        algorithms of GENERATORS (recursive backtracking by default).
+        All of them keep the 42 pattern cells closed, and after each
+        carve step gets the ((x, y), (x, y)) pair of cells that changed,
+        so a display only has to repaint those two.
+        """
+        try:
+            generator = GENERATORS[algorithm]
+        except KeyError:
+            raise ValueError(f"unknown maze algorithm: {algorithm}")
+        self.solved = None
+        generator(self.cells, self.width, self.height, self.rng,
+                  entry, step, perfect)
+
+    def maze_solver(self, entry: tuple, exit: tuple,
+                    algorithm: str = "bfs") -> str:
+        """
+        Returns the shortest path from entry to exit as N/S/E/W letters.
+        algorithm is one of solve.SOLVERS: "bfs" (default), "astar" or
+        "bidirectional"; the last two look at fewer cells on mazes
+        with loops (PERFECT=False).
+        """
+        try:
+            solver = SOLVERS[algorithm]
+        except KeyError:
+            raise ValueError(f"unknown solver algorithm: {algorithm}")
+        path = solver(self.cells, self.width, self.height, entry, exit)
+        self.solved = (entry, exit, path)
+        return path
+
+    def solution(self, entry: tuple, exit: tuple) -> str:
+        """
+        Returns the shortest path, reusing the last one maze_solver
+        found for the same entry and exit instead of solving again.
+        """
+        if self.solved is not None and self.solved[:2] == (entry, exit):
+            return self.solved[2]
+        return self.maze_solver(entry, exit)
+
+    def distance_field(self, source: tuple) -> DistanceField:
+        """
+        Solves the maze once from source; the returned field answers
+        the path and distance between source and any cell.
+        """
+        return DistanceField(self.cells, self.width, self.height, source)
+
+    def tree_index(self, root: tuple = (0, 0)) -> TreeIndex:
         """
-        Generates the maze using recursive backtracking.
-        Starts from entry point and carves paths randomly.
+        Indexes a perfect maze so the path and distance between any
+        two cells are found without searching (see solve.TreeIndex).
         """
-        x, y = entry
-        curent = self.maze_struct[y][x]
-        curent.visited = True
-
-        dirs = directions.copy()
-        random.shuffle(dirs)
-
-        for direction in dirs:
-            next_x = x + x_axis[direction]
-            next_y = y + y_axis[direction]
-
-            if (
-                next_x < 0 or next_x >= self.width or
-                next_y < 0 or next_y >= self.height or
-                self.maze_struct[next_y][next_x].pattern
-            ):
+        return TreeIndex(self.cells, self.width, self.height, root)
+
+
+def backtracker(cells: bytearray, width: int, height: int,
+                rng: RandomSource, entry: tuple,
+                step: Optional[Callable[[tuple], None]] = None,
+                perfect: bool = True) -> None:
+    """
+    Generates the maze using backtracking with an explicit stack.
+    Starts from entry point and carves paths randomly.
+    Visits cells and draws random numbers in the same order as the
+    old recursive version, so a seed always gives the same maze,
+    but never touches the Python recursion limit.
+    The stack holds flat cell indexes, and one byte per cell holds
+    its order of directions and the next one to try, so a deep stack
+    costs a few bytes per cell.
+    """
+    shuffle, rand = rng.shuffle, rng.random
+    loop_chance = 0.10
+    size = width * height
+    # move of state order id * 4 + next: (index step, x step, wall
+    # bit, neighbour wall bit)
+    moves = [
+        (y_axis[d] * width + x_axis[d], x_axis[d], bin_value[d],
+         bin_value[rev_directions[d]])
+        for order in ORDERS
+        for d in (directions[k] for k in order)
+    ]
+    state = bytearray(size)
+    order = [0, 1, 2, 3]
+
+    here = entry[1] * width + entry[0]
+    cells[here] |= VISITED
+    # shuffled like a list of the 4 directions, so the same moves
+    shuffle(order)
+    state[here] = ORDER_ID[tuple(order)] * 4
+    stack = array('i', [here])
+
+    while stack:
+        here = stack[-1]
+        next_move = state[here]
+        if next_move & 3 == 3:
+            # last direction: nothing is left to do here afterwards
+            stack.pop()
+        else:
+            state[here] = next_move + 1
+        delta, dx, bit, rev_bit = moves[next_move]
+
+        there = here + delta
+        if dx:
+            next_x = here % width + dx
+            if next_x < 0 or next_x >= width:
                 continue
+        elif there < 0 or there >= size:
+            continue
+        neighbor = cells[there]
+        if neighbor & PATTERN:
+            continue
 
-            if perfect:
-                if self.maze_struct[next_y][next_x].visited is False:
-                    neighbor = self.maze_struct[next_y][next_x]
-
-                    curent.wall = curent.wall ^ bin_value[direction]
-                    neighbor.wall = neighbor.wall ^ bin_value[
-                        rev_directions[direction]
-                    ]
-                    if step:
-                        step()
-                    self.maze_generator((next_x, next_y), step, perfect)
-            elif perfect is False:
-                neighbor = self.maze_struct[next_y][next_x]
-
-                if neighbor.visited is False:
-                    curent.wall ^= bin_value[direction]
-                    neighbor.wall ^= bin_value[rev_directions[direction]]
-                    if step:
-                        step()
-                    self.maze_generator((next_x, next_y), step, perfect)
-
-                else:
-                    loop_chance = 0.10
-                    if (
-                        curent.wall & bin_value[direction]
-                    ) and (random.random() < loop_chance):
-                        curent.wall ^= bin_value[direction]
-                        neighbor.wall ^= bin_value[rev_directions[direction]]
-                        if step:
-                            step()
-
-    def maze_solver(self, entry: tuple, exit: tuple) -> str:
-        frontier = deque([entry])
-        came_from: dict[
-            tuple[int, int],
-            Optional[tuple[tuple[int, int], str]]
-        ] = {entry: None}
-        while frontier:
-            x, y = frontier.popleft()
-
-            if (x, y) == exit:
-                break
-
-            cell = self.maze_struct[y][x]
-
-            for d, dx, dy, move in [
-                ('n', 0, -1, 'N'),
-                ('s', 0, 1, 'S'),
-                ('e', 1, 0, 'E'),
-                ('w', -1, 0, 'W')
-            ]:
-                if not (cell.wall & bin_value[d]):
-                    nx, ny = x + dx, y + dy
-                    if (nx, ny) not in came_from:
-                        frontier.append((nx, ny))
-                        came_from[(nx, ny)] = ((x, y), move)
-
-        path = ""
-        curent = exit
-
-        while True:
-            value = came_from[curent]
-            if value is None:
-                break
-
-            curent, move = value
-            path = move + path
+        if not neighbor & VISITED:
+            cells[here] ^= bit
+            cells[there] = (neighbor ^ rev_bit) | VISITED
+            if step:
+                step((divmod(here, width)[::-1], divmod(there, width)[::-1]))
 
-        return path
+            order[:] = (0, 1, 2, 3)
+            shuffle(order)
+            state[there] = ORDER_ID[tuple(order)] * 4
+            stack.append(there)
+
+        elif perfect is False:
+            if cells[here] & bit and rand() < loop_chance:
+                cells[here] ^= bit
+                cells[there] ^= rev_bit
+                if step:
+                    step((divmod(here, width)[::-1],
+                          divmod(there, width)[::-1]))
+
+
+# maze generation algorithms, chosen with the ALGORITHM config key
+GENERATORS: dict[str, Callable[..., None]] = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+    "prim": prim,
+    "growing_tree": growing_tree,
+}
+
+
+def eller_rows(width: int, height: int, seed: Any,
+               perfect: bool = True,
+               rng: Optional[random.Random] = None) -> Iterator[bytearray]:
+    """
+    Generates a maze row by row with Eller's algorithm and yields
+    each finished row of walls (one nibble per cell) as soon as it
+    is done. Only the set of every cell of the current row is kept,
+    so memory stays O(width) whatever the height.
+    The 42 pattern is not drawn in this mode.
+    """
+    if rng is None:
+        rng = random.Random(seed)
+    rand = rng.random
+    loop_chance = 0.10
+
+    # set label of each cell of the current row, labels < width
+    sets = list(range(width))
+    # walls opened to the north, from the south walls of the row above
+    north = bytearray(width)
+
+    for y in range(height):
+        last = y == height - 1
+        row = bytearray(b'\x0f') * width
+        for x in range(width):
+            if north[x]:
+                row[x] ^= bin_value['n']
+
+        parent = list(range(width))
+
+        def find(label: int) -> int:
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        # join neighbours of different sets at random (all on the last
+        # row, so everything ends up connected)
+        for x in range(width - 1):
+            left, right = find(sets[x]), find(sets[x + 1])
+            if left != right:
+                if not last and rand() >= 0.5:
+                    continue
+                parent[right] = left
+            elif perfect or rand() >= loop_chance:
+                continue
+            row[x] ^= bin_value['e']
+            row[x + 1] ^= bin_value['w']
+
+        for x in range(width):
+            sets[x] = find(sets[x])
+
+        if last:
+            yield row
+            break
+
+        # every set goes down at least once, other cells go down at random
+        columns: dict[int, list[int]] = {}
+        for x in range(width):
+            columns.setdefault(sets[x], []).append(x)
+        for label, xs in columns.items():
+            down = [x for x in xs if rand() < 0.5]
+            if not down:
+                down = [xs[int(rand() * len(xs))]]
+            for x in down:
+                row[x] ^= bin_value['s']
+
+        yield row
+
+        # next row: cells below an opening keep their set, the other
+        # ones get new sets; labels are packed back into 0..width
+        relabel: dict[int, int] = {}
+        for x in range(width):
+            north[x] = not row[x] & bin_value['s']
+            if north[x]:
+                sets[x] = relabel.setdefault(sets[x], len(relabel))
+        fresh = len(relabel)
+        for x in range(width):
+            if not north[x]:
+                sets[x] = fresh
+                fresh += 1
+
+
+def _vectorized() -> Any:
+    """ the NumPy backend module, imported on first use """
+    try:
+        from . import vectorized
+    except ImportError as error:
+        raise ImportError(
+            "the NumPy backend needs numpy (pip install numpy)"
+        ) from error
+    return vectorized
+
+
+def vectorized_maze(width: int, height: int, seed: Any,
+                    algorithm: str = "binary_tree") -> Any:
+    """
+    Generates a whole maze with NumPy ("binary_tree" or "sidewinder")
+    and returns it as a (height, width) uint8 array of walls.
+    Meant for very large grids (10000x10000 in about a second);
+    vectorized.to_maze and vectorized.write_walls turn the array into a
+    Maze or a hex file. The 42 pattern is not drawn in this mode.
+    numpy is only imported here, the package does not need it.
+    """
+    vectorized = _vectorized()
+    try:
+        generator = vectorized.GENERATORS[algorithm]
+    except KeyError:
+        raise ValueError(f"unknown vectorized algorithm: {algorithm}")
+    return generator(width, height, seed)
+
+
+def vectorized_batch(width: int, height: int, seeds: Iterable[Any],
+                     algorithm: str = "binary_tree",
+                     entry: tuple = (0, 0),
+                     exit: Optional[tuple] = None) -> tuple[Any, Any]:
+    """
+    Generates many small mazes at once for datasets.
+    Returns a (len(seeds), height, width) uint8 wall array, where
+    maze i is the same as vectorized_maze(width, height, seeds[i]),
+    and an int32 array of the shortest path length from entry to exit
+    (default: bottom right) of each maze. Both the generation and the
+    search run in lock-step over all the mazes.
+    """
+    vectorized = _vectorized()
+    walls = vectorized.batch_mazes(width, height, seeds, algorithm)
+    return walls, vectorized.solution_lengths(walls, entry, exit)
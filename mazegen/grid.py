@@ -0,0 +1,120 @@
+from collections.abc import Sequence
+from typing import Iterator, Optional
+
+# one byte per cell: the low nibble holds the walls (n=1, e=2, s=4, w=8)
+WALLS = 0x0F
+VISITED = 0x10
+PATTERN = 0x20
+
+
+class Cell:
+    """
+    Represents a single cell in the maze.
+    A cell is only a view on one byte of a grid, so it costs nothing
+    to keep the whole maze in memory. A Cell() made on its own gets
+    its own byte, with all 4 walls set and not visited.
+    """
+
+    __slots__ = ("cells", "index")
+
+    def __init__(self, cells: Optional[bytearray] = None,
+                 index: int = 0) -> None:
+        """
+        Creates a view on cells[index].
+        Without a grid, creates a new closed and not visited cell.
+        """
+        if cells is None:
+            cells = bytearray([WALLS])
+        self.cells = cells
+        self.index = index
+
+    @property
+    def wall(self) -> int:
+        return self.cells[self.index] & WALLS
+
+    @wall.setter
+    def wall(self, value: int) -> None:
+        byte = self.cells[self.index]
+        self.cells[self.index] = (byte & ~WALLS) | (value & WALLS)
+
+    @property
+    def visited(self) -> bool:
+        return bool(self.cells[self.index] & VISITED)
+
+    @visited.setter
+    def visited(self, value: bool) -> None:
+        if value:
+            self.cells[self.index] |= VISITED
+        else:
+            self.cells[self.index] &= ~VISITED
+
+    @property
+    def pattern(self) -> bool:
+        return bool(self.cells[self.index] & PATTERN)
+
+    @pattern.setter
+    def pattern(self, value: bool) -> None:
+        if value:
+            self.cells[self.index] |= PATTERN
+        else:
+            self.cells[self.index] &= ~PATTERN
+
+
+class GridRow(Sequence[Cell]):
+    """
+    One row of a Grid, gives Cell views like a list of cells.
+    """
+
+    __slots__ = ("cells", "start", "width")
+
+    def __init__(self, cells: bytearray, start: int, width: int) -> None:
+        self.cells = cells
+        self.start = start
+        self.width = width
+
+    def __len__(self) -> int:
+        return self.width
+
+    def __getitem__(self, x: int) -> Cell:  # type: ignore[override]
+        if x < 0:
+            x += self.width
+        if x < 0 or x >= self.width:
+            raise IndexError("cell index out of range")
+        return Cell(self.cells, self.start + x)
+
+    def __iter__(self) -> Iterator[Cell]:
+        for index in range(self.start, self.start + self.width):
+            yield Cell(self.cells, index)
+
+
+class Grid(Sequence[GridRow]):
+    """
+    The maze cells packed in a flat bytearray, one byte per cell,
+    row after row. grid[y][x] still gives a Cell with wall, visited
+    and pattern, so code written for a list of lists keeps working,
+    while hot loops can read grid.cells[y * width + x] directly.
+    """
+
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int) -> None:
+        """
+        Creates a grid with every cell closed and not visited.
+        """
+        self.width = width
+        self.height = height
+        self.cells = bytearray([WALLS]) * (width * height)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, y: int) -> GridRow:  # type: ignore[override]
+        if y < 0:
+            y += self.height
+        if y < 0 or y >= self.height:
+            raise IndexError("row index out of range")
+        return GridRow(self.cells, y * self.width, self.width)
+
+    def __iter__(self) -> Iterator[GridRow]:
+        for y in range(self.height):
+            yield GridRow(self.cells, y * self.width, self.width)
@@ -0,0 +1,86 @@
+import os
+import tempfile
+from typing import Iterable, Optional, Union
+from mazegen import generate_maze
+
+# maps a cell byte to the upper case hex digit of its walls (low nibble)
+HEX_DIGITS = bytes(b"0123456789ABCDEF"[byte & 15] for byte in range(256))
+
+
+def maze_text(cells: Union[bytes, bytearray], width: int,
+              height: int) -> bytes:
+    """
+    Returns the hex rows of a maze, each followed by a new line.
+    The whole grid is translated to hex digits in one call and then
+    cut into rows, there is no loop over the cells in Python.
+    """
+    text = bytes(cells).translate(HEX_DIGITS)
+    rows = [text[start:start + width]
+            for start in range(0, width * height, width)]
+    rows.append(b"")
+    return b"\n".join(rows)
+
+
+def footer_text(entry: tuple, exit: tuple, path: str) -> bytes:
+    """ the empty line, entry, exit and path that end a maze file """
+    return "\n{}\n{}\n{}".format(str(entry).strip("()"),
+                                 str(exit).strip("()"), path).encode()
+
+
+def write_file(file_name: str, data: bytes, atomic: bool = False) -> None:
+    """
+    Writes data to a file in one call.
+    With atomic, data goes to a temporary file in the same folder that
+    then replaces file_name, so readers never see a half written maze.
+    """
+    if not atomic:
+        with open(file_name, "wb") as maze_file:
+            maze_file.write(data)
+        return
+
+    folder = os.path.dirname(os.path.abspath(file_name))
+    fd, temp_name = tempfile.mkstemp(dir=folder, prefix=".maze-")
+    try:
+        with os.fdopen(fd, "wb") as maze_file:
+            maze_file.write(data)
+        # mkstemp makes the file private, give it the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(temp_name, 0o666 & ~umask)
+        os.replace(temp_name, file_name)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def write_maze(file_name: str, maze: generate_maze.Maze, entry: tuple,
+               exit: tuple, path: Optional[str] = None,
+               atomic: bool = False) -> None:
+    """
+    Writes the maze to a file in the hex output format:
+    one hex digit of walls per cell, an empty line,
+    then the entry, the exit and the shortest path.
+    When the path is not given, the one the maze already solved
+    is reused; it is only solved here if there is none.
+    """
+    if path is None:
+        path = maze.solution(entry, exit)
+
+    data = (maze_text(maze.cells, maze.width, maze.height) +
+            footer_text(entry, exit, path))
+    write_file(file_name, data, atomic)
+
+
+def write_rows(file_name: str, rows: Iterable[Union[bytes, bytearray]],
+               entry: tuple, exit: tuple, path: str = "") -> None:
+    """
+    Writes a maze given row by row (like eller_rows yields it) in the
+    hex output format. Each row is written as soon as it comes, so the
+    whole maze never has to be in memory. A streamed maze is not
+    solved, so the path line is empty unless one is given.
+    """
+    with open(file_name, "wb", buffering=1 << 20) as maze_file:
+        for row in rows:
+            maze_file.write(bytes(row).translate(HEX_DIGITS))
+            maze_file.write(b"\n")
+        maze_file.write(footer_text(entry, exit, path))
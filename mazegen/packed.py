@@ -0,0 +1,244 @@
+import mmap
+import struct
+from typing import Any, List, Optional, Tuple, Union
+
+from mazegen import generate_maze
+from mazegen.output import HEX_DIGITS
+
+# magic, width, height, entry x, entry y, exit x, exit y,
+# path length, seed kind, seed length
+HEADER = struct.Struct("<4sIIIIIIQBH")
+MAGIC = b"AMZ1"
+
+SEED_NONE, SEED_INT, SEED_STR = 0, 1, 2
+
+# a path is packed 4 moves per byte, 2 bits per move
+PATH_CODES = bytes.maketrans(b"NESW", bytes(range(4)))
+PATH_CHUNKS = tuple(
+    ''.join("NESW"[b >> shift & 3] for shift in (0, 2, 4, 6))
+    for b in range(256)
+)
+# the ascii hex digits of a cell, and the nibble each one maps back to
+HEX_CHARACTERS = b"0123456789ABCDEFabcdef"
+HEX_NIBBLES = bytes.maketrans(HEX_CHARACTERS,
+                              bytes(range(16)) + bytes(range(10, 16)))
+
+
+def pack_cells(cells: Union[bytes, bytearray]) -> bytes:
+    """
+    Packs one wall nibble per cell into two cells per byte,
+    the first cell in the high nibble, like the hex text reads.
+    """
+    text = bytes(cells).translate(HEX_DIGITS)
+    if len(text) % 2:
+        text += b"0"
+    return bytes.fromhex(text.decode())
+
+
+def pack_path(path: str) -> bytes:
+    """ packs N/E/S/W letters 4 per byte """
+    codes = path.encode().translate(PATH_CODES)
+    codes += bytes(-len(codes) % 4)
+    return bytes(
+        a | b << 2 | c << 4 | d << 6
+        for a, b, c, d in zip(codes[0::4], codes[1::4],
+                              codes[2::4], codes[3::4])
+    )
+
+
+def unpack_path(data: bytes, length: int) -> str:
+    """ gives back the letters of a packed path """
+    return ''.join(PATH_CHUNKS[b] for b in data)[:length]
+
+
+def encode_seed(seed: Any) -> Tuple[int, bytes]:
+    """ (kind, bytes) of a seed, so an int seed comes back as an int """
+    if seed is None:
+        return SEED_NONE, b""
+    if isinstance(seed, int):
+        return SEED_INT, str(seed).encode()
+    return SEED_STR, str(seed).encode()
+
+
+def packed_bytes(width: int, height: int, cells: Union[bytes, bytearray],
+                 entry: tuple, exit: tuple, path: str,
+                 seed: Any = None) -> bytes:
+    """
+    A maze in the packed binary format:
+    a fixed header (see HEADER), the seed, the cells two per byte,
+    then the path 4 moves per byte.
+    cells is one wall nibble per cell, like Maze.cells.
+    """
+    kind, seed_bytes = encode_seed(seed)
+    return b"".join((
+        HEADER.pack(MAGIC, width, height, entry[0], entry[1], exit[0],
+                    exit[1], len(path), kind, len(seed_bytes)),
+        seed_bytes,
+        pack_cells(cells),
+        pack_path(path),
+    ))
+
+
+def write_packed(file_name: str, width: int, height: int,
+                 cells: Union[bytes, bytearray], entry: tuple, exit: tuple,
+                 path: str, seed: Any = None) -> None:
+    """ writes a maze in the packed binary format (see packed_bytes) """
+    with open(file_name, "wb") as maze_file:
+        maze_file.write(packed_bytes(width, height, cells, entry, exit,
+                                     path, seed))
+
+
+def write_maze_packed(file_name: str, maze: generate_maze.Maze,
+                      entry: tuple, exit: tuple,
+                      path: Optional[str] = None,
+                      seed: Any = None) -> None:
+    """
+    Same as output.write_maze, in the packed binary format.
+    """
+    if path is None:
+        path = maze.solution(entry, exit)
+    write_packed(file_name, maze.width, maze.height, maze.cells,
+                 entry, exit, path, seed)
+
+
+class PackedMaze:
+    """
+    Reads a packed maze file through mmap, so a single cell or row is
+    fetched without loading the whole maze into memory.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Opens the file and reads its header.
+        Raises ValueError if it is not a packed maze.
+        """
+        self.file = open(file_name, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError(f"{file_name} is empty")
+
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise ValueError(f"{file_name} is not a packed maze")
+        (magic, self.width, self.height, entry_x, entry_y, exit_x, exit_y,
+         self.path_length, seed_kind, seed_length) = \
+            HEADER.unpack_from(self.data)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{file_name} is not a packed maze")
+
+        self.entry = (entry_x, entry_y)
+        self.exit = (exit_x, exit_y)
+
+        seed_bytes = self.data[HEADER.size:HEADER.size + seed_length]
+        self.seed: Any = None
+        if seed_kind == SEED_INT:
+            self.seed = int(seed_bytes)
+        elif seed_kind == SEED_STR:
+            self.seed = seed_bytes.decode()
+
+        self.cells_offset = HEADER.size + seed_length
+        self.path_offset = (self.cells_offset +
+                            (self.width * self.height + 1) // 2)
+
+    def __enter__(self) -> "PackedMaze":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """ unmaps and closes the file """
+        if hasattr(self, "data"):
+            self.data.close()
+        self.file.close()
+
+    def cells(self, start: int, count: int) -> bytes:
+        """ wall nibbles of count cells from cell index start """
+        first = self.cells_offset + start // 2
+        last = self.cells_offset + (start + count + 1) // 2
+        text = self.data[first:last].hex()
+        text = text[start % 2:start % 2 + count]
+        return text.encode().translate(HEX_NIBBLES)
+
+    def cell(self, x: int, y: int) -> int:
+        """ walls of one cell """
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"cell ({x}, {y}) is out of the maze")
+        index = y * self.width + x
+        byte = self.data[self.cells_offset + index // 2]
+        return byte & 15 if index % 2 else byte >> 4
+
+    def row(self, y: int) -> bytes:
+        """ walls of every cell of row y """
+        if not 0 <= y < self.height:
+            raise IndexError(f"row {y} is out of the maze")
+        return self.cells(y * self.width, self.width)
+
+    @property
+    def path(self) -> str:
+        """ the stored solution """
+        data = self.data[self.path_offset:
+                         self.path_offset + (self.path_length + 3) // 4]
+        return unpack_path(data, self.path_length)
+
+
+def read_text(file_name: str) -> Tuple[List[str], tuple, tuple, str]:
+    """
+    Reads a maze written in the hex output format.
+    Returns (hex rows, entry, exit, path).
+    """
+    with open(file_name, "r") as maze_file:
+        rows = []
+        for line in maze_file:
+            line = line.rstrip("\n")
+            if line == "":
+                break
+            rows.append(line)
+        try:
+            entry = tuple(map(int, maze_file.readline().split(",")))
+            exit = tuple(map(int, maze_file.readline().split(",")))
+        except ValueError:
+            raise ValueError(f"{file_name} is not a maze file") from None
+        path = maze_file.readline().strip()
+    if not rows or len(entry) != 2 or len(exit) != 2:
+        raise ValueError(f"{file_name} is not a maze file")
+    return rows, entry, exit, path
+
+
+def text_to_packed(text_file: str, packed_file: str,
+                   seed: Any = None) -> None:
+    """
+    Converts a hex text maze to the packed format, losslessly.
+    The text format has no seed, it can be given here.
+    """
+    rows, entry, exit, path = read_text(text_file)
+    width = len(rows[0])
+    if any(len(row) != width for row in rows):
+        raise ValueError(f"{text_file}: rows are not the same length")
+    cells = ''.join(rows).encode()
+    # anything left once the hex digits are deleted is not a cell
+    if cells.translate(None, HEX_CHARACTERS):
+        raise ValueError(f"{text_file} is not a maze file")
+    cells = cells.translate(HEX_NIBBLES)
+    write_packed(packed_file, width, len(rows), cells, entry, exit,
+                 path, seed)
+
+
+def packed_to_text(packed_file: str, text_file: str) -> None:
+    """
+    Converts a packed maze back to the hex text format, row by row.
+    """
+    with PackedMaze(packed_file) as maze, open(text_file, "wb") as out:
+        for y in range(maze.height):
+            out.write(maze.row(y).translate(HEX_DIGITS))
+            out.write(b"\n")
+        out.write(b"\n")
+        out.write(str(maze.entry).strip("()").encode())
+        out.write(b"\n")
+        out.write(str(maze.exit).strip("()").encode())
+        out.write(b"\n")
+        out.write(maze.path.encode())
@@ -1,5 +1,7 @@
 import sys
 
+from .generate_maze import GENERATORS
+
 
 def file_parsing(file_name: str) -> dict:
     """
@@ -36,6 +38,23 @@ def file_parsing(file_name: str) -> dict:
     return config
 
 
+def count_parsing(config: dict, key: str, default: int) -> int:
+    """
+    Returns the optional key of config as a number of things (0 or
+    more), default when it is missing.
+    Exits if it is not a number or is negative.
+    """
+    try:
+        value = int(config.get(key, default))
+    except ValueError:
+        print(f"ERROR: {key} must be a number")
+        sys.exit(1)
+    if value < 0:
+        print(f"ERROR: {key} can not be negative")
+        sys.exit(1)
+    return value
+
+
 def config_parsing(config: dict) -> dict:
     """
     Validates and converts config values to correct types.
@@ -48,6 +67,19 @@ def config_parsing(config: dict) -> dict:
     except Exception:
         config["SEED_EXIST"] = False
 
+    config["ALGORITHM"] = config.get("ALGORITHM", "backtracker").lower()
+    if config["ALGORITHM"] not in GENERATORS:
+        print("ERROR: ALGORITHM must be one of "
+              f"{', '.join(GENERATORS)}")
+        sys.exit(1)
+
+    config["PREGENERATE"] = count_parsing(config, "PREGENERATE", 0)
+    config["CACHE_SIZE"] = count_parsing(config, "CACHE_SIZE", 0)
+    if "CACHE_DIR_SIZE" in config:
+        # its default is cache.DISK_SIZE
+        config["CACHE_DIR_SIZE"] = count_parsing(config, "CACHE_DIR_SIZE",
+                                                 0)
+
     try:
         config["WIDTH"] = int(config["WIDTH"])
         config["HEIGHT"] = int(config["HEIGHT"])
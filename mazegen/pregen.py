@@ -0,0 +1,84 @@
+import queue
+import random
+import threading
+from typing import Any, Dict, Optional
+
+from mazegen import generate_maze
+from mazegen.cache import MazeCache
+
+
+class MazePool:
+    """
+    Keeps a few mazes of the current config ready, generated and
+    solved by a background thread, so "R. ReGenerate" can show a new
+    maze at once. Each maze has its own random generator, so the
+    thread never changes the mazes of the display.
+    With a SEED every maze is the one that seed gives, like a maze
+    generated on the spot; without one each maze gets a random seed.
+    """
+
+    def __init__(self, config: Dict[str, Any], perfect: bool,
+                 size: int, cache: Optional[MazeCache] = None) -> None:
+        """
+        Starts filling a queue of size mazes in the background.
+        perfect is passed apart since the menu can change it.
+        Mazes already in cache are taken from it.
+        """
+        self.config = config
+        self.perfect = perfect
+        self.cache = cache
+        self.ready: queue.Queue[Any] = queue.Queue(size)
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.fill, daemon=True)
+        self.thread.start()
+
+    def make(self) -> generate_maze.Maze:
+        """ generates and solves one maze of the config """
+        config = self.config
+        seed = config["SEED"]
+        if config["SEED_EXIST"] is False:
+            seed = random.randint(1, 100)
+        if self.cache is not None:
+            return self.cache.maze(config["WIDTH"], config["HEIGHT"], seed,
+                                   self.perfect, config["ENTRY"],
+                                   config["EXIT"],
+                                   config.get("ALGORITHM", "backtracker"))
+        maze = generate_maze.Maze(config["WIDTH"], config["HEIGHT"], seed)
+        maze.pattern_42()
+        maze.maze_generator(config["ENTRY"], None, self.perfect,
+                            config.get("ALGORITHM", "backtracker"))
+        maze.maze_solver(config["ENTRY"], config["EXIT"])
+        return maze
+
+    def fill(self) -> None:
+        """ thread loop: keeps the queue full until stopped """
+        while not self.stopped.is_set():
+            made: Any
+            try:
+                made = self.make()
+            except Exception as error:
+                # given to get(), which raises it in the display
+                made = error
+            while not self.stopped.is_set():
+                try:
+                    self.ready.put(made, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def get(self) -> generate_maze.Maze:
+        """
+        A ready maze, waiting for the thread if none is done yet.
+        The thread then makes another one in its place.
+        """
+        made = self.ready.get()
+        if isinstance(made, Exception):
+            raise made
+        return made
+
+    def close(self) -> None:
+        """
+        Stops the thread after the maze it is making, without waiting
+        for it. Mazes not taken are dropped.
+        """
+        self.stopped.set()
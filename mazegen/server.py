@@ -0,0 +1,359 @@
+"""
+Maze service for a game backend, on localhost and the standard library
+only: an asyncio HTTP/1.1 server that generates and solves mazes in a
+pool of worker processes.
+
+    GET /maze?w=&h=&seed=&perfect=&format=   a maze file: hex (the
+                                             output format) or packed
+    GET /solve?w=&h=&seed=&perfect=          its shortest path, in JSON
+    GET /stats                               requests and p50/p99 ms
+
+Every maze request also takes algorithm=, entry=x,y and exit=x,y
+(default: the top left and bottom right cells). Without a seed a
+random one is picked; it is sent back in the X-Maze-Seed header.
+Run it with: python3 -m mazegen serve [--port 8042] [--workers N]
+"""
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from mazegen import generate_maze
+from mazegen.output import footer_text, maze_text
+from mazegen.packed import packed_bytes
+
+HOST = "127.0.0.1"
+PORT = 8042
+# biggest maze served, 2000x2000
+MAX_CELLS = 4_000_000
+# latencies kept per endpoint for the percentiles
+LATENCY_WINDOW = 10_000
+# longest seed taken: it is sent back in the X-Maze-Seed header
+MAX_SEED = 64
+
+FORMATS = {
+    "hex": "text/plain; charset=utf-8",
+    "packed": "application/octet-stream",
+}
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 500: "Internal Server Error",
+}
+
+# (endpoint, width, height, seed, perfect, algorithm, entry, exit,
+# format): everything a response depends on, so equal jobs are one job
+Job = Tuple[str, int, int, str, bool, str, tuple, tuple, str]
+
+
+def run_job(job: Job) -> bytes:
+    """
+    Generates and solves the maze of a job and returns the response
+    body. Runs in a worker process.
+    """
+    (endpoint, width, height, seed, perfect, algorithm, entry, exit,
+     file_format) = job
+    maze = generate_maze.Maze(width, height, seed)
+    maze.pattern_42()
+    maze.maze_generator(entry, None, perfect, algorithm)
+    path = maze.maze_solver(entry, exit)
+
+    if endpoint == "solve":
+        return json.dumps({"seed": seed, "entry": entry, "exit": exit,
+                           "length": len(path), "path": path}).encode()
+    if file_format == "packed":
+        return packed_bytes(width, height, maze.cells, entry, exit, path,
+                            seed)
+    return (maze_text(maze.cells, width, height) +
+            footer_text(entry, exit, path))
+
+
+def query_cell(query: Dict[str, List[str]], name: str,
+               default: tuple) -> tuple:
+    """ an x,y query parameter """
+    if name not in query:
+        return default
+    try:
+        cell = tuple(map(int, query[name][-1].split(",")))
+    except ValueError:
+        raise ValueError(f"{name} must be x,y")
+    if len(cell) != 2:
+        raise ValueError(f"{name} must be x,y")
+    return cell
+
+
+def parse_job(endpoint: str, query: Dict[str, List[str]]) -> Job:
+    """
+    The job of a /maze or /solve query, checked like config_parsing
+    checks a config file. Raises ValueError with the message for the
+    client when a parameter is wrong.
+    """
+    def value(name: str, default: Optional[str] = None) -> str:
+        if name in query:
+            return query[name][-1]
+        if default is None:
+            raise ValueError(f"{name} is missing")
+        return default
+
+    try:
+        width, height = int(value("w")), int(value("h"))
+    except ValueError as error:
+        if "missing" in str(error):
+            raise
+        raise ValueError("w and h must be numbers")
+    if width <= 0 or height <= 0:
+        raise ValueError("invalid maze size")
+    if width * height > MAX_CELLS:
+        raise ValueError(f"the maze is bigger than {MAX_CELLS} cells")
+
+    # a string, like SEED in a config file, so both give the same maze
+    seed = value("seed", str(random.randint(1, 2 ** 31)))
+    # printable ASCII without spaces only: no CR or LF can get into
+    # the header it is sent back in
+    if not 0 < len(seed) <= MAX_SEED or not all(
+        "!" <= char <= "~" for char in seed
+    ):
+        raise ValueError(f"seed must be 1 to {MAX_SEED} printable "
+                         "characters, without spaces")
+    perfect_text = value("perfect", "true").upper()
+    if perfect_text not in ("TRUE", "FALSE"):
+        raise ValueError("perfect must be true or false")
+    algorithm = value("algorithm", "backtracker").lower()
+    if algorithm not in generate_maze.GENERATORS:
+        raise ValueError("algorithm must be one of "
+                         f"{', '.join(generate_maze.GENERATORS)}")
+
+    entry = query_cell(query, "entry", (0, 0))
+    exit = query_cell(query, "exit", (width - 1, height - 1))
+    for name, (x, y) in (("entry", entry), ("exit", exit)):
+        if not (0 <= x < width and 0 <= y < height):
+            raise ValueError(f"the {name} point is out of the maze")
+    if entry == exit:
+        raise ValueError("entry and exit is the same")
+    pattern = generate_maze.pattern_cells(width, height)
+    for name, point in (("entry", entry), ("exit", exit)):
+        if point in pattern:
+            raise ValueError(f"the {name} point is in the 42 pattern")
+
+    file_format = value("format", "hex") if endpoint == "maze" else ""
+    if endpoint == "maze" and file_format not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    return (endpoint, width, height, seed, perfect_text == "TRUE",
+            algorithm, entry, exit, file_format)
+
+
+class Latency:
+    """
+    Latencies of the last LATENCY_WINDOW requests of an endpoint,
+    and how many there were in all.
+    """
+
+    def __init__(self) -> None:
+        self.samples: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.count = 0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+
+    def percentile(self, percent: float) -> float:
+        """ the latency in ms that percent % of the requests beat """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index] * 1e3
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.count,
+                "p50_ms": round(self.percentile(50), 3),
+                "p99_ms": round(self.percentile(99), 3)}
+
+
+class MazeServer:
+    """
+    The HTTP service. Generation and solving run in executor (a
+    process pool by default) so the event loop only parses requests
+    and writes responses. Requests for a job already running wait for
+    that same job instead of starting another one.
+    """
+
+    def __init__(self, port: int = PORT, workers: Optional[int] = None,
+                 executor: Optional[Executor] = None) -> None:
+        """ port 0 picks a free port, see self.port once started """
+        self.port = port
+        self.executor = executor or ProcessPoolExecutor(workers)
+        self.in_flight: Dict[Job, "asyncio.Future[bytes]"] = {}
+        self.latency = {"maze": Latency(), "solve": Latency()}
+        self.coalesced = 0
+        # open connections, to close the idle ones when stopping
+        self.connections: Dict["asyncio.Task[None]",
+                               asyncio.StreamWriter] = {}
+        self.server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        """ starts listening on localhost only """
+        self.server = await asyncio.start_server(self.handle, HOST,
+                                                 self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        if self.server is None:
+            await self.start()
+        assert self.server is not None
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Stops listening, closes the connections once the requests
+        they are on are answered, then shuts the pool down.
+        """
+        if self.server is not None:
+            self.server.close()
+        for writer in self.connections.values():
+            # a handler waiting for a request sees the end of the stream
+            writer.transport.close()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, job: Job) -> bytes:
+        """
+        The body of a job, from the job already running for the same
+        parameters if there is one. Each waiter is shielded, so a
+        client leaving does not cancel the job of the others.
+        """
+        future = self.in_flight.get(job)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.executor, run_job, job)
+            self.in_flight[job] = future
+            future.add_done_callback(
+                lambda _: self.in_flight.pop(job, None))
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {
+            name: latency.stats() for name, latency in self.latency.items()
+        }
+        stats["coalesced"] = self.coalesced
+        stats["in_flight"] = len(self.in_flight)
+        return stats
+
+    async def respond(self, method: str,
+                      target: str) -> Tuple[int, str, bytes, Dict[str, str]]:
+        """ (status, content type, body, extra headers) of a request """
+        url = urlsplit(target)
+        endpoint = url.path.strip("/")
+        if endpoint not in ("maze", "solve", "stats"):
+            return 404, FORMATS["hex"], b"not found\n", {}
+        if method != "GET":
+            return 405, FORMATS["hex"], b"only GET\n", {"Allow": "GET"}
+        if endpoint == "stats":
+            return (200, "application/json",
+                    json.dumps(self.stats()).encode(), {})
+
+        start = time.perf_counter()
+        try:
+            job = parse_job(endpoint, parse_qs(url.query))
+        except ValueError as error:
+            return 400, FORMATS["hex"], f"ERROR: {error}\n".encode(), {}
+        try:
+            body = await self.run(job)
+        except Exception as error:
+            return 500, FORMATS["hex"], f"ERROR: {error}\n".encode(), {}
+        self.latency[endpoint].add(time.perf_counter() - start)
+
+        content_type = ("application/json" if endpoint == "solve"
+                        else FORMATS[job[8]])
+        return 200, content_type, body, {"X-Maze-Seed": job[3]}
+
+    async def handle(self, reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter) -> None:
+        """
+        One connection: requests are answered in turn while the
+        client keeps it open (HTTP/1.1 keep-alive).
+        """
+        task = asyncio.current_task()
+        assert task is not None
+        self.connections[task] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                    headers = {}
+                    while True:
+                        header = await reader.readline()
+                        if header in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, text = header.decode("latin-1").partition(
+                            ":")
+                        headers[name.strip().lower()] = text.strip()
+                except ValueError:
+                    # a line longer than the stream limit: a bad request
+                    line = b"-"
+                if not line:
+                    break
+
+                parts = line.decode("latin-1").split()
+                extra: Dict[str, str]
+                if len(parts) != 3 or not parts[2].startswith("HTTP/"):
+                    status, content_type, body, extra = (
+                        400, FORMATS["hex"], b"bad request\n", {})
+                    keep_alive = False
+                else:
+                    method, target, version = parts
+                    status, content_type, body, extra = await self.respond(
+                        method, target)
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = (
+                        connection == "keep-alive" if version == "HTTP/1.0"
+                        else connection != "close"
+                    ) and method == "GET"
+
+                if any("\r" in text or "\n" in text
+                       for text in extra.values()):
+                    # never split the response with a header value
+                    status, content_type, body, extra = (
+                        500, FORMATS["hex"], b"ERROR: bad header\n", {})
+
+                connection = "keep-alive" if keep_alive else "close"
+                head = [f"HTTP/1.1 {status} {REASONS[status]}",
+                        f"Content-Type: {content_type}",
+                        f"Content-Length: {len(body)}",
+                        f"Connection: {connection}"]
+                head += [f"{name}: {text}" for name, text in extra.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            del self.connections[task]
+            writer.close()
+
+
+async def serve(port: int = PORT, workers: Optional[int] = None) -> None:
+    """ runs a MazeServer until it is cancelled (Ctrl + C) """
+    server = MazeServer(port, workers)
+    await server.start()
+    print(f"serving mazes on http://{HOST}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(port: int = PORT, workers: Optional[int] = None) -> None:
+    try:
+        asyncio.run(serve(port, workers))
+    except KeyboardInterrupt:
+        print("You pressed Ctrl + C and the server Stopping safely")
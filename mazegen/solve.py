@@ -0,0 +1,323 @@
+import heapq
+from array import array
+from typing import Callable, Dict, List, Tuple
+
+# moves are stored as 1..4 in a bytearray of parents, 0 is "not seen"
+START = 5
+MOVES = "NSEW"
+WALL_BITS = (1, 4, 2, 8)
+REVERSE = {'N': 'S', 'S': 'N', 'E': 'W', 'W': 'E'}
+
+
+def _steps(width: int) -> Tuple[int, int, int, int]:
+    """ index offset of a move N, S, E, W in a grid of this width """
+    return (-width, width, 1, -1)
+
+
+def _neighbours(width: int) -> Tuple[Tuple[int, int, int], ...]:
+    """ (wall bit, index offset, stored move) of every move N, S, E, W """
+    return tuple(zip(WALL_BITS, _steps(width), range(1, 5)))
+
+
+def _walk_back(came: bytearray, goal: int, width: int) -> List[str]:
+    """
+    Follows the parent moves from goal back to the start and returns
+    the moves found, last move first.
+    """
+    steps = _steps(width)
+    moves = []
+    index = goal
+    move = came[index]
+    while move != START:
+        moves.append(MOVES[move - 1])
+        index -= steps[move - 1]
+        move = came[index]
+    return moves
+
+
+def _unreachable(entry: tuple, exit: tuple) -> ValueError:
+    return ValueError(f"EXIT {exit} can not be reached from ENTRY {entry}")
+
+
+def bfs(cells: bytearray, width: int, height: int,
+        entry: tuple, exit: tuple) -> str:
+    """
+    Breadth first search over cell indexes.
+    Parents are one byte per cell and the path is built once at the
+    end, so it runs in linear time and gives the same path as the old
+    dict based solver (neighbours are tried N, S, E, W).
+    """
+    start = entry[1] * width + entry[0]
+    goal = exit[1] * width + exit[0]
+    neighbours = _neighbours(width)
+
+    came = bytearray(width * height)
+    came[start] = START
+    queue = [start]
+    for index in queue:
+        if index == goal:
+            break
+        wall = cells[index]
+        for bit, step, move in neighbours:
+            if not wall & bit:
+                near = index + step
+                if not came[near]:
+                    came[near] = move
+                    queue.append(near)
+
+    if not came[goal]:
+        raise _unreachable(entry, exit)
+    moves = _walk_back(came, goal, width)
+    moves.reverse()
+    return ''.join(moves)
+
+
+def astar(cells: bytearray, width: int, height: int,
+          entry: tuple, exit: tuple) -> str:
+    """
+    A* search with the Manhattan distance to the exit as heuristic.
+    Goes straight at the exit, which helps most on mazes with loops.
+    """
+    start = entry[1] * width + entry[0]
+    goal = exit[1] * width + exit[0]
+    goal_x, goal_y = exit
+    neighbours = _neighbours(width)
+
+    came = bytearray(width * height)
+    came[start] = START
+    cost = array('i', [-1]) * (width * height)
+    cost[start] = 0
+    frontier = [(abs(entry[0] - goal_x) + abs(entry[1] - goal_y), start)]
+
+    while frontier:
+        _, index = heapq.heappop(frontier)
+        if index == goal:
+            break
+        wall = cells[index]
+        next_cost = cost[index] + 1
+        for bit, step, move in neighbours:
+            if not wall & bit:
+                near = index + step
+                if cost[near] == -1 or next_cost < cost[near]:
+                    cost[near] = next_cost
+                    came[near] = move
+                    y, x = divmod(near, width)
+                    guess = next_cost + abs(x - goal_x) + abs(y - goal_y)
+                    heapq.heappush(frontier, (guess, near))
+
+    if not came[goal]:
+        raise _unreachable(entry, exit)
+    moves = _walk_back(came, goal, width)
+    moves.reverse()
+    return ''.join(moves)
+
+
+def bidirectional_bfs(cells: bytearray, width: int, height: int,
+                      entry: tuple, exit: tuple) -> str:
+    """
+    Breadth first search from both the entry and the exit at once,
+    one whole level of the smaller side at a time, until they meet.
+    It looks at far fewer cells than bfs when the maze has loops.
+    """
+    start = entry[1] * width + entry[0]
+    goal = exit[1] * width + exit[0]
+    if start == goal:
+        return ""
+    neighbours = _neighbours(width)
+    size = width * height
+
+    came = (bytearray(size), bytearray(size))
+    dist = (array('i', [-1]) * size, array('i', [-1]) * size)
+    came[0][start] = came[1][goal] = START
+    dist[0][start] = dist[1][goal] = 0
+    levels = ([start], [goal])
+
+    best = -1
+    meet = -1
+    while levels[0] and levels[1] and best == -1:
+        side = 0 if len(levels[0]) <= len(levels[1]) else 1
+        my_came, my_dist = came[side], dist[side]
+        other_dist = dist[1 - side]
+        level = []
+        for index in levels[side]:
+            wall = cells[index]
+            next_dist = my_dist[index] + 1
+            for bit, step, move in neighbours:
+                if not wall & bit:
+                    near = index + step
+                    if my_came[near]:
+                        continue
+                    my_came[near] = move
+                    my_dist[near] = next_dist
+                    level.append(near)
+                    # finish the level and keep the shortest meeting
+                    if other_dist[near] != -1:
+                        total = next_dist + other_dist[near]
+                        if best == -1 or total < best:
+                            best, meet = total, near
+        if side == 0:
+            levels = (level, levels[1])
+        else:
+            levels = (levels[0], level)
+
+    if best == -1:
+        raise _unreachable(entry, exit)
+
+    moves = _walk_back(came[0], meet, width)
+    moves.reverse()
+    # the exit side was walked from the exit, so reverse its moves
+    moves.extend(REVERSE[m] for m in _walk_back(came[1], meet, width))
+    return ''.join(moves)
+
+
+SOLVERS: Dict[str, Callable[[bytearray, int, int, tuple, tuple], str]] = {
+    "bfs": bfs,
+    "astar": astar,
+    "bidirectional": bidirectional_bfs,
+}
+
+
+class DistanceField:
+    """
+    Distances and parents of every cell from one source cell, computed
+    once with a breadth first search and kept in compact arrays
+    (one byte of parent move and one int of distance per cell).
+    Then any path to or from the source is answered in O(path length)
+    without searching again.
+    """
+
+    def __init__(self, cells: bytearray, width: int, height: int,
+                 source: tuple) -> None:
+        self.width = width
+        self.height = height
+        self.source = source
+        neighbours = _neighbours(width)
+        start = source[1] * width + source[0]
+
+        self.came = bytearray(width * height)
+        self.dist = array('i', [-1]) * (width * height)
+        self.came[start] = START
+        self.dist[start] = 0
+        # cells in the order they were reached, parents before children
+        self.order = array('i', [start])
+
+        came, dist, order = self.came, self.dist, self.order
+        for index in order:
+            wall = cells[index]
+            next_dist = dist[index] + 1
+            for bit, step, move in neighbours:
+                if not wall & bit:
+                    near = index + step
+                    if not came[near]:
+                        came[near] = move
+                        dist[near] = next_dist
+                        order.append(near)
+
+    def index(self, cell: tuple) -> int:
+        """ index of an (x, y) cell, checked to be reachable """
+        index = cell[1] * self.width + cell[0]
+        if self.dist[index] == -1:
+            raise _unreachable(self.source, cell)
+        return index
+
+    def distance(self, cell: tuple) -> int:
+        """ number of moves between the source and cell """
+        return self.dist[self.index(cell)]
+
+    def path_to(self, cell: tuple) -> str:
+        """ shortest path from the source to cell """
+        moves = _walk_back(self.came, self.index(cell), self.width)
+        moves.reverse()
+        return ''.join(moves)
+
+    def path_from(self, cell: tuple) -> str:
+        """ shortest path from cell to the source """
+        moves = _walk_back(self.came, self.index(cell), self.width)
+        return ''.join(REVERSE[m] for m in moves)
+
+
+class TreeIndex:
+    """
+    Lowest common ancestor index over the spanning tree of a perfect
+    maze, so the path and distance between any two cells come back
+    without a search. Every cell keeps a jump pointer to an ancestor
+    (one int per cell on top of the DistanceField), which finds the
+    common ancestor in O(log n) steps; a path then costs its length.
+    """
+
+    def __init__(self, cells: bytearray, width: int, height: int,
+                 root: tuple = (0, 0)) -> None:
+        """
+        Builds the tree from root. Raises ValueError if the part of the
+        maze reachable from root has loops, since paths through the
+        tree would then not always be the shortest ones.
+        """
+        self.field = DistanceField(cells, width, height, root)
+        self.width = width
+        self.steps = _steps(width)
+        depth, order = self.field.dist, self.field.order
+
+        open_walls = 0
+        for index in order:
+            open_walls += 4 - bin(cells[index] & 15).count("1")
+        if open_walls // 2 != len(order) - 1:
+            raise ValueError("TreeIndex needs a perfect maze (no loops)")
+
+        self.jump = jump = array('i', bytes(4 * width * height))
+        jump[order[0]] = order[0]
+        for index in order[1:]:
+            parent = self.parent(index)
+            up = jump[parent]
+            if depth[parent] - depth[up] == depth[up] - depth[jump[up]]:
+                jump[index] = jump[up]
+            else:
+                jump[index] = parent
+
+    def parent(self, index: int) -> int:
+        """ index of the parent of a cell in the tree """
+        return index - self.steps[self.field.came[index] - 1]
+
+    def ancestor(self, a: int, b: int) -> int:
+        """ index of the lowest common ancestor of two cell indexes """
+        depth, jump = self.field.dist, self.jump
+        if depth[a] < depth[b]:
+            a, b = b, a
+        while depth[a] > depth[b]:
+            if depth[jump[a]] >= depth[b]:
+                a = jump[a]
+            else:
+                a = self.parent(a)
+        while a != b:
+            if jump[a] != jump[b]:
+                a, b = jump[a], jump[b]
+            else:
+                a, b = self.parent(a), self.parent(b)
+        return a
+
+    def distance(self, start: tuple, end: tuple) -> int:
+        """ number of moves between two cells """
+        a, b = self.field.index(start), self.field.index(end)
+        depth = self.field.dist
+        return depth[a] + depth[b] - 2 * depth[self.ancestor(a, b)]
+
+    def path(self, start: tuple, end: tuple) -> str:
+        """ the only path from start to end """
+        a, b = self.field.index(start), self.field.index(end)
+        common = self.ancestor(a, b)
+        came = self.field.came
+
+        # up from start to the common ancestor, reversing each move
+        moves = []
+        while a != common:
+            move = came[a]
+            moves.append(REVERSE[MOVES[move - 1]])
+            a -= self.steps[move - 1]
+
+        # then down to end: collect from end upwards and flip the order
+        down = []
+        while b != common:
+            move = came[b]
+            down.append(MOVES[move - 1])
+            b -= self.steps[move - 1]
+        down.reverse()
+        return ''.join(moves) + ''.join(down)
@@ -0,0 +1,227 @@
+"""
+Tiled generation of giant mazes: the grid is cut into square tiles,
+each tile is generated on its own in a worker process, then the tiles
+are joined into one maze.
+
+- Each tile has its own random generator, seeded from the maze seed
+  and the tile position (tile_seed), so a tile is the same whichever
+  worker makes it and in whatever order.
+- A tile cut by the 42 pattern can hold several separate parts; each
+  part is generated as its own tree and the parts touching the tile
+  edges are numbered.
+- The parts are joined by opening one wall between two of them, in
+  random order with a union-find (Kruskal over the parts), so a
+  perfect maze stays a tree. With perfect=False the other walls
+  between tiles are opened with the 10% chance the generators use.
+
+The result only depends on the seed and the tile size, never on the
+number of workers.
+"""
+import hashlib
+import os
+import random
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from mazegen import generate_maze
+from mazegen.algorithms import LOOP_CHANCE, carve, find
+from mazegen.grid import PATTERN, VISITED
+
+# side of a tile in cells
+TILE = 128
+
+# (x0, y0, tile width, tile height, maze width, maze height, seed,
+# perfect, algorithm, entry, cells of the tile with their 42 pattern)
+TileJob = Tuple[int, int, int, int, int, int, Any, bool, str,
+                tuple, bytes]
+# part number (0: not reached) of each cell of the top, bottom, left
+# and right edge of a tile
+Edges = Tuple[List[int], List[int], List[int], List[int]]
+
+
+def tile_seed(seed: Any, *counter: int) -> int:
+    """
+    The seed of the random generator of one tile (or of the
+    stitching), a hash of the maze seed and a counter, so it does not
+    depend on which process uses it. Like cache_key, the seed keeps its
+    type: 5 and "5" give different mazes.
+    """
+    text = repr((seed,) + counter).encode()
+    return int.from_bytes(hashlib.sha256(text).digest()[:8], "big")
+
+
+def tile_edges(width: int, height: int) -> Edges:
+    """ tile indexes of the top, bottom, left and right edge cells """
+    return (list(range(width)),
+            list(range((height - 1) * width, height * width)),
+            list(range(0, height * width, width)),
+            list(range(width - 1, height * width, width)))
+
+
+def generate_tile(job: TileJob) -> Tuple[bytes, Edges]:
+    """
+    Generates one tile, in a worker process.
+    The first part starts at the entry when it is in the tile, the
+    other ones from the first free cell of an edge shared with another
+    tile. Parts that touch no such edge are closed in by the 42
+    pattern and stay closed, like in a maze generated whole.
+    Returns the cells of the tile and the part of its edge cells.
+    """
+    (x0, y0, width, height, maze_width, maze_height, seed, perfect,
+     algorithm, entry, pattern) = job
+    cells = bytearray(pattern)
+    rng = random.Random(tile_seed(seed, x0, y0))
+    generator = generate_maze.GENERATORS[algorithm]
+    edges = tile_edges(width, height)
+
+    starts = []
+    x, y = entry
+    if x0 <= x < x0 + width and y0 <= y < y0 + height:
+        starts.append((y - y0) * width + x - x0)
+    # only the edges with another tile on the other side
+    for edge, shared in zip(edges, (y0 > 0, y0 + height < maze_height,
+                                    x0 > 0, x0 + width < maze_width)):
+        if shared:
+            starts += edge
+
+    labels: Edges = ([0] * width, [0] * width, [0] * height, [0] * height)
+    part = 0
+    for start in starts:
+        if cells[start] & (PATTERN | VISITED):
+            continue
+        generator(cells, width, height, rng,
+                  (start % width, start // width), None, perfect)
+        part += 1
+        for edge, label in zip(edges, labels):
+            for i, index in enumerate(edge):
+                if not label[i] and cells[index] & VISITED:
+                    label[i] = part
+    return bytes(cells), labels
+
+
+def tile_jobs(maze: generate_maze.Maze, seed: Any, perfect: bool,
+              algorithm: str, entry: tuple,
+              tile: int) -> Iterator[TileJob]:
+    """ the tiles of maze, row after row """
+    width, height = maze.width, maze.height
+    for y0 in range(0, height, tile):
+        for x0 in range(0, width, tile):
+            tile_width = min(tile, width - x0)
+            tile_height = min(tile, height - y0)
+            pattern = b"".join(
+                maze.cells[y * width + x0:y * width + x0 + tile_width]
+                for y in range(y0, y0 + tile_height)
+            )
+            yield (x0, y0, tile_width, tile_height, width, height, seed,
+                   perfect, algorithm, tuple(entry), pattern)
+
+
+def stitch(maze: generate_maze.Maze, seed: Any, perfect: bool,
+           tile: int, edges: Dict[Tuple[int, int], Edges]) -> None:
+    """
+    Joins the parts of all the tiles into one maze: one wall opened
+    between each two parts a spanning tree over the parts links, plus
+    the loops of a maze that is not perfect.
+    """
+    width, cells = maze.width, maze.cells
+    # (part, part) -> the walls between them, as (cell, east or south)
+    walls: Dict[Tuple[int, int], List[Tuple[int, bool]]] = {}
+    # each (tile, part) gets a number for the union-find
+    numbers: Dict[Tuple[int, int, int], int] = {}
+
+    def number(x0: int, y0: int, label: int) -> int:
+        return numbers.setdefault((x0, y0, label), len(numbers))
+
+    for (x0, y0), (_, bottom, _, right) in edges.items():
+        for neighbour, labels, side, south in (
+            ((x0 + tile, y0), right, 2, False),
+            ((x0, y0 + tile), bottom, 0, True),
+        ):
+            if neighbour not in edges:
+                continue
+            other = edges[neighbour][side]
+            for i, (label, other_label) in enumerate(zip(labels, other)):
+                if not label or not other_label:
+                    continue
+                if south:
+                    index = (y0 + tile - 1) * width + x0 + i
+                else:
+                    index = (y0 + i) * width + x0 + tile - 1
+                pair = (number(x0, y0, label), number(*neighbour,
+                                                      other_label))
+                walls.setdefault(pair, []).append((index, south))
+
+    rng = random.Random(tile_seed(seed, -1))
+    pairs = list(walls)
+    rng.shuffle(pairs)
+    parent = array('i', range(len(numbers)))
+    opened = set()
+    for a, b in pairs:
+        root_a, root_b = find(parent, a), find(parent, b)
+        if root_a == root_b:
+            continue
+        parent[root_b] = root_a
+        choices = walls[(a, b)]
+        opened.add(choices[int(rng.random() * len(choices))])
+
+    if not perfect:
+        for pair in sorted(walls):
+            for wall in walls[pair]:
+                if wall not in opened and rng.random() < LOOP_CHANCE:
+                    opened.add(wall)
+
+    for index, south in sorted(opened):
+        if south:
+            carve(cells, width, index, index + width, 4, 1, None)
+        else:
+            carve(cells, width, index, index + 1, 2, 8, None)
+
+
+def tiled_maze(width: int, height: int, seed: Any, perfect: bool = True,
+               entry: tuple = (0, 0), algorithm: str = "backtracker",
+               tile: int = TILE,
+               workers: Optional[int] = None) -> generate_maze.Maze:
+    """
+    Generates a width x height maze with its 42 pattern, tile by tile
+    across workers processes (default: all cores), with one of the
+    GENERATORS in each tile. The same seed and tile size always give
+    the same maze, whatever the number of workers; it is not the maze
+    maze_generator gives for that seed.
+    """
+    if algorithm not in generate_maze.GENERATORS:
+        raise ValueError(f"unknown maze algorithm: {algorithm}")
+    if tile <= 0:
+        raise ValueError("the tile size must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    maze = generate_maze.Maze(width, height, seed)
+    maze.pattern_42()
+    jobs = list(tile_jobs(maze, seed, perfect, algorithm, entry, tile))
+    edges: Dict[Tuple[int, int], Edges] = {}
+
+    if workers == 1 or len(jobs) == 1:
+        place(maze, jobs, map(generate_tile, jobs), edges)
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            place(maze, jobs, executor.map(generate_tile, jobs,
+                                           chunksize=chunksize), edges)
+
+    stitch(maze, seed, perfect, tile, edges)
+    return maze
+
+
+def place(maze: generate_maze.Maze, jobs: List[TileJob],
+          results: Iterable[Tuple[bytes, Edges]],
+          edges: Dict[Tuple[int, int], Edges]) -> None:
+    """ copies each generated tile into maze and keeps its edges """
+    width = maze.width
+    for job, (cells, labels) in zip(jobs, results):
+        x0, y0, tile_width, tile_height = job[:4]
+        for row in range(tile_height):
+            start = (y0 + row) * width + x0
+            maze.cells[start:start + tile_width] = cells[
+                row * tile_width:(row + 1) * tile_width]
+        edges[(x0, y0)] = labels
@@ -0,0 +1,304 @@
+"""
+NumPy backend: binary tree and sidewinder mazes generated with whole
+array operations, for very large grids.
+This module needs numpy, so the rest of the package never imports it;
+generate_maze.vectorized_maze loads it on first use.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .generate_maze import Maze
+from .grid import VISITED, WALLS
+from .output import HEX_DIGITS, footer_text, write_file
+from .packed import HEX_NIBBLES
+
+N, E, S, W = 1, 2, 4, 8
+# cells generated at once: the temporary arrays of a block stay in the
+# CPU cache, which matters more than the number of blocks
+BLOCK_CELLS = 1 << 17
+
+
+def numpy_rng(seed: Any) -> np.random.Generator:
+    """
+    A NumPy generator for a seed. Int seeds are used as is, any
+    other seed through the bytes of its text, so "abc" works too.
+    """
+    if seed is None or isinstance(seed, int):
+        return np.random.default_rng(seed)
+    return np.random.default_rng(list(str(seed).encode()))
+
+
+def block_rows(width: int) -> int:
+    """ rows of a block of about BLOCK_CELLS cells """
+    return max(1, BLOCK_CELLS // width)
+
+
+def coin(rng: np.random.Generator, shape: Tuple[int, int]) -> np.ndarray:
+    """ 0 or 1 per cell, one byte each, from one random bit per cell """
+    count = shape[0] * shape[1]
+    bits = np.frombuffer(rng.bytes((count + 7) // 8), dtype=np.uint8)
+    return np.unpackbits(bits, count=count).reshape(shape)
+
+
+def run_randoms(rng: np.random.Generator, count: int) -> np.ndarray:
+    """ a 16 bit random number per run, four from each raw draw """
+    raw = rng.bit_generator.random_raw((count + 3) // 4)
+    return raw.astype("<u8", copy=False).view("<u2")[:count]
+
+
+def carve_binary_tree(walls: np.ndarray, north: np.ndarray,
+                      y0: int) -> None:
+    """
+    Opens the walls of rows y0.. of walls from north (1 where a cell
+    goes north, 0 where it goes west). Both arrays may have leading
+    batch axes, so a whole stack of mazes is carved at once.
+    """
+    y1 = y0 + north.shape[-2]
+    block = walls[..., y0:y1, :]
+    north[..., :, 0] = 1
+    if y0 == 0:
+        north[..., 0, :] = 0
+    west = 1 - north
+    west[..., :, 0] = 0
+
+    block ^= north * N
+    block ^= west * W
+    block[..., :, :-1] ^= west[..., :, 1:] * E
+    if y0 == 0:
+        block[..., :-1, :] ^= north[..., 1:, :] * S
+    else:
+        walls[..., y0 - 1:y1 - 1, :] ^= north * S
+
+
+def binary_tree(width: int, height: int, seed: Any) -> np.ndarray:
+    """
+    Binary tree maze: every cell opens its north or its west wall at
+    random (the top row only west, the left column only north).
+    Each wall bit is cleared with one array operation per block.
+    """
+    rng = numpy_rng(seed)
+    walls = np.full((height, width), WALLS, dtype=np.uint8)
+    rows = block_rows(width)
+    for y0 in range(0, height, rows):
+        y1 = min(y0 + rows, height)
+        carve_binary_tree(walls, coin(rng, (y1 - y0, width)), y0)
+    return walls
+
+
+def sidewinder_ends(close: np.ndarray, y0: int) -> None:
+    """
+    Fixes close (1 where a run ends) of rows y0.. so the top row is
+    one run and every row ends one. Leading batch axes are allowed.
+    """
+    close[..., :, -1] = 1
+    if y0 == 0:
+        close[..., 0, :-1] = 0
+
+
+def carve_runs(walls: np.ndarray, close: np.ndarray, y0: int) -> None:
+    """ opens the east walls inside runs of rows y0.. """
+    block = walls[..., y0:y0 + close.shape[-2], :]
+    east = 1 - close
+    block ^= east * E
+    block[..., :, 1:] ^= east[..., :, :-1] * W
+
+
+def carve_north(walls: np.ndarray, close: np.ndarray, y0: int,
+                rngs: List[np.random.Generator]) -> None:
+    """
+    Opens the north wall of one random cell of every run of rows y0..
+    but the top row (a run ends where close is 1). walls and close
+    have a leading maze axis, rngs one generator per maze.
+    Runs follow each other in the flat block and every row ends one,
+    so a run starts after the end of the one before: the cell is
+    drawn back from the end, with no loop over runs.
+    """
+    count, rows, width = close.shape
+    size = rows * width
+    small = count * size < 1 << 31 and width < 1 << 15
+    # 16 bit random number times run length must fit
+    index = np.int32 if small else np.int64
+    ends = np.flatnonzero(close.view(bool)).astype(index)
+    picks = np.diff(ends, prepend=index(-1))
+    if y0 == 0:
+        keep = ends % size >= width
+        ends, picks = ends[keep], picks[keep]
+    if count == 1:
+        picks *= run_randoms(rngs[0], len(ends))
+    else:
+        runs = np.bincount(ends // size, minlength=count)
+        picks *= np.concatenate([run_randoms(rng, int(n))
+                                 for rng, n in zip(rngs, runs)])
+    picks >>= 16
+    np.subtract(ends, picks, out=picks)
+
+    north = np.zeros(close.shape, dtype=np.uint8)
+    north.reshape(-1)[picks] = 1
+    walls[:, y0:y0 + rows, :] ^= north * N
+    if y0 == 0:
+        walls[:, :rows - 1, :] ^= north[:, 1:, :] * S
+    else:
+        walls[:, y0 - 1:y0 + rows - 1, :] ^= north * S
+
+
+def sidewinder(width: int, height: int, seed: Any) -> np.ndarray:
+    """
+    Sidewinder maze: the top row is one corridor, every other row is
+    cut in random runs going east, and each run opens north from one
+    random cell. Each block takes a few array operations on its cells
+    and on its runs (carve_north), so there is no loop over cells.
+    """
+    rng = numpy_rng(seed)
+    walls = np.full((height, width), WALLS, dtype=np.uint8)
+    rows = block_rows(width)
+    for y0 in range(0, height, rows):
+        y1 = min(y0 + rows, height)
+        close = coin(rng, (y1 - y0, width))
+        sidewinder_ends(close, y0)
+        carve_runs(walls, close, y0)
+        carve_north(walls[np.newaxis], close[np.newaxis], y0, [rng])
+    return walls
+
+
+GENERATORS: Dict[str, Callable[[int, int, Any], np.ndarray]] = {
+    "binary_tree": binary_tree,
+    "sidewinder": sidewinder,
+}
+
+
+def to_maze(walls: np.ndarray, seed: Any = None) -> Maze:
+    """
+    A Maze (with maze_struct, solver and writers) holding these walls,
+    every cell marked visited like after maze_generator.
+    """
+    height, width = walls.shape
+    maze = Maze(width, height, seed)
+    maze.cells[:] = (walls & WALLS | VISITED).astype(np.uint8).tobytes()
+    return maze
+
+
+def from_maze(maze: Maze) -> np.ndarray:
+    """ the (height, width) uint8 wall array of a Maze """
+    cells = np.frombuffer(maze.cells, dtype=np.uint8)
+    return cells.reshape(maze.height, maze.width) & WALLS
+
+
+def hex_text(walls: np.ndarray) -> bytes:
+    """ the hex rows of a wall array, each followed by a new line """
+    height, width = walls.shape
+    text = np.empty((height, width + 1), dtype=np.uint8)
+    text[:, :width] = np.frombuffer(HEX_DIGITS, dtype=np.uint8)[walls]
+    text[:, width] = ord("\n")
+    return text.tobytes()
+
+
+def write_walls(file_name: str, walls: np.ndarray, entry: tuple,
+                exit: tuple, path: str = "", atomic: bool = False) -> None:
+    """
+    Writes a wall array in the hex output format. The maze is not
+    solved here (that needs the whole maze in Python), so the path
+    line is empty unless one is given.
+    """
+    write_file(file_name, hex_text(walls) + footer_text(entry, exit, path),
+               atomic)
+
+
+def read_walls(file_name: str) -> Tuple[np.ndarray, tuple, tuple, str]:
+    """
+    Reads a maze in the hex output format.
+    Returns (wall array, entry, exit, path).
+    """
+    with open(file_name, "rb") as maze_file:
+        data = maze_file.read()
+    end = data.find(b"\n\n")
+    width = data.find(b"\n")
+    if end <= 0 or (end + 1) % (width + 1):
+        raise ValueError(f"{file_name} is not a maze file")
+
+    text = np.frombuffer(data, dtype=np.uint8, count=end + 1)
+    text = text.reshape(-1, width + 1)
+    if (text[:, width] != ord("\n")).any():
+        raise ValueError(f"{file_name}: rows are not the same length")
+    walls = np.frombuffer(HEX_NIBBLES, dtype=np.uint8)[text[:, :width]]
+
+    footer = data[end + 2:].decode().split("\n")
+    footer += [""] * (3 - len(footer))
+    entry = tuple(map(int, footer[0].split(",")))
+    exit = tuple(map(int, footer[1].split(",")))
+    return walls, entry, exit, footer[2].strip()
+
+
+def batch_mazes(width: int, height: int, seeds: Iterable[Any],
+                algorithm: str = "binary_tree") -> np.ndarray:
+    """
+    Generates one maze per seed, all at once, into a
+    (len(seeds), height, width) uint8 wall array.
+    Only the random draws are made maze by maze (each from its own
+    seed, in the same order as binary_tree/sidewinder, so maze i is
+    exactly vectorized_maze(width, height, seeds[i], algorithm)); the
+    carving runs in lock-step over the whole stack.
+    """
+    if algorithm not in GENERATORS:
+        raise ValueError(f"unknown vectorized algorithm: {algorithm}")
+    rngs = [numpy_rng(seed) for seed in seeds]
+    count = len(rngs)
+    walls = np.full((count, height, width), WALLS, dtype=np.uint8)
+    if count == 0:
+        return walls
+
+    rows = block_rows(width)
+    for y0 in range(0, height, rows):
+        y1 = min(y0 + rows, height)
+        bits = np.stack([coin(rng, (y1 - y0, width)) for rng in rngs])
+        if algorithm == "binary_tree":
+            carve_binary_tree(walls, bits, y0)
+            continue
+
+        sidewinder_ends(bits, y0)
+        carve_runs(walls, bits, y0)
+        carve_north(walls, bits, y0, rngs)
+    return walls
+
+
+def solution_lengths(walls: np.ndarray, entry: tuple,
+                     exit: Optional[tuple] = None) -> np.ndarray:
+    """
+    Length of the shortest path from entry to exit (default: the
+    bottom right cell) of every maze of a (mazes, height, width) wall
+    array, -1 where the exit can not be reached.
+    A breadth first search runs on all the mazes in lock-step: each
+    loop moves the frontier of every maze one level with array shifts.
+    """
+    count, height, width = walls.shape
+    if exit is None:
+        exit = (width - 1, height - 1)
+    lengths = np.full(count, -1, dtype=np.int32)
+    seen = np.zeros(walls.shape, dtype=bool)
+    front = np.zeros(walls.shape, dtype=bool)
+    front[:, entry[1], entry[0]] = True
+    seen |= front
+
+    # open walls between each cell and the one above, below, ...
+    up = walls[:, 1:, :] & N == 0
+    down = walls[:, :-1, :] & S == 0
+    right = walls[:, :, :-1] & E == 0
+    left = walls[:, :, 1:] & W == 0
+
+    level = 0
+    near = np.empty(walls.shape, dtype=bool)
+    while front.any():
+        found = front[:, exit[1], exit[0]]
+        lengths[found] = level
+        # stop searching the mazes that are done
+        front[found] = False
+
+        near[:] = False
+        near[:, :-1, :] |= front[:, 1:, :] & up
+        near[:, 1:, :] |= front[:, :-1, :] & down
+        near[:, :, 1:] |= front[:, :, :-1] & right
+        near[:, :, :-1] |= front[:, :, 1:] & left
+        front = near & ~seen
+        seen |= front
+        level += 1
+    return lengths
@@ -0,0 +1,564 @@
+"""
+Verifier of maze files, in the hex output format or the packed one,
+for mazes that come from other producers.
+
+The rows are read one at a time and checked for:
+- wall symmetry: each wall is closed on both sides or open on both
+- a closed outer border
+- connectivity: every cell with an open wall is in one piece, found
+  with a union-find over the current row only (like eller_rows
+  builds a maze), so memory is O(width) whatever the height
+- perfectness: open walls = cells - 1 (cells with 4 walls closed,
+  like the 42 pattern, are left out)
+Then the entry and exit are checked against the size, and the stored
+path is followed move by move from the entry through the file itself,
+so it has to stay inside, never cross a wall and end on the exit.
+An empty path (python3 -m mazegen stream writes one) is not an error.
+
+Big files are cut into bands of rows checked in worker processes;
+the pieces that reach the first or last row of a band are joined
+afterwards, like tiled joins its tiles.
+"""
+import mmap
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, compress, repeat
+from operator import eq, sub
+from typing import (
+    Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+)
+
+from mazegen.packed import MAGIC, PATH_CHUNKS, PackedMaze
+
+# errors kept in a report, the other ones are only counted
+MAX_ERRORS = 20
+# bytes of path read at a time
+PATH_CHUNK = 1 << 20
+# fewest cells in a band, smaller files are checked in one process
+BAND_CELLS = 1 << 21
+
+# wall nibble -> 1 if that wall is open, else 0
+OPEN_N, OPEN_E, OPEN_S, OPEN_W = (
+    bytes(0 if nibble & bit else 1 for nibble in range(256))
+    for bit in (1, 2, 4, 8)
+)
+CLOSED_E = bytes(1 if nibble & 2 else 0 for nibble in range(256))
+# ascii hex digit -> its nibble (anything else -> 0xFF)
+NIBBLES = bytes(int(chr(byte), 16) if chr(byte) in "0123456789ABCDEFabcdef"
+                else 0xFF for byte in range(256))
+# move -> (dx, dy, wall bit it crosses in the cell it leaves)
+MOVES = {"N": (0, -1, 1), "E": (1, 0, 2), "S": (0, 1, 4), "W": (-1, 0, 8)}
+
+# (file name, packed, width, height, bytes per hex row, first row,
+# row after the last)
+BandJob = Tuple[str, bool, int, int, int, int, int]
+
+
+class Report:
+    """ what verify found in one maze file """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+        self.width = 0
+        self.height = 0
+        self.entry: tuple = ()
+        self.exit: tuple = ()
+        self.path_length = 0
+        # open walls, and cells with at least one of them
+        self.edges = 0
+        self.open_cells = 0
+        # separate pieces of open cells
+        self.components = 0
+        self.errors: List[str] = []
+        self.error_count = 0
+
+    def error(self, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(message)
+
+    def add(self, band: "Report") -> None:
+        """ adds what a band of the maze found """
+        self.edges += band.edges
+        self.open_cells += band.open_cells
+        self.components += band.components
+        for message in band.errors:
+            self.error(message)
+        self.error_count += band.error_count - len(band.errors)
+
+    @property
+    def valid(self) -> bool:
+        return self.error_count == 0
+
+    @property
+    def perfect(self) -> bool:
+        """ one piece without loops: a tree """
+        return self.components == 1 and self.edges == self.open_cells - 1
+
+
+class RowChecker:
+    """
+    Checks a maze given row by row (wall nibbles, one byte per cell)
+    and keeps only the previous row and the piece of each of its
+    cells between two rows.
+    A band that does not start on row 0 gets the row above it to
+    check the walls they share. Its pieces that reach its first row
+    are not counted: they are anchored to the runs of that row, so
+    the bands can be joined later (see join_bands).
+    """
+
+    def __init__(self, report: Report, width: int, first: int = 0,
+                 previous: Optional[bytes] = None) -> None:
+        self.report = report
+        self.width = width
+        self.first = first
+        self.height = 0
+        self.previous = previous if previous is not None else b""
+        # piece of each cell of the previous row, the pieces there and
+        # how many numbers they can take
+        self.cell_piece: List[int] = []
+        self.used: Set[int] = set()
+        self.pieces = 0
+        # cells with their 4 walls closed
+        self.closed = 0
+        # piece -> anchor, and the union-find of the anchors
+        self.anchor: Dict[int, int] = {}
+        self.anchors: List[int] = []
+        # anchor of each cell of the first row, when there is one above
+        self.top: List[int] = []
+        # columns joined to the row above by the first row
+        self.links: List[int] = []
+
+    def add(self, row: bytes) -> None:
+        report, width = self.report, self.width
+        y = self.first + self.height
+        self.height += 1
+        if len(row) != width:
+            report.error(f"row {y}: {len(row)} cells instead of {width}")
+            return
+
+        open_e, open_w = row.translate(OPEN_E), row.translate(OPEN_W)
+        open_n = row.translate(OPEN_N)
+        if open_e[:-1] != open_w[1:]:
+            x = first_difference(open_e[:-1], open_w[1:])
+            report.error(f"row {y}: the wall between columns {x} and "
+                         f"{x + 1} is open on one side only")
+        sides = [side for side, is_open in (("north", y == 0 and 1 in open_n),
+                                            ("west", open_w[0]),
+                                            ("east", open_e[-1])) if is_open]
+        if sides:
+            report.error(f"row {y}: the outer border is open on the "
+                         f"{' and '.join(sides)}")
+        if y == 0:
+            open_n = bytes(width)
+        elif len(self.previous) == width:
+            open_s = self.previous.translate(OPEN_S)
+            if open_s != open_n:
+                x = first_difference(open_s, open_n)
+                report.error(f"rows {y - 1} and {y}: the wall of column "
+                             f"{x} is open on one side only")
+        report.edges += open_e.count(1) - open_e[-1] + open_n.count(1)
+        closed = row.count(15)
+        self.closed += closed
+        report.open_cells += width - closed
+
+        # cells joined east-west make a run, numbered by the closed
+        # east walls before it; in the union-find the pieces of the
+        # row above come first, then the runs of this row
+        pieces = self.pieces
+        labels = list(accumulate(row[:-1].translate(CLOSED_E),
+                                 initial=pieces))
+        parent = list(range(labels[-1] + 1))
+
+        # join the runs to the pieces above them; a root is always the
+        # biggest number of its set, so a set with a run has a run root
+        positions = compress(range(width), open_n)
+        if self.height == 1:
+            self.links = list(positions)
+        else:
+            cell_piece = self.cell_piece
+            for x in positions:
+                a, b = cell_piece[x], labels[x]
+                while parent[a] != a:
+                    parent[a] = a = parent[parent[a]]
+                while parent[b] != b:
+                    parent[b] = b = parent[parent[b]]
+                if a < b:
+                    parent[a] = b
+                elif b < a:
+                    parent[b] = a
+        # runs to their root: it is bigger, so it is already done
+        for run in range(len(parent) - 1, pieces - 1, -1):
+            parent[run] = parent[parent[run]]
+
+        # pieces of the row above joined to no run are finished, the
+        # runs are the pieces of this row, numbered by their root
+        finished = sum(map(eq, map(parent.__getitem__, self.used),
+                           self.used))
+        self.cell_piece = list(map(sub, map(parent.__getitem__, labels),
+                                   repeat(pieces)))
+        self.used = set(self.cell_piece)
+        self.pieces = len(parent) - pieces
+
+        if self.height == 1 and self.first > 0:
+            self.top = self.cell_piece
+            self.anchors = list(range(self.pieces))
+            self.anchor = {piece: piece for piece in self.used}
+        elif self.anchor:
+            anchor: Dict[int, int] = {}
+            for piece, mark in self.anchor.items():
+                root = parent[parent[piece]]
+                if root < pieces:
+                    finished -= 1
+                    continue
+                other = anchor.setdefault(root - pieces, mark)
+                if other != mark:
+                    join(self.anchors, other, mark)
+            self.anchor = anchor
+        report.components += finished
+        self.previous = row
+
+    def finish(self, last: bool = True) -> Tuple[List, List]:
+        """
+        The last row of the band was given: checks the bottom border
+        if it is the last row of the maze. Returns the piece of each
+        cell of the first and last row, for join_bands.
+        """
+        report = self.report
+        bottom: List[Hashable] = []
+        if last:
+            if self.previous.translate(OPEN_S).count(1):
+                report.error(f"row {self.first + self.height - 1}: the "
+                             "outer border is open on the south")
+            report.components += len(self.used) - len(self.anchor)
+        else:
+            bottom = [("top", find(self.anchors, self.anchor[piece]))
+                      if piece in self.anchor else ("bottom", piece)
+                      for piece in self.cell_piece]
+        top = [("top", find(self.anchors, anchor)) for anchor in self.top]
+        # a closed cell is a piece of its own, it does not count
+        report.components -= self.closed
+        return top, bottom
+
+
+def find(parent: List[int], index: int) -> int:
+    """ root of a union-find set, halving the path on the way """
+    while parent[index] != index:
+        parent[index] = index = parent[parent[index]]
+    return index
+
+
+def join(parent: List[int], a: int, b: int) -> None:
+    a, b = find(parent, a), find(parent, b)
+    if a != b:
+        parent[a] = b
+
+
+def first_difference(a: bytes, b: bytes) -> int:
+    """ index of the first byte that differs (a != b) """
+    low, high = 0, len(a)
+    while high - low > 1:
+        middle = (low + high) // 2
+        if a[low:middle] != b[low:middle]:
+            high = middle
+        else:
+            low = middle
+    return low
+
+
+def check_band(job: BandJob) -> Tuple[Report, List, List, List[int]]:
+    """
+    Checks the rows of one band, in a worker process.
+    Returns what it found, the pieces of its first and last row and
+    the columns its first row opens to the band above.
+    """
+    file_name, packed, width, height, stride, start, end = job
+    report = Report(file_name)
+    if packed:
+        maze = PackedMaze(file_name)
+        row: Callable[[int], bytes] = maze.row
+        close = maze.close
+    else:
+        with open(file_name, "rb") as maze_file:
+            data = mmap.mmap(maze_file.fileno(), 0, access=mmap.ACCESS_READ)
+        close = data.close
+
+        def row(y: int) -> bytes:
+            nibbles = data[y * stride:y * stride + width].translate(NIBBLES)
+            if 0xFF in nibbles:
+                report.error(f"row {y}: not a hex digit")
+            return nibbles
+
+    try:
+        previous = row(start - 1) if start > 0 else None
+        checker = RowChecker(report, width, start, previous)
+        for y in range(start, end):
+            checker.add(row(y))
+        top, bottom = checker.finish(end == height)
+    finally:
+        close()
+    return report, top, bottom, checker.links
+
+
+def join_bands(report: Report,
+               bands: List[Tuple[Report, List, List, List[int]]]) -> None:
+    """
+    Adds up the bands and joins the pieces that reach their edges:
+    the last row of a band to the first row of the next one, through
+    the walls open between them.
+    """
+    parent: Dict[Hashable, Hashable] = {}
+
+    def root(key: Hashable) -> Hashable:
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = key = parent[parent[key]]
+        return key
+
+    for number, (band, top, bottom, links) in enumerate(bands):
+        report.add(band)
+        for key in top:
+            root((number, key))
+        for key in bottom:
+            root((number, key))
+        if number == 0:
+            continue
+        above = bands[number - 1][2]
+        for x in links:
+            a, b = root((number - 1, above[x])), root((number, top[x]))
+            if a != b:
+                parent[a] = b
+    report.components += sum(1 for key, value in parent.items()
+                             if key == value)
+
+
+def band_rows(width: int, height: int,
+              workers: int) -> List[Tuple[int, int]]:
+    """ (first row, row after the last) of each band """
+    count = min(workers * 4, width * height // BAND_CELLS)
+    if workers == 1 or count < 2:
+        return [(0, height)]
+    rows = -(-height // count)
+    return [(start, min(start + rows, height))
+            for start in range(0, height, rows)]
+
+
+def check_rows(report: Report, file_name: str, packed: bool,
+               stride: int, workers: Optional[int]) -> None:
+    """ checks every row, in bands across workers when it is big """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    jobs = [(file_name, packed, report.width, report.height, stride,
+             start, end)
+            for start, end in band_rows(report.width, report.height,
+                                        workers)]
+    if len(jobs) == 1:
+        bands = [check_band(jobs[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            bands = list(executor.map(check_band, jobs))
+    join_bands(report, bands)
+    if report.components > 1:
+        report.error(f"the maze is in {report.components} pieces, not "
+                     "all connected")
+
+
+def check_path(report: Report, cell: Callable[[int, int], int],
+               moves: Iterator[str]) -> None:
+    """
+    Follows the path from the entry, reading each cell with
+    cell(x, y), and checks it ends on the exit.
+    """
+    width, height = report.width, report.height
+    x, y = report.entry
+    if cell(x, y) == 15:
+        report.error(f"the entry {x},{y} is a closed cell")
+    for step, move in enumerate(moves):
+        if move not in MOVES:
+            report.error(f"path move {step}: {move!r} is not N, E, S or W")
+            return
+        dx, dy, bit = MOVES[move]
+        if cell(x, y) & bit:
+            report.error(f"path move {step}: {move} from {x},{y} goes "
+                         "through a wall")
+            return
+        x, y = x + dx, y + dy
+        if not (0 <= x < width and 0 <= y < height):
+            report.error(f"path move {step}: leaves the maze")
+            return
+    if report.path_length and (x, y) != tuple(report.exit):
+        report.error(f"the path ends on {x},{y}, not on the exit")
+
+
+def check_points(report: Report) -> bool:
+    """ entry and exit inside the maze and not the same cell """
+    ok = True
+    for name, point in (("entry", report.entry), ("exit", report.exit)):
+        if len(point) != 2 or not (0 <= point[0] < report.width and
+                                   0 <= point[1] < report.height):
+            report.error(f"the {name} {point} is out of the maze")
+            ok = False
+    if ok and tuple(report.entry) == tuple(report.exit):
+        report.error("entry and exit are the same cell")
+    return ok
+
+
+def text_layout(report: Report, data: mmap.mmap) -> Optional[int]:
+    """
+    Finds the size of a hex maze: every row must take the same number
+    of bytes (its stride, returned), so row y starts at y * stride.
+    Sets the width and height, or reports the first bad row.
+    """
+    stride = data.find(b"\n") + 1
+    line_end = b"\r\n" if data[stride - 2:stride] == b"\r\n" else b"\n"
+    width = stride - len(line_end)
+    end = data.find(b"\n" + line_end)
+    if width > 0 and end >= 0 and (end + 1) % stride == 0:
+        height = (end + 1) // stride
+        if data[stride - 1:end + 1:stride] == b"\n" * height and (
+            line_end == b"\n" or
+            data[stride - 2:end + 1:stride] == b"\r" * height
+        ):
+            report.width, report.height = width, height
+            return stride
+
+    if width <= 0 or end < 0:
+        report.error("no rows of cells followed by an empty line")
+        return None
+    offset, y = 0, 0
+    while data[offset + stride - len(line_end):offset + stride] == line_end:
+        offset += stride
+        y += 1
+    line = data[offset:data.find(b"\n", offset)].rstrip(b"\r")
+    report.error(f"row {y}: {len(line)} cells instead of {width}")
+    return None
+
+
+def verify_text(file_name: str, workers: Optional[int] = None) -> Report:
+    """ verifies a maze file in the hex output format """
+    report = Report(file_name)
+    with open(file_name, "rb") as maze_file:
+        if os.fstat(maze_file.fileno()).st_size == 0:
+            report.error("the file is empty")
+            return report
+        data = mmap.mmap(maze_file.fileno(), 0, access=mmap.ACCESS_READ)
+    with data:
+        stride = text_layout(report, data)
+        if stride is None:
+            return report
+        check_rows(report, file_name, False, stride, workers)
+
+        offset = report.height * stride + stride - report.width
+        lines = data[offset:offset + 64].split(b"\n", 2)
+        try:
+            report.entry = tuple(map(int, lines[0].split(b",")))
+            report.exit = tuple(map(int, lines[1].split(b",")))
+        except (ValueError, IndexError):
+            report.error("the entry or exit line is not x,y")
+            return report
+        if not check_points(report) or not report.valid:
+            return report
+
+        def cell(x: int, y: int) -> int:
+            return NIBBLES[data[y * stride + x]]
+
+        def moves() -> Iterator[str]:
+            start = offset + len(lines[0]) + len(lines[1]) + 2
+            while True:
+                chunk = data[start:start + PATH_CHUNK]
+                end = chunk.find(b"\n")
+                if end >= 0:
+                    chunk = chunk[:end]
+                text = chunk.rstrip(b"\r").decode("latin-1")
+                report.path_length += len(text)
+                yield from text
+                if end >= 0 or len(chunk) < PATH_CHUNK:
+                    return
+                start += PATH_CHUNK
+
+        check_path(report, cell, moves())
+    return report
+
+
+def verify_packed(file_name: str, workers: Optional[int] = None) -> Report:
+    """ verifies a maze file in the packed format """
+    report = Report(file_name)
+    try:
+        maze = PackedMaze(file_name)
+    except ValueError as error:
+        report.error(str(error))
+        return report
+    with maze:
+        report.width, report.height = maze.width, maze.height
+        report.entry, report.exit = maze.entry, maze.exit
+        report.path_length = maze.path_length
+        size = maze.path_offset + (maze.path_length + 3) // 4
+        if len(maze.data) < size:
+            report.error(f"the file is cut: {len(maze.data)} bytes "
+                         f"instead of {size}")
+            return report
+        if not maze.width or not maze.height:
+            report.error("the maze has no cells")
+            return report
+
+        check_rows(report, file_name, True, 0, workers)
+        if not check_points(report) or not report.valid:
+            return report
+
+        def moves() -> Iterator[str]:
+            left = maze.path_length
+            for offset in range(maze.path_offset, size, PATH_CHUNK):
+                chunk = maze.data[offset:min(offset + PATH_CHUNK, size)]
+                text = "".join(PATH_CHUNKS[byte] for byte in chunk)
+                yield from text[:left]
+                left -= len(text)
+
+        check_path(report, maze.cell, moves())
+    return report
+
+
+def verify(file_name: str, workers: Optional[int] = None) -> Report:
+    """
+    Verifies a maze file, packed or hex, told apart by its start.
+    Big mazes are checked across workers processes (default: all
+    cores).
+    """
+    with open(file_name, "rb") as maze_file:
+        packed = maze_file.read(len(MAGIC)) == MAGIC
+    if packed:
+        return verify_packed(file_name, workers)
+    return verify_text(file_name, workers)
+
+
+def main(file_names: List[str], perfect: bool = False,
+         workers: Optional[int] = None) -> None:
+    """
+    Verifies each file and prints what it found; exits with status 1
+    if a file is not a valid maze (or not a perfect one with perfect).
+    """
+    failed = False
+    for file_name in file_names:
+        try:
+            report = verify(file_name, workers)
+        except OSError as error:
+            print(f"ERROR: {file_name}: {error.strerror}")
+            failed = True
+            continue
+        if perfect and report.valid and not report.perfect:
+            report.error("the maze is not perfect")
+        if not report.valid:
+            failed = True
+            for message in report.errors:
+                print(f"ERROR: {file_name}: {message}")
+            hidden = report.error_count - len(report.errors)
+            if hidden:
+                print(f"ERROR: {file_name}: and {hidden} more errors")
+            continue
+        kind = "perfect" if report.perfect else (
+            f"{report.edges - report.open_cells + 1} loops")
+        size = os.path.getsize(file_name)
+        print(f"{file_name}: OK, {report.width}x{report.height}, {kind}, "
+              f"path of {report.path_length} moves ({size:,} bytes)")
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,143 @@
+import curses as cs
+from typing import Any, Tuple
+
+# columns kept on the right of the maze for the menu
+MENU_WIDTH = 30
+# cells kept between the player and the edge of the view
+MARGIN = 3
+
+
+class MazeView:
+    """
+    A window on part of a maze too big for the terminal.
+    It is drawn with the same calls as the screen (addstr with maze
+    coordinates, erase, refresh, getkey...) into a curses pad the
+    size of the view: anything outside the visible cells is dropped,
+    so drawing and scrolling cost as much as the screen, not the maze.
+    """
+
+    def __init__(self, screen: Any, width: int, height: int) -> None:
+        """
+        Fits the view to the screen, leaving MENU_WIDTH columns for
+        the menu on the right.
+        """
+        self.screen = screen
+        self.width = width
+        self.height = height
+        max_y, max_x = screen.getmaxyx()
+        # whole cells that fit: 2 rows and 3 columns each, plus a wall
+        self.rows = max(1, min(height, (max_y - 2) // 2))
+        self.columns = max(1, min(width, (max_x - MENU_WIDTH - 2) // 3))
+        self.view_y = self.rows * 2 + 1
+        self.view_x = self.columns * 3 + 1
+        # one extra column so a wide glyph on the edge does not wrap
+        self.pad = cs.newpad(self.view_y + 1, self.view_x + 2)
+        self.x0 = 0
+        self.y0 = 0
+
+    def visible_cells(self) -> Tuple[int, int, int, int]:
+        """ (x0, y0, x1, y1): the cells x0..x1-1, y0..y1-1 in view """
+        return (self.x0, self.y0, self.x0 + self.columns,
+                self.y0 + self.rows)
+
+    def shows(self, x: int, y: int) -> bool:
+        """ True when drawing cell (x, y) can change the view """
+        x0, y0, x1, y1 = self.visible_cells()
+        # the cells around it too: they share its walls and corners
+        return x0 - 1 <= x <= x1 and y0 - 1 <= y <= y1
+
+    def scroll_to(self, x0: int, y0: int) -> bool:
+        """
+        Moves the top left visible cell, kept inside the maze.
+        Returns True when the view moved (it has to be redrawn).
+        """
+        x0 = max(0, min(x0, self.width - self.columns))
+        y0 = max(0, min(y0, self.height - self.rows))
+        if (x0, y0) == (self.x0, self.y0):
+            return False
+        self.x0, self.y0 = x0, y0
+        return True
+
+    def scroll(self, key: str) -> bool:
+        """
+        Scrolls by one cell for an arrow key and by a page for
+        PgUp/PgDn. Returns True when the view moved.
+        """
+        x0, y0 = self.x0, self.y0
+        if key == "KEY_UP":
+            y0 -= 1
+        elif key == "KEY_DOWN":
+            y0 += 1
+        elif key == "KEY_LEFT":
+            x0 -= 1
+        elif key == "KEY_RIGHT":
+            x0 += 1
+        elif key == "KEY_PPAGE":
+            y0 -= self.rows - 1
+        elif key == "KEY_NPAGE":
+            y0 += self.rows - 1
+        return self.scroll_to(x0, y0)
+
+    def follow(self, x: int, y: int) -> bool:
+        """
+        Scrolls so cell (x, y) stays MARGIN cells away from the edges
+        when it can. Returns True when the view moved.
+        """
+        margin_x = min(MARGIN, (self.columns - 1) // 2)
+        margin_y = min(MARGIN, (self.rows - 1) // 2)
+        x0 = min(max(self.x0, x + margin_x + 1 - self.columns), x - margin_x)
+        y0 = min(max(self.y0, y + margin_y + 1 - self.rows), y - margin_y)
+        return self.scroll_to(x0, y0)
+
+    def addstr(self, y: int, x: int, text: str, attr: int = 0) -> None:
+        """ addstr at maze screen coordinates, cut to the view """
+        y -= self.y0 * 2
+        x -= self.x0 * 3
+        if y < 0 or y >= self.view_y:
+            return
+        if x < 0:
+            text = text[-x:]
+            x = 0
+        text = text[:self.view_x - x]
+        if text:
+            self.pad.addstr(y, x, text, attr)
+
+    def chgat(self, y: int, x: int, count: int, attr: int) -> None:
+        """ chgat at maze screen coordinates, cut to the view """
+        y -= self.y0 * 2
+        x -= self.x0 * 3
+        if x < 0:
+            count += x
+            x = 0
+        count = min(count, self.view_x - x)
+        if 0 <= y < self.view_y and count > 0:
+            self.pad.chgat(y, x, count, attr)
+
+    def erase(self) -> None:
+        self.screen.erase()
+        self.pad.erase()
+
+    def clear(self) -> None:
+        self.screen.clear()
+        self.pad.erase()
+
+    def noutrefresh(self) -> None:
+        """ the screen (menu) first, then the view on top of it """
+        self.screen.noutrefresh()
+        self.pad.noutrefresh(0, 0, 0, 0, self.view_y - 1, self.view_x - 1)
+
+    def refresh(self) -> None:
+        self.noutrefresh()
+        cs.doupdate()
+
+    def getkey(self) -> str:
+        return str(self.screen.getkey())
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return tuple(self.screen.getmaxyx())  # type: ignore[return-value]
+
+
+def needs_view(screen: Any, width: int, height: int) -> bool:
+    """ True when the maze and its menu do not fit on the screen """
+    max_y, max_x = screen.getmaxyx()
+    return height * 2 + 1 > max_y or (width + 1) * 3 + MENU_WIDTH > max_x
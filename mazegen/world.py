@@ -0,0 +1,191 @@
+"""
+A maze world too big to generate whole, for player mode: the cells
+are cut into square chunks, a chunk is only generated when its cells
+are read, and only the chunks read last are kept in memory.
+
+- Each chunk has its own random generator, seeded from the seed and
+  the chunk position (tiled.tile_seed), so a chunk that was dropped is
+  generated again exactly the same when it is read again.
+- A chunk is generated whole with one of the GENERATORS, as its own
+  maze; there is no 42 pattern.
+- The walls between chunks (seams) are opened without looking at any
+  other chunk: every chunk but the one of the entry has a parent, a
+  chunk next to it one step nearer to the entry chunk, and one wall of
+  the seam with its parent is open, at a place drawn from the seed and
+  the seam. Parents make a spanning tree over the chunks, so a perfect
+  world is a perfect maze. With perfect=False the walls of every seam
+  are also opened with the 10% chance the generators use.
+- The least recently used chunk is dropped past size chunks, so the
+  memory used depends on the chunk size, not on the world size.
+"""
+import random
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from mazegen.algorithms import LOOP_CHANCE
+from mazegen.generate_maze import GENERATORS
+from mazegen.grid import WALLS
+from mazegen.tiled import tile_seed
+
+# side of a chunk in cells
+CHUNK = 32
+# chunks kept in memory
+CHUNKS = 64
+# tile_seed counters after the chunk position: the east and the south
+# seam of a chunk, and the choice of its parent
+EAST, SOUTH, PARENT = 0, 1, 2
+
+
+class ChunkWorld:
+    """
+    A width x height maze generated chunk by chunk as its cells are
+    read (cell, region). Reading the same cells always gives the same
+    maze, whichever chunks were dropped meanwhile.
+    """
+
+    def __init__(self, width: int, height: int, seed: Any,
+                 perfect: bool = True, entry: tuple = (0, 0),
+                 algorithm: str = "backtracker", chunk: int = CHUNK,
+                 size: int = CHUNKS) -> None:
+        if algorithm not in GENERATORS:
+            raise ValueError(f"unknown maze algorithm: {algorithm}")
+        if chunk <= 0:
+            raise ValueError("the chunk size must be positive")
+        if size <= 0:
+            raise ValueError("at least one chunk must be kept")
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.perfect = perfect
+        self.entry = tuple(entry)
+        self.algorithm = algorithm
+        # side of a chunk: the ones on the right and bottom edges of
+        # the world can be smaller
+        self.side = chunk
+        self.size = size
+        self.root = (entry[0] // chunk, entry[1] // chunk)
+        # (chunk x, chunk y) -> cells, the most recently used last
+        self.chunks: OrderedDict[Tuple[int, int], bytearray] = OrderedDict()
+        self.generated = 0
+
+    def chunk_size(self, cx: int, cy: int) -> Tuple[int, int]:
+        """ width and height of chunk (cx, cy) """
+        return (min(self.side, self.width - cx * self.side),
+                min(self.side, self.height - cy * self.side))
+
+    def parent(self, cx: int, cy: int) -> Optional[Tuple[int, int]]:
+        """
+        The chunk the seam of chunk (cx, cy) opens on, one step nearer
+        to the entry chunk; None for the entry chunk.
+        """
+        root_x, root_y = self.root
+        step_x = (root_x > cx) - (root_x < cx)
+        step_y = (root_y > cy) - (root_y < cy)
+        if step_x and step_y:
+            rng = random.Random(tile_seed(self.seed, cx, cy, PARENT))
+            if rng.random() < 0.5:
+                step_y = 0
+            else:
+                step_x = 0
+        if not step_x and not step_y:
+            return None
+        return cx + step_x, cy + step_y
+
+    def seam(self, cx: int, cy: int, side: int) -> List[int]:
+        """
+        The open walls of the EAST or SOUTH seam of chunk (cx, cy), as
+        positions along it. Both chunks of a seam get the same walls.
+        """
+        width, height = self.chunk_size(cx, cy)
+        if side == EAST:
+            other, length = (cx + 1, cy), height
+        else:
+            other, length = (cx, cy + 1), width
+        rng = random.Random(tile_seed(self.seed, cx, cy, side))
+        opened = []
+        if self.parent(cx, cy) == other or self.parent(*other) == (cx, cy):
+            opened.append(int(rng.random() * length))
+        if not self.perfect:
+            opened += [i for i in range(length) if rng.random() < LOOP_CHANCE]
+        return opened
+
+    def generate(self, cx: int, cy: int) -> bytearray:
+        """ the cells of chunk (cx, cy), with its seams opened """
+        width, height = self.chunk_size(cx, cy)
+        cells = bytearray([WALLS]) * (width * height)
+        rng = random.Random(tile_seed(self.seed, cx, cy))
+        start = (0, 0)
+        if (cx, cy) == self.root:
+            start = (self.entry[0] - cx * self.side,
+                     self.entry[1] - cy * self.side)
+        GENERATORS[self.algorithm](cells, width, height, rng, start, None,
+                                   self.perfect)
+
+        if (cx + 1) * self.side < self.width:
+            for i in self.seam(cx, cy, EAST):
+                cells[i * width + width - 1] &= ~2
+        if (cy + 1) * self.side < self.height:
+            for i in self.seam(cx, cy, SOUTH):
+                cells[(height - 1) * width + i] &= ~4
+        if cx > 0:
+            for i in self.seam(cx - 1, cy, EAST):
+                cells[i * width] &= ~8
+        if cy > 0:
+            for i in self.seam(cx, cy - 1, SOUTH):
+                cells[i] &= ~1
+        self.generated += 1
+        return cells
+
+    def chunk(self, cx: int, cy: int) -> bytearray:
+        """
+        The cells of chunk (cx, cy), generated when it is not kept,
+        dropping the least recently used chunk past size.
+        """
+        key = (cx, cy)
+        cells = self.chunks.get(key)
+        if cells is not None:
+            self.chunks.move_to_end(key)
+            return cells
+        cells = self.generate(cx, cy)
+        self.chunks[key] = cells
+        while len(self.chunks) > self.size:
+            self.chunks.popitem(last=False)
+        return cells
+
+    def cell(self, x: int, y: int) -> int:
+        """ the byte of cell (x, y), 0 (no walls) out of the world """
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return 0
+        cx, x = divmod(x, self.side)
+        cy, y = divmod(y, self.side)
+        return self.chunk(cx, cy)[y * self.chunk_size(cx, cy)[0] + x]
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> bytearray:
+        """
+        The cells x0..x1-1, y0..y1-1 row after row, laid out like the
+        cells of a (x1 - x0) x (y1 - y0) maze; cells out of the world
+        are 0 (no walls). Each chunk is read once.
+        """
+        width = x1 - x0
+        cells = bytearray(width * max(0, y1 - y0))
+        side = self.side
+        left, right = max(x0, 0), min(x1, self.width)
+        top, bottom = max(y0, 0), min(y1, self.height)
+        if left >= right or top >= bottom:
+            return cells
+
+        for cy in range(top // side, (bottom - 1) // side + 1):
+            for cx in range(left // side, (right - 1) // side + 1):
+                chunk = self.chunk(cx, cy)
+                chunk_width = self.chunk_size(cx, cy)[0]
+                # the part of the chunk in the region
+                start_x = max(left, cx * side)
+                end_x = min(right, cx * side + chunk_width)
+                columns = end_x - start_x
+                for y in range(max(top, cy * side),
+                               min(bottom, (cy + 1) * side)):
+                    start = ((y - cy * side) * chunk_width
+                             + start_x - cx * side)
+                    at = (y - y0) * width + start_x - x0
+                    cells[at:at + columns] = chunk[start:start + columns]
+        return cells